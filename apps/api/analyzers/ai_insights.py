@@ -16,10 +16,32 @@ Features:
 """
 
 import os
+import re
+import sys
+import time
 import json
-from typing import Dict, Any, List, Optional
+import asyncio
+import hashlib
+import functools
+import threading
+import weakref
+import importlib.util
+from typing import Dict, Any, List, Optional, Iterator, Literal
 from enum import Enum
 
+from cachetools import TTLCache
+from pydantic import BaseModel, ConfigDict
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+# Try to import orjson (faster encode/decode, falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from .semantic_cache import get_semantic_cache
+
 
 class AIProvider(str, Enum):
     """Supported AI providers"""
@@ -28,58 +50,438 @@ class AIProvider(str, Enum):
     CLAUDE = "claude"
 
 
+_SYSTEM_PROMPT = (
+    "You are an expert SEO consultant with 15+ years of experience. "
+    "Provide clear, actionable, and data-driven recommendations. "
+    "Always respond in valid JSON format."
+)
+
+# Identical across calls, so it is sent as the system prompt where providers
+# can cache the prefix (Anthropic cache_control, OpenAI prompt_cache_key).
+# Kept terse: the key list doubles as the output format, and OpenAI/Claude
+# also get it enforced through _SEO_INSIGHTS_SCHEMA.
+_SEO_ANALYSIS_INSTRUCTIONS = """Analyze the website SEO data provided by the user. Be specific and actionable; rank by impact.
+
+Respond with one JSON object with these keys:
+- content_assessment: overall content quality, key strengths and weaknesses (1-2 sentences)
+- technical_issues: 3-5 critical issues needing immediate attention
+- keyword_recommendations: 3-5 items on keyword effectiveness, missing opportunities, optimization
+- backlink_strategy: backlink quality and link building advice (2-3 sentences)
+- competitive_insights: comparison with competitors and strategy (2-3 sentences), null without competitor data
+- priority_actions: 5-7 {"priority": "CRITICAL"|"HIGH"|"MEDIUM", "action": specific task}, ranked by impact
+- quick_wins: 3-4 easy improvements with immediate impact
+- long_term_strategy: 3-4 recommendations for sustained growth
+- overall_score: integer 0-100
+- summary: 2-3 sentences
+"""
+
+class PriorityAction(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    
+    priority: Literal['CRITICAL', 'HIGH', 'MEDIUM']
+    action: str
+
+
+class SEOInsights(BaseModel):
+    """Structured SEO insights returned by the analysis prompt"""
+    model_config = ConfigDict(extra='forbid')
+    
+    content_assessment: str
+    technical_issues: List[str]
+    keyword_recommendations: List[str]
+    backlink_strategy: str
+    competitive_insights: Optional[str]
+    priority_actions: List[PriorityAction]
+    quick_wins: List[str]
+    long_term_strategy: List[str]
+    overall_score: int
+    summary: str
+
+
+# Structured output schema (OpenAI strict json_schema / Claude tool input_schema)
+_SEO_INSIGHTS_SCHEMA = {
+    "name": "seo_insights",
+    "strict": True,
+    "schema": SEOInsights.model_json_schema(),
+}
+
+# Schema-constrained output skips headings/prose, so it fits a smaller budget
+_MAX_TOKENS = 2000
+_STRUCTURED_MAX_TOKENS = 1200
+
+
+# Fenced ```json block, the last resort for wrapped model output
+_JSON_BLOCK_RE = re.compile(r'```json\s*\n(.+?)\n\s*```', re.DOTALL)
+
+
+def _json_loads(data):
+    """Decode JSON from str or bytes (orjson.JSONDecodeError subclasses json's)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """Encode JSON to str, stringifying unknown types"""
+    if ORJSON_AVAILABLE:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=str, option=option).decode()
+    return json.dumps(obj, indent=2 if indent else None, sort_keys=sort_keys, default=str)
+
+
+def _balanced_object(text: str) -> Optional[str]:
+    """
+    Return the first balanced {...} span in text, or None
+    
+    Single forward scan counting brace depth; braces inside JSON strings
+    (including escaped quotes) are ignored.
+    """
+    start = text.find('{')
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == '\\':
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _extract_json(response: str) -> Any:
+    """
+    Parse JSON from a model response.
+    
+    Bare JSON (structured output) is parsed directly; otherwise the first
+    balanced object is sliced out in one scan, with a fenced ```json block
+    as the fallback. Raises json.JSONDecodeError if nothing parses.
+    """
+    error = None
+    if response.lstrip().startswith('{'):
+        try:
+            return _json_loads(response)
+        except json.JSONDecodeError as e:
+            error = e
+    
+    span = _balanced_object(response)
+    if span is not None:
+        try:
+            return _json_loads(span)
+        except json.JSONDecodeError as e:
+            error = e
+    
+    match = _JSON_BLOCK_RE.search(response)
+    if match:
+        return _json_loads(match.group(1))
+    
+    raise error or json.JSONDecodeError('No JSON object found', response, 0)
+
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_HTTP_MAX_CONNECTIONS = 100
+_HTTP_MAX_KEEPALIVE = 50
+_HTTP_TIMEOUT = 60.0
+_HTTP_CONNECT_TIMEOUT = 5.0
+
+# Sync HTTP client per SDK, shared by every generator. Async pools are bound to
+# the event loop they first ran on, so those are kept per running loop (the
+# background loop and e.g. the server's loop each get their own).
+_HTTP_CLIENTS: Dict[str, Any] = {}
+_HTTP_CLIENTS_LOCK = threading.Lock()
+_ASYNC_HTTP_CLIENTS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _http_client_options(sdk) -> Optional[Dict[str, Any]]:
+    """
+    Pool settings for an OpenAI/Anthropic SDK module's DefaultHttpxClient classes
+    
+    Those classes pin the httpx flavour the SDK was built against; the options
+    set keep-alive limits, HTTP/2 when h2 is installed, and a short connect
+    timeout. Older SDKs without them get None, i.e. their built-in defaults.
+    """
+    default_limits = getattr(sdk, 'DEFAULT_CONNECTION_LIMITS', None)
+    if default_limits is None or not hasattr(sdk, 'DefaultHttpxClient') or not hasattr(sdk, 'DefaultAsyncHttpxClient'):
+        return None
+    return dict(
+        http2=_HTTP2_AVAILABLE,
+        limits=type(default_limits)(
+            max_connections=_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=_HTTP_MAX_KEEPALIVE,
+        ),
+        timeout=sdk.Timeout(_HTTP_TIMEOUT, connect=_HTTP_CONNECT_TIMEOUT),
+    )
+
+
+def _http_client(sdk):
+    """Process-wide sync HTTP client for an SDK module (None: SDK default)"""
+    options = _http_client_options(sdk)
+    if options is None:
+        return None
+    with _HTTP_CLIENTS_LOCK:
+        client = _HTTP_CLIENTS.get(sdk.__name__)
+        if client is None:
+            client = _HTTP_CLIENTS[sdk.__name__] = sdk.DefaultHttpxClient(**options)
+    return client
+
+
+def _async_http_client(sdk):
+    """Async HTTP client for an SDK module on the running event loop (None: SDK default)"""
+    options = _http_client_options(sdk)
+    if options is None:
+        return None
+    clients = _ASYNC_HTTP_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    if sdk.__name__ not in clients:
+        clients[sdk.__name__] = sdk.DefaultAsyncHttpxClient(**options)
+    return clients[sdk.__name__]
+
+
+# Per-request data block; filled with str.format_map from _flatten_metrics
+_PROMPT_TEMPLATE = """**WEBSITE DATA:**
+
+**On-Page SEO:**
+- Title: {title}
+- Meta Description: {meta_description}
+- H1 Count: {h1_count}
+- Total Images: {image_count}
+- Total Links: {link_count}
+
+**Content Metrics:**
+- Total Words: {total_words}
+- Unique Words: {unique_words}
+- Readability Score: {readability_score} ({readability_level})
+- Diversity Score: {diversity_score}%
+
+**Top Keywords:**
+{keywords_block}
+
+**Authority Metrics (MOZ):**
+- Domain Authority: {domain_authority}
+- Page Authority: {page_authority}
+- Spam Score: {spam_score}%
+- Root Domains Linking: {root_domains_linking}
+"""
+
+_COMPETITOR_TEMPLATE = """
+**Competitor Analysis:**
+{}
+"""
+
+# Placeholder text for metrics missing from analysis_data
+_PROMPT_DEFAULTS = {
+    'title': 'Not found',
+    'meta_description': 'Not found',
+    'total_words': 0,
+    'unique_words': 0,
+    'readability_score': 0,
+    'readability_level': 'Unknown',
+    'diversity_score': 0,
+    'domain_authority': 'N/A',
+    'page_authority': 'N/A',
+    'spam_score': 'N/A',
+    'root_domains_linking': 'N/A',
+}
+
+# Shared read-only defaults so missing sections don't allocate temporaries
+_EMPTY: Dict[str, Any] = {}
+_EMPTY_LIST: List[Any] = []
+
+
+def _or(value: Any, default: Any) -> Any:
+    """Prompt placeholder for missing (None) metrics"""
+    return default if value is None else value
+
+
+def _flatten_metrics(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Single pass over analysis_data collecting the metrics used by the prompt
+    and the cache key. Missing values are None; list lengths are counts.
+    """
+    onpage = data.get('onpage') or _EMPTY
+    keywords = data.get('keywords') or _EMPTY
+    moz = (data.get('moz') or _EMPTY).get('backlink_metrics') or _EMPTY
+    content = data.get('content_quality') or _EMPTY
+    competitors = data.get('competitors') or _EMPTY
+    
+    return {
+        'title': onpage.get('title'),
+        'meta_description': onpage.get('meta_description'),
+        'h1_count': len((onpage.get('headings') or _EMPTY).get('h1') or _EMPTY_LIST),
+        'image_count': len(onpage.get('images') or _EMPTY_LIST),
+        'link_count': len(onpage.get('links') or _EMPTY_LIST),
+        'total_words': keywords.get('total_words'),
+        'unique_words': content.get('unique_words'),
+        'readability_score': content.get('readability_score'),
+        'readability_level': content.get('readability_level'),
+        'diversity_score': content.get('diversity_score'),
+        'top_keywords': (keywords.get('top') or _EMPTY_LIST)[:5],
+        'domain_authority': moz.get('domain_authority'),
+        'page_authority': moz.get('page_authority'),
+        'spam_score': moz.get('spam_score'),
+        'root_domains_linking': moz.get('root_domains_linking'),
+        'competitors': (competitors.get('top_competitors') or _EMPTY_LIST)[:3],
+    }
+
+
+def _prompt_cache_key(system_prompt: str) -> str:
+    """Stable OpenAI prompt_cache_key for a system prompt"""
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+
+
+# Environment variable holding each provider's API key
+_PROVIDER_KEYS = {
+    AIProvider.OPENAI: 'OPENAI_API_KEY',
+    AIProvider.GEMINI: 'GEMINI_API_KEY',
+    AIProvider.CLAUDE: 'CLAUDE_API_KEY',
+}
+
+
+# SDKs are imported on first use (and only once) so unused providers cost nothing
+@functools.lru_cache(maxsize=None)
+def _load_openai():
+    try:
+        import openai
+        return openai
+    except ImportError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_gemini():
+    try:
+        import google.generativeai as genai
+        return genai
+    except ImportError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_anthropic():
+    try:
+        import anthropic
+        return anthropic
+    except ImportError:
+        return None
+
+
+# Transient provider errors worth retrying, by SDK module. Looked up in
+# sys.modules so classifying an error never imports an unused SDK.
+_TRANSIENT_ERRORS = {
+    'openai': ('RateLimitError', 'APIConnectionError', 'InternalServerError'),
+    'anthropic': ('RateLimitError', 'APIConnectionError', 'InternalServerError', 'OverloadedError'),
+    'google.api_core.exceptions': ('TooManyRequests', 'ResourceExhausted', 'ServiceUnavailable',
+                                   'InternalServerError', 'DeadlineExceeded'),
+}
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """True for rate limit / connection / 5xx errors from any loaded provider SDK"""
+    for module_name, names in _TRANSIENT_ERRORS.items():
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        classes = tuple(getattr(module, name) for name in names if hasattr(module, name))
+        if classes and isinstance(exc, classes):
+            return True
+    return False
+
+
+# Bounded retry with jittered backoff around provider calls (the SDKs' own
+# retries are disabled so attempts don't multiply); other errors raise at once
+_llm_retry = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=0.5, max=4),
+    retry=retry_if_exception(_is_transient),
+    reraise=True,
+)
+
+
 class AIInsightsGenerator:
     """Main class for generating AI-powered SEO insights"""
     
+    __slots__ = ('provider', '_client', '_async_factory', '_async_clients', '_client_loaded')
+    
     def __init__(self, provider: AIProvider = AIProvider.OPENAI):
         self.provider = provider
-        self._initialize_client()
+        self._client = None
+        self._async_factory = None
+        # Async SDK clients wrap a loop-bound pool: one per running loop
+        self._async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._client_loaded = False
+    
+    @property
+    def client(self):
+        """Sync SDK client, created on first use (None if not configured)"""
+        if not self._client_loaded:
+            self._initialize_client()
+        return self._client
+    
+    @property
+    def async_client(self):
+        """Async SDK client for the running event loop, created on first use (None if unavailable)"""
+        if not self._client_loaded:
+            self._initialize_client()
+        if self._async_factory is None:
+            return None
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = self._async_factory()
+        return client
     
     def _initialize_client(self):
         """Initialize the appropriate AI client"""
-        if self.provider == AIProvider.OPENAI:
-            self._init_openai()
-        elif self.provider == AIProvider.GEMINI:
-            self._init_gemini()
-        elif self.provider == AIProvider.CLAUDE:
-            self._init_claude()
-    
-    def _init_openai(self):
+        self._client_loaded = True
+        # Check the key first so unconfigured providers never import their SDK
+        api_key = os.getenv(_PROVIDER_KEYS[self.provider])
+        if api_key:
+            self._INIT_DISPATCH[self.provider](self, api_key)
+    
+    def _init_openai(self, api_key: str):
         """Initialize OpenAI client"""
-        try:
-            from openai import OpenAI
-            api_key = os.getenv('OPENAI_API_KEY')
-            if not api_key:
-                self.client = None
-                return
-            self.client = OpenAI(api_key=api_key)
-        except ImportError:
-            self.client = None
-    
-    def _init_gemini(self):
+        openai = _load_openai()
+        if openai is None:
+            return
+        self._client = openai.OpenAI(api_key=api_key, http_client=_http_client(openai), max_retries=0)
+        self._async_factory = lambda: openai.AsyncOpenAI(
+            api_key=api_key, http_client=_async_http_client(openai), max_retries=0
+        )
+    
+    def _init_gemini(self, api_key: str):
         """Initialize Google Gemini client"""
-        try:
-            import google.generativeai as genai
-            api_key = os.getenv('GEMINI_API_KEY')
-            if not api_key:
-                self.client = None
-                return
-            genai.configure(api_key=api_key)
-            self.client = genai.GenerativeModel('gemini-pro')
-        except ImportError:
-            self.client = None
-    
-    def _init_claude(self):
+        genai = _load_gemini()
+        if genai is None:
+            return
+        genai.configure(api_key=api_key)
+        self._client = genai.GenerativeModel('gemini-pro')
+    
+    def _init_claude(self, api_key: str):
         """Initialize Anthropic Claude client"""
-        try:
-            from anthropic import Anthropic
-            api_key = os.getenv('CLAUDE_API_KEY')
-            if not api_key:
-                self.client = None
-                return
-            self.client = Anthropic(api_key=api_key)
-        except ImportError:
-            self.client = None
+        anthropic = _load_anthropic()
+        if anthropic is None:
+            return
+        self._client = anthropic.Anthropic(api_key=api_key, http_client=_http_client(anthropic), max_retries=0)
+        self._async_factory = lambda: anthropic.AsyncAnthropic(
+            api_key=api_key, http_client=_async_http_client(anthropic), max_retries=0
+        )
     
     def generate_seo_insights(self, analysis_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -97,22 +499,45 @@ class AIInsightsGenerator:
             AI-generated insights and recommendations
         """
         if not self.client:
+            return self._not_configured_error()
+        
+        cache, cache_key, cached = self._lookup_cached(analysis_data)
+        if cached is not None:
+            return cached
+        
+        system_prompt = self._static_system_prompt()
+        prompt = self._dynamic_data_block(analysis_data)
+        
+        try:
+            response = self._query(prompt, system_prompt, _SEO_INSIGHTS_SCHEMA)
+            
+            return self._finalize_insights(response, analysis_data, cache, cache_key)
+            
+        except Exception as e:
             return {
-                'error': f'{self.provider.value.upper()}_API_KEY not configured',
-                'message': 'Please set the appropriate API key environment variable'
+                'error': str(e),
+                'message': f'Failed to generate AI insights using {self.provider.value}'
             }
+    
+    async def agenerate_seo_insights(self, analysis_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of generate_seo_insights using the provider's async client"""
+        if not self.client:
+            return self._not_configured_error()
+        
+        # Cache lookups/stores embed the key and hit SQLite: keep them off the event loop
+        cache, cache_key, cached = await asyncio.to_thread(self._lookup_cached, analysis_data)
+        if cached is not None:
+            return cached
         
-        prompt = self._build_seo_analysis_prompt(analysis_data)
+        system_prompt = self._static_system_prompt()
+        prompt = self._dynamic_data_block(analysis_data)
         
         try:
-            if self.provider == AIProvider.OPENAI:
-                response = self._query_openai(prompt)
-            elif self.provider == AIProvider.GEMINI:
-                response = self._query_gemini(prompt)
-            elif self.provider == AIProvider.CLAUDE:
-                response = self._query_claude(prompt)
+            response = await self._AQUERY_DISPATCH[self.provider](
+                self, prompt, system_prompt, _SEO_INSIGHTS_SCHEMA
+            )
             
-            return self._parse_ai_response(response, analysis_data)
+            return await asyncio.to_thread(self._finalize_insights, response, analysis_data, cache, cache_key)
             
         except Exception as e:
             return {
@@ -120,101 +545,60 @@ class AIInsightsGenerator:
                 'message': f'Failed to generate AI insights using {self.provider.value}'
             }
     
-    def _build_seo_analysis_prompt(self, data: Dict[str, Any]) -> str:
-        """Build comprehensive SEO analysis prompt"""
-        
-        # Extract key metrics
-        onpage = data.get('onpage', {})
-        keywords = data.get('keywords', {})
-        moz = data.get('moz', {}).get('backlink_metrics', {})
-        content = data.get('content_quality', {})
-        competitors = data.get('competitors', {})
+    def _not_configured_error(self) -> Dict[str, Any]:
+        return {
+            'error': f'{self.provider.value.upper()}_API_KEY not configured',
+            'message': 'Please set the appropriate API key environment variable'
+        }
+    
+    def _lookup_cached(self, analysis_data: Dict[str, Any]):
+        """Serve near-duplicate analyses from the semantic cache"""
+        cache = get_semantic_cache(self.provider.value)
+        if cache is None:
+            return None, None, None
+        cache_key = self._build_cache_key(analysis_data)
+        cached = cache.lookup(cache_key)
+        if cached is not None:
+            cached['cached'] = True
+            cached['analysis_timestamp'] = analysis_data.get('timestamp')
+        return cache, cache_key, cached
+    
+    def _finalize_insights(self, response: str, analysis_data: Dict[str, Any],
+                           cache, cache_key: Optional[str]) -> Dict[str, Any]:
+        """Parse the raw response and store successful results in the cache"""
+        parsed = self._parse_ai_response(response, analysis_data)
+        if cache is not None and 'raw_response' not in parsed and 'error' not in parsed:
+            cache.store(cache_key, parsed)
+        return parsed
+    
+    def _build_cache_key(self, data: Dict[str, Any]) -> str:
+        """Canonical key text built from the metrics used in the analysis prompt"""
+        flat = dict(_flatten_metrics(data))
+        flat['top_keywords'] = [
+            [kw.get('word'), kw.get('count'), kw.get('percent')] for kw in flat['top_keywords']
+        ]
+        flat['competitors'] = [
+            [c.get('domain'), c.get('visibility'), c.get('avg_position')] for c in flat['competitors']
+        ]
+        return _json_dumps(flat, sort_keys=True)
+    
+    def _static_system_prompt(self) -> str:
+        """System prompt with the analysis instructions (identical across calls)"""
+        return f"{_SYSTEM_PROMPT}\n\n{_SEO_ANALYSIS_INSTRUCTIONS}"
+    
+    def _dynamic_data_block(self, data: Dict[str, Any]) -> str:
+        """Build the per-request WEBSITE DATA section of the analysis prompt"""
+        m = _flatten_metrics(data)
         
-        prompt = f"""As an expert SEO consultant, analyze this website's SEO performance and provide actionable recommendations.
-
-**WEBSITE DATA:**
-
-**On-Page SEO:**
-- Title: {onpage.get('title', 'Not found')}
-- Meta Description: {onpage.get('meta_description', 'Not found')}
-- H1 Count: {len(onpage.get('headings', {}).get('h1', []))}
-- Total Images: {len(onpage.get('images', []))}
-- Total Links: {len(onpage.get('links', []))}
-
-**Content Metrics:**
-- Total Words: {keywords.get('total_words', 0)}
-- Unique Words: {content.get('unique_words', 0)}
-- Readability Score: {content.get('readability_score', 0)} ({content.get('readability_level', 'Unknown')})
-- Diversity Score: {content.get('diversity_score', 0)}%
-
-**Top Keywords:**
-{self._format_keywords(keywords.get('top', [])[:5])}
-
-**Authority Metrics (MOZ):**
-- Domain Authority: {moz.get('domain_authority', 'N/A')}
-- Page Authority: {moz.get('page_authority', 'N/A')}
-- Spam Score: {moz.get('spam_score', 'N/A')}%
-- Root Domains Linking: {moz.get('root_domains_linking', 'N/A')}
-
-"""
-
-        if competitors.get('top_competitors'):
-            prompt += f"""
-**Competitor Analysis:**
-{self._format_competitors(competitors.get('top_competitors', [])[:3])}
-"""
-
-        prompt += """
-
-**REQUIRED ANALYSIS:**
-
-1. **Content Quality Assessment** (1-2 sentences)
-   - Overall content quality rating
-   - Key strengths and weaknesses
-
-2. **Technical SEO Issues** (3-5 bullet points)
-   - Critical issues that need immediate attention
-   - Be specific and actionable
-
-3. **Keyword Strategy** (3-5 bullet points)
-   - Are current keywords effective?
-   - Missing keyword opportunities
-   - Keyword optimization suggestions
-
-4. **Backlink Profile** (2-3 sentences)
-   - Assessment of current backlink quality
-   - Link building recommendations
-
-5. **Competitive Positioning** (if data available, 2-3 sentences)
-   - How does this site compare to competitors?
-   - Strategic recommendations
-
-6. **Priority Action Items** (5-7 items, ranked by impact)
-   - Format: "[Priority Level] Action: Specific task"
-   - Priority levels: CRITICAL, HIGH, MEDIUM
-
-7. **Quick Wins** (3-4 items)
-   - Easy improvements with immediate impact
-
-8. **Long-term Strategy** (3-4 bullet points)
-   - Strategic recommendations for sustained growth
-
-**OUTPUT FORMAT:**
-Provide your analysis in a clear, structured JSON format with these sections:
-- content_assessment
-- technical_issues (array)
-- keyword_recommendations (array)
-- backlink_strategy
-- competitive_insights (if applicable)
-- priority_actions (array with priority and action)
-- quick_wins (array)
-- long_term_strategy (array)
-- overall_score (0-100)
-- summary (2-3 sentences)
-
-Be specific, actionable, and focus on high-impact recommendations.
-"""
+        params = {key: _or(m[key], default) for key, default in _PROMPT_DEFAULTS.items()}
+        params['h1_count'] = m['h1_count']
+        params['image_count'] = m['image_count']
+        params['link_count'] = m['link_count']
+        params['keywords_block'] = self._format_keywords(m['top_keywords'])
         
+        prompt = _PROMPT_TEMPLATE.format_map(params)
+        if m['competitors']:
+            prompt += _COMPETITOR_TEMPLATE.format(self._format_competitors(m['competitors']))
         return prompt
     
     def _format_keywords(self, keywords: List[Dict]) -> str:
@@ -222,81 +606,245 @@ Be specific, actionable, and focus on high-impact recommendations.
         if not keywords:
             return "No keyword data available"
         
-        formatted = []
-        for kw in keywords:
-            formatted.append(f"- {kw.get('word')}: {kw.get('count')} occurrences ({kw.get('percent')}%)")
-        return "\n".join(formatted)
+        return "\n".join(
+            f"- {kw.get('word')}: {kw.get('count')} occurrences ({kw.get('percent')}%)"
+            for kw in keywords
+        )
     
     def _format_competitors(self, competitors: List[Dict]) -> str:
         """Format competitor data for prompt"""
         if not competitors:
             return "No competitor data available"
         
-        formatted = []
-        for idx, comp in enumerate(competitors, 1):
-            formatted.append(
-                f"{idx}. {comp.get('domain')} - "
-                f"{comp.get('visibility')}% visibility, "
-                f"avg position {comp.get('avg_position')}"
-            )
-        return "\n".join(formatted)
+        return "\n".join(
+            f"{idx}. {comp.get('domain')} - "
+            f"{comp.get('visibility')}% visibility, "
+            f"avg position {comp.get('avg_position')}"
+            for idx, comp in enumerate(competitors, 1)
+        )
     
-    def _query_openai(self, prompt: str) -> str:
-        """Query OpenAI API"""
-        response = self.client.chat.completions.create(
-            model=os.getenv('OPENAI_MODEL', 'gpt-4o-mini'),
-            messages=[
+    def _openai_request(self, prompt: str, system_prompt: Optional[str] = None,
+                        json_schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Chat completion arguments shared by the sync, async and streaming calls"""
+        system_prompt = system_prompt or _SYSTEM_PROMPT
+        request = {
+            "model": os.getenv('OPENAI_MODEL', 'gpt-4o-mini'),
+            "messages": [
                 {
                     "role": "system",
-                    "content": "You are an expert SEO consultant with 15+ years of experience. "
-                              "Provide clear, actionable, and data-driven recommendations. "
-                              "Always respond in valid JSON format."
+                    "content": system_prompt
                 },
                 {
                     "role": "user",
                     "content": prompt
                 }
             ],
-            temperature=0.7,
-            max_tokens=2000
-        )
+            "temperature": 0.7,
+            "max_tokens": _STRUCTURED_MAX_TOKENS if json_schema else _MAX_TOKENS,
+            # Routes requests sharing the static system prefix to the same cache
+            "extra_body": {"prompt_cache_key": _prompt_cache_key(system_prompt)},
+        }
+        if json_schema:
+            request["response_format"] = {"type": "json_schema", "json_schema": json_schema}
+        return request
+    
+    def _claude_request(self, prompt: str, system_prompt: Optional[str] = None,
+                        json_schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Messages API arguments with the system prompt marked for prompt caching
         
-        return response.choices[0].message.content
+        With a json_schema the answer is forced through a single tool whose
+        input_schema is the schema, so the output is always valid JSON.
+        """
+        request = {
+            "model": os.getenv('CLAUDE_MODEL', 'claude-3-sonnet-20240229'),
+            "max_tokens": _STRUCTURED_MAX_TOKENS if json_schema else _MAX_TOKENS,
+            "system": [
+                {
+                    "type": "text",
+                    "text": system_prompt or _SYSTEM_PROMPT,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
+        if json_schema:
+            request["tools"] = [{
+                "name": json_schema["name"],
+                "description": "Record the structured analysis",
+                "input_schema": json_schema["schema"]
+            }]
+            request["tool_choice"] = {"type": "tool", "name": json_schema["name"]}
+        return request
+    
+    def _gemini_prompt(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Gemini models are created without a system instruction, so prepend it"""
+        return f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+    
+    def _query(self, prompt: str, system_prompt: Optional[str] = None,
+               json_schema: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Query the configured provider
+        
+        json_schema is enforced as structured output where the provider
+        supports it (OpenAI response_format, Claude tool use) and ignored
+        otherwise.
+        """
+        return self._QUERY_DISPATCH[self.provider](self, prompt, system_prompt, json_schema)
+    
+    @_llm_retry
+    def _query_openai(self, prompt: str, system_prompt: Optional[str] = None,
+                      json_schema: Optional[Dict[str, Any]] = None) -> str:
+        """Query OpenAI API"""
+        return "".join(self._stream_openai(prompt, system_prompt, json_schema))
     
-    def _query_gemini(self, prompt: str) -> str:
+    @_llm_retry
+    def _query_gemini(self, prompt: str, system_prompt: Optional[str] = None,
+                      json_schema: Optional[Dict[str, Any]] = None) -> str:
         """Query Google Gemini API"""
-        response = self.client.generate_content(prompt)
+        response = self.client.generate_content(self._gemini_prompt(prompt, system_prompt))
         return response.text
     
-    def _query_claude(self, prompt: str) -> str:
+    @_llm_retry
+    def _query_claude(self, prompt: str, system_prompt: Optional[str] = None,
+                      json_schema: Optional[Dict[str, Any]] = None) -> str:
         """Query Anthropic Claude API"""
-        response = self.client.messages.create(
-            model=os.getenv('CLAUDE_MODEL', 'claude-3-sonnet-20240229'),
-            max_tokens=2000,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
+        return "".join(self._stream_claude(prompt, system_prompt, json_schema))
+    
+    def _stream_openai(self, prompt: str, system_prompt: Optional[str] = None,
+                       json_schema: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Stream OpenAI completion text deltas"""
+        stream = self.client.chat.completions.create(
+            **self._openai_request(prompt, system_prompt, json_schema),
+            stream=True
+        )
+        
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def _stream_gemini(self, prompt: str, system_prompt: Optional[str] = None,
+                       json_schema: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Stream Google Gemini response text"""
+        for chunk in self.client.generate_content(self._gemini_prompt(prompt, system_prompt), stream=True):
+            if chunk.text:
+                yield chunk.text
+    
+    def _stream_claude(self, prompt: str, system_prompt: Optional[str] = None,
+                       json_schema: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Stream Anthropic Claude text deltas (tool input JSON when json_schema is set)"""
+        with self.client.messages.stream(**self._claude_request(prompt, system_prompt, json_schema)) as stream:
+            for event in stream:
+                if event.type == 'text':
+                    yield event.text
+                elif event.type == 'input_json' and event.partial_json:
+                    yield event.partial_json
+    
+    def stream_seo_insights(self, analysis_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Stream SEO insights as they are generated
+        
+        Yields events:
+            {'type': 'delta', 'text': str}    - raw response text as it arrives
+            {'type': 'result', 'data': dict}  - parsed insights once complete
+            {'type': 'error', 'data': dict}   - configuration or provider error
+        """
+        if not self.client:
+            yield {'type': 'error', 'data': self._not_configured_error()}
+            return
+        
+        cache, cache_key, cached = self._lookup_cached(analysis_data)
+        if cached is not None:
+            yield {'type': 'result', 'data': cached}
+            return
+        
+        system_prompt = self._static_system_prompt()
+        prompt = self._dynamic_data_block(analysis_data)
+        
+        stream = self._STREAM_DISPATCH[self.provider](self, prompt, system_prompt, _SEO_INSIGHTS_SCHEMA)
+        
+        chunks = []
+        try:
+            for text in stream:
+                chunks.append(text)
+                yield {'type': 'delta', 'text': text}
+        except Exception as e:
+            yield {
+                'type': 'error',
+                'data': {
+                    'error': str(e),
+                    'message': f'Failed to generate AI insights using {self.provider.value}'
                 }
-            ]
+            }
+            return
+        
+        yield {
+            'type': 'result',
+            'data': self._finalize_insights("".join(chunks), analysis_data, cache, cache_key)
+        }
+    
+    @_llm_retry
+    async def _aquery_openai(self, prompt: str, system_prompt: Optional[str] = None,
+                             json_schema: Optional[Dict[str, Any]] = None) -> str:
+        """Query OpenAI API (async)"""
+        response = await self.async_client.chat.completions.create(
+            **self._openai_request(prompt, system_prompt, json_schema)
         )
         
+        return response.choices[0].message.content
+    
+    async def _aquery_gemini(self, prompt: str, system_prompt: Optional[str] = None,
+                             json_schema: Optional[Dict[str, Any]] = None) -> str:
+        """Query Google Gemini API (the SDK is sync-only, so run it in a thread;
+        _query_gemini already carries the retry policy)"""
+        return await asyncio.to_thread(self._query_gemini, prompt, system_prompt, json_schema)
+    
+    @_llm_retry
+    async def _aquery_claude(self, prompt: str, system_prompt: Optional[str] = None,
+                             json_schema: Optional[Dict[str, Any]] = None) -> str:
+        """Query Anthropic Claude API (async)"""
+        response = await self.async_client.messages.create(
+            **self._claude_request(prompt, system_prompt, json_schema)
+        )
+        
+        for block in response.content:
+            if block.type == 'tool_use':
+                return _json_dumps(block.input)
         return response.content[0].text
     
+    # Provider dispatch tables (plain functions, called with self)
+    _INIT_DISPATCH = {
+        AIProvider.OPENAI: _init_openai,
+        AIProvider.GEMINI: _init_gemini,
+        AIProvider.CLAUDE: _init_claude,
+    }
+    _QUERY_DISPATCH = {
+        AIProvider.OPENAI: _query_openai,
+        AIProvider.GEMINI: _query_gemini,
+        AIProvider.CLAUDE: _query_claude,
+    }
+    _STREAM_DISPATCH = {
+        AIProvider.OPENAI: _stream_openai,
+        AIProvider.GEMINI: _stream_gemini,
+        AIProvider.CLAUDE: _stream_claude,
+    }
+    _AQUERY_DISPATCH = {
+        AIProvider.OPENAI: _aquery_openai,
+        AIProvider.GEMINI: _aquery_gemini,
+        AIProvider.CLAUDE: _aquery_claude,
+    }
+    
     def _parse_ai_response(self, response: str, original_data: Dict) -> Dict[str, Any]:
         """Parse and structure AI response"""
         try:
-            # Try to extract JSON from response
-            import re
-            
-            # Find JSON in markdown code blocks
-            json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
-            if json_match:
-                response = json_match.group(1)
-            
-            # Try to parse as JSON
+            # Try to parse as JSON (bare, fenced or embedded)
             try:
-                parsed = json.loads(response)
+                parsed = _extract_json(response)
             except json.JSONDecodeError:
                 # If not valid JSON, create structured response from text
                 parsed = {
@@ -330,7 +878,7 @@ def generate_meta_tags(content: str, provider: AIProvider = AIProvider.OPENAI) -
     Returns:
         Generated meta tags with SEO scores
     """
-    generator = AIInsightsGenerator(provider)
+    generator = get_generator(provider)
     
     if not generator.client:
         return {
@@ -369,20 +917,10 @@ def generate_meta_tags(content: str, provider: AIProvider = AIProvider.OPENAI) -
 """
     
     try:
-        if provider == AIProvider.OPENAI:
-            response = generator._query_openai(prompt)
-        elif provider == AIProvider.GEMINI:
-            response = generator._query_gemini(prompt)
-        elif provider == AIProvider.CLAUDE:
-            response = generator._query_claude(prompt)
+        response = generator._query(prompt)
         
         # Parse response
-        import re
-        json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
-        if json_match:
-            response = json_match.group(1)
-        
-        result = json.loads(response)
+        result = _extract_json(response)
         result['ai_provider'] = provider.value
         
         return result
@@ -407,7 +945,7 @@ def generate_content_improvements(content: str, keywords: List[str],
     Returns:
         Detailed content improvement suggestions
     """
-    generator = AIInsightsGenerator(provider)
+    generator = get_generator(provider)
     
     if not generator.client:
         return {
@@ -471,20 +1009,10 @@ def generate_content_improvements(content: str, keywords: List[str],
 """
     
     try:
-        if provider == AIProvider.OPENAI:
-            response = generator._query_openai(prompt)
-        elif provider == AIProvider.GEMINI:
-            response = generator._query_gemini(prompt)
-        elif provider == AIProvider.CLAUDE:
-            response = generator._query_claude(prompt)
+        response = generator._query(prompt)
         
         # Parse response
-        import re
-        json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
-        if json_match:
-            response = json_match.group(1)
-        
-        result = json.loads(response)
+        result = _extract_json(response)
         result['ai_provider'] = provider.value
         
         return result
@@ -519,67 +1047,154 @@ def analyze_competitor_content(your_content: str, competitor_url: str,
     }
 
 
+@functools.lru_cache(maxsize=3)
+def get_generator(provider: AIProvider = AIProvider.OPENAI) -> AIInsightsGenerator:
+    """
+    Return the process-wide generator for a provider
+    
+    SDK clients and their connection pools are created once and reused.
+    API keys are read on first use, so set them before the first request.
+    """
+    return AIInsightsGenerator(provider)
+
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Event loop thread used by the sync wrappers
+    
+    The cached async clients hold connection pools bound to the loop they
+    first ran on, so every sync call is run on this one long-lived loop.
+    """
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="ai-insights-loop", daemon=True).start()
+            _LOOP = loop
+    return _LOOP
+
+
 # Convenience functions for different AI providers
 def get_openai_insights(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
     """Get insights using OpenAI"""
-    generator = AIInsightsGenerator(AIProvider.OPENAI)
+    generator = get_generator(AIProvider.OPENAI)
     return generator.generate_seo_insights(analysis_data)
 
 
 def get_gemini_insights(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
     """Get insights using Google Gemini"""
-    generator = AIInsightsGenerator(AIProvider.GEMINI)
+    generator = get_generator(AIProvider.GEMINI)
     return generator.generate_seo_insights(analysis_data)
 
 
 def get_claude_insights(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
     """Get insights using Anthropic Claude"""
-    generator = AIInsightsGenerator(AIProvider.CLAUDE)
+    generator = get_generator(AIProvider.CLAUDE)
     return generator.generate_seo_insights(analysis_data)
 
 
-def get_all_ai_insights(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
+def get_configured_providers() -> List[AIProvider]:
+    """Providers with an API key set, in preference order"""
+    return [p for p, env in _PROVIDER_KEYS.items() if os.getenv(env)]
+
+
+# Circuit breaker: after _BREAKER_THRESHOLD consecutive failures a provider
+# is skipped by get_all_ai_insights for _BREAKER_COOLDOWN seconds
+_BREAKER_THRESHOLD = 5
+_BREAKER_COOLDOWN = 30.0
+_BREAKER = {provider: {'fail': 0, 'open_until': 0.0} for provider in AIProvider}
+_BREAKER_LOCK = threading.Lock()
+
+
+def _breaker_open(provider: AIProvider) -> bool:
+    with _BREAKER_LOCK:
+        return time.monotonic() < _BREAKER[provider]['open_until']
+
+
+def _breaker_record(provider: AIProvider, success: bool) -> None:
+    with _BREAKER_LOCK:
+        state = _BREAKER[provider]
+        if success:
+            state['fail'] = 0
+            state['open_until'] = 0.0
+            return
+        state['fail'] += 1
+        if state['fail'] >= _BREAKER_THRESHOLD:
+            state['open_until'] = time.monotonic() + _BREAKER_COOLDOWN
+
+
+async def _provider_insights_async(provider: AIProvider, analysis_data: Dict[str, Any]):
+    """Run one provider and return (provider name, result) without raising"""
+    try:
+        generator = get_generator(provider)
+        result = await generator.agenerate_seo_insights(analysis_data)
+    except Exception as e:
+        result = {'error': str(e)}
+    _breaker_record(provider, 'error' not in result)
+    return provider.value, result
+
+
+# Exact-match results of get_all_ai_insights, in front of the semantic cache
+_RESULT_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _analysis_digest(analysis_data: Dict[str, Any]) -> str:
+    """Content hash of analysis_data (key-order independent)"""
+    payload = _json_dumps(analysis_data, sort_keys=True).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+async def get_all_ai_insights_async(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Get insights from all available AI providers and combine them
+    Query all configured AI providers concurrently
     
-    Returns best insights or fallback to available provider
+    Returns the first successful result as soon as it arrives and cancels
+    the remaining provider calls. If every provider fails, returns an error
+    summary with each provider's result.
     """
-    results = {}
-    
-    # Try OpenAI
-    if os.getenv('OPENAI_API_KEY'):
-        try:
-            results['openai'] = get_openai_insights(analysis_data)
-        except Exception as e:
-            results['openai'] = {'error': str(e)}
-    
-    # Try Gemini
-    if os.getenv('GEMINI_API_KEY'):
-        try:
-            results['gemini'] = get_gemini_insights(analysis_data)
-        except Exception as e:
-            results['gemini'] = {'error': str(e)}
-    
-    # Try Claude
-    if os.getenv('CLAUDE_API_KEY'):
-        try:
-            results['claude'] = get_claude_insights(analysis_data)
-        except Exception as e:
-            results['claude'] = {'error': str(e)}
+    providers = get_configured_providers()
     
-    # Return best result or combined insights
-    if not results:
+    if not providers:
         return {
             'error': 'No AI provider configured',
             'message': 'Please set at least one of: OPENAI_API_KEY, GEMINI_API_KEY, CLAUDE_API_KEY'
         }
     
-    # Find the first successful result
-    for provider, result in results.items():
-        if 'error' not in result:
-            result['primary_provider'] = provider
-            result['all_providers_tried'] = list(results.keys())
-            return result
+    digest = _analysis_digest(analysis_data)
+    with _RESULT_CACHE_LOCK:
+        cached = _RESULT_CACHE.get(digest)
+    if cached is not None:
+        return dict(cached)
+    
+    results = {p.value: {'error': 'Provider temporarily skipped after repeated failures'}
+               for p in providers if _breaker_open(p)}
+    providers = [p for p in providers if p.value not in results]
+    
+    tasks = [asyncio.ensure_future(_provider_insights_async(p, analysis_data)) for p in providers]
+    
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            provider, result = await next_done
+            results[provider] = result
+            if 'error' not in result:
+                # Copy: the provider's result object is also held by its semantic cache
+                result = {
+                    **result,
+                    'primary_provider': provider,
+                    'all_providers_tried': [p.value for p in providers],
+                }
+                with _RESULT_CACHE_LOCK:
+                    _RESULT_CACHE[digest] = result
+                return dict(result)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
     
     # If all failed, return error summary
     return {
@@ -588,6 +1203,17 @@ def get_all_ai_insights(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def get_all_ai_insights(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get insights from all available AI providers and combine them
+    
+    Sync wrapper around get_all_ai_insights_async; returns the fastest
+    successful provider result.
+    """
+    future = asyncio.run_coroutine_threadsafe(get_all_ai_insights_async(analysis_data), _background_loop())
+    return future.result()
+
+
 if __name__ == "__main__":
     # Test with sample data
     sample_data = {
@@ -625,4 +1251,4 @@ if __name__ == "__main__":
     
     # Test with available provider
     result = get_all_ai_insights(sample_data)
-    print(json.dumps(result, indent=2))
+    print(_json_dumps(result, indent=True))
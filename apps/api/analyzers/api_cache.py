@@ -0,0 +1,87 @@
+"""
+Response cache for slow-changing third-party API results (MOZ, PageSpeed, SerpAPI)
+
+Each namespace has its own TTL. Entries live on disk in API_CACHE_DIR when
+diskcache is installed (shared by workers, survives restarts), otherwise in
+an in-process TTLCache. Results containing an "error" key are never cached.
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from cachetools import TTLCache
+
+# Try to import diskcache (falls back to an in-process TTLCache)
+try:
+    from diskcache import Cache  # type: ignore
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+API_CACHE_DIR = os.getenv("API_CACHE_DIR", "/tmp/seo_api_cache")
+MEMORY_CACHE_SIZE = 1024
+
+_CACHES: Dict[str, Any] = {}
+_CACHE_INIT_LOCK = threading.Lock()
+_MEMORY_CACHE_LOCK = threading.Lock()
+
+
+def _cache(namespace: str, ttl_s: int):
+    with _CACHE_INIT_LOCK:
+        cache = _CACHES.get(namespace)
+        if cache is None:
+            cache = TTLCache(maxsize=MEMORY_CACHE_SIZE, ttl=ttl_s)
+            if DISKCACHE_AVAILABLE:
+                try:
+                    cache = Cache(os.path.join(API_CACHE_DIR, namespace))
+                except Exception:
+                    pass  # e.g. read-only filesystem
+            _CACHES[namespace] = cache
+    return cache
+
+
+def cache_get(namespace: str, ttl_s: int, key: Hashable) -> Optional[Dict[str, Any]]:
+    """Cached result for key, or None (also when ttl_s is 0)"""
+    if ttl_s <= 0:
+        return None
+    cache = _cache(namespace, ttl_s)
+    try:
+        if isinstance(cache, TTLCache):
+            with _MEMORY_CACHE_LOCK:
+                return cache.get(key)
+        return cache.get(key)
+    except Exception:
+        return None
+
+
+def cache_put(namespace: str, ttl_s: int, key: Hashable, result: Dict[str, Any]) -> None:
+    """Store result for key, unless caching is disabled or it carries an "error" """
+    if ttl_s <= 0 or not isinstance(result, dict) or "error" in result:
+        return
+    cache = _cache(namespace, ttl_s)
+    try:
+        if isinstance(cache, TTLCache):
+            with _MEMORY_CACHE_LOCK:
+                cache[key] = result
+        else:
+            cache.set(key, result, expire=ttl_s)
+    except Exception:
+        pass
+
+
+def cached_result(namespace: str, ttl_s: int, key: Hashable, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Return the cached result for key, or call fetch() and cache what it returns
+
+    Args:
+        namespace: Cache name (one per API / endpoint)
+        ttl_s: Seconds a result stays valid; 0 disables caching
+        key: Hashable request identity (e.g. the URL and parameters)
+        fetch: Makes the API call; returns a result dict
+    """
+    hit = cache_get(namespace, ttl_s, key)
+    if hit is not None:
+        return hit
+    result = fetch()
+    cache_put(namespace, ttl_s, key, result)
+    return result
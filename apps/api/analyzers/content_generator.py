@@ -4,34 +4,37 @@ Generates topical, holistic, E-E-A-T optimized content using OpenAI/Anthropic/Go
 Supports latest models: GPT-4o, Claude 3.7 Sonnet, Gemini 2.0 Flash, etc.
 """
 import os
-from typing import Dict, Any, Optional, List
+import re
+import json
+import time
+import string
+import textwrap
+import contextlib
+import asyncio
+import hashlib
+import functools
+import weakref
+import threading
+import concurrent.futures
+import importlib.util
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Iterable, Iterator, AsyncIterator, Union
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    stop_after_delay,
+    wait_exponential_jitter,
+)
 from .llm_registry import get_default_model
-import anthropic
-from openai import OpenAI
 
-# Try to import Google Gemini
 try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    GEMINI_AVAILABLE = False
-
-# Try to import Mistral (support both new and old SDKs)
-MISTRAL_AVAILABLE = False
-MISTRAL_SDK_MODE = None  # "new" or "old"
-try:
-    from mistralai.client import MistralClient  # type: ignore
-    from mistralai.models.chat_completion import ChatMessage  # type: ignore
-    MISTRAL_AVAILABLE = True
-    MISTRAL_SDK_MODE = "new"
-except Exception:
-    try:
-        from mistralai import Mistral as MistralClient  # type: ignore
-        ChatMessage = None  # not used in old SDK
-        MISTRAL_AVAILABLE = True
-        MISTRAL_SDK_MODE = "old"
-    except Exception:
-        MISTRAL_AVAILABLE = False
+    ORJSON_AVAILABLE = False
 
 
 def build_content_prompt(
@@ -48,70 +51,805 @@ def build_content_prompt(
     local_context: Optional[str] = None,
 ) -> str:
     """
-    Build the full prompt for topical/holistic SEO content generation.
+    Build the per-request prompt for topical/holistic SEO content generation.
+    The static writing instructions are in SYSTEM_PROMPT.
+    
+    Memoized: list arguments are converted to tuples for the cache key.
+    Secondary keywords are stripped, lowercased and deduplicated (order kept).
     """
-    secondary_kw_str = ", ".join(secondary_keywords) if secondary_keywords else "None provided"
-    competitor_str = (
-        f"\n- Model the structure after websites like: {', '.join(competitor_urls)}"
-        if competitor_urls
-        else ""
+    return _build_content_prompt(
+        topic,
+        page_type,
+        main_keyword,
+        tuple(dict.fromkeys(k.strip().lower() for k in secondary_keywords or () if k.strip())),
+        target_location,
+        target_audience,
+        language,
+        tone,
+        word_count,
+        tuple(competitor_urls) if competitor_urls else None,
+        local_context,
     )
-    local_str = (
-        f"\n- Add local references and context about {local_context}, using nearby landmarks or regional details."
-        if local_context
-        else ""
+
+
+# Static writing instructions, sent as the system prompt so providers can cache them
+_CONTENT_GUIDELINES = textwrap.dedent("""\
+    You are an expert SEO content writer specializing in topical authority, E-E-A-T, and holistic content strategies.
+    Write complete, search-optimized web page text following Topical Authority, E-E-A-T and Semantic SEO.
+
+    SEO GOALS:
+    - Topical SEO: cover all semantically related subtopics.
+    - Holistic SEO: fully satisfy the user intent (transactional / informational / navigational).
+    - E-E-A-T: show experience, expertise, authority and trust throughout.
+    - Optimize H1–H3 headings for readability and SEO relevance.
+    - Suggest 2–3 internal links to related pages (placeholders like [link: related-topic]).
+    - Include a short FAQ (3-5 questions) answering user intent-based questions.
+    - End with a meta title (max 60 chars) and meta description (max 155 chars).
+
+    STRUCTURE:
+    - H1: the main keyword, used naturally.
+    - Introduction: 3–4 sentences summarizing the topic and value.
+    - H2–H3 sections: benefits, process, reasons to choose, pricing factors and relevant subtopics.
+    - CTA: a short, persuasive paragraph encouraging the user to take action.
+
+    STYLE:
+    - Use semantic terms common in Google's top 10 results for the main keyword.
+    - Write as a professional with 15+ years of experience in the field.
+    - Use emotional and persuasive triggers that lead users to take action.
+    - Unique and natural (no keyword stuffing), semantically rich, human-readable and conversion-oriented.""")
+
+# Per-request part of the prompt (user message)
+_PROMPT_TEMPLATE = string.Template(textwrap.dedent("""\
+    Page type: ${page_type}
+    Target location: ${target_location}
+    Target audience: ${target_audience}
+    Main keyword: ${main_keyword}
+    Secondary keywords: ${secondary_keywords}
+    Language and tone: ${language}, ${tone}
+    Word count: minimum ${word_count} words${competitor_tip}${local_tip}
+
+    Topic: ${topic}"""))
+
+
+@functools.lru_cache(maxsize=512)
+def _build_content_prompt(
+    topic: str,
+    page_type: str,
+    main_keyword: str,
+    secondary_keywords: tuple,
+    target_location: Optional[str],
+    target_audience: Optional[str],
+    language: str,
+    tone: str,
+    word_count: int,
+    competitor_urls: Optional[tuple],
+    local_context: Optional[str],
+) -> str:
+    return _PROMPT_TEMPLATE.substitute(
+        topic=topic,
+        page_type=page_type,
+        target_location=target_location or "Global",
+        target_audience=target_audience or "General audience",
+        main_keyword=main_keyword,
+        secondary_keywords=", ".join(secondary_keywords) if secondary_keywords else "None provided",
+        language=language,
+        tone=tone,
+        word_count=word_count,
+        competitor_tip=(
+            f"\nModel the structure after websites like: {', '.join(competitor_urls)}" if competitor_urls else ""
+        ),
+        local_tip=(
+            f"\nLocal context: {local_context} (use nearby landmarks or regional details)" if local_context else ""
+        ),
     )
 
-    prompt = f"""You are an expert in holistic and topical SEO content writing.
-Your task is to create a complete, search-optimized web page text that follows modern SEO principles (Topical Authority, E-E-A-T, and Semantic SEO).
-
-INSTRUCTIONS:
-
-1. **Page Context**
-- Page type: {page_type}
-- Target location: {target_location or "Global"}
-- Target audience: {target_audience or "General audience"}
-- Main keyword: {main_keyword}
-- Secondary keywords: {secondary_kw_str}
-- Language and tone: {language}, {tone}
-
-2. **SEO Goals**
-- Follow Topical SEO: cover all semantically related subtopics.
-- Follow Holistic SEO: ensure the content fully satisfies the user intent (transactional / informational / navigational).
-- Apply E-E-A-T: demonstrate experience, expertise, authority, and trust throughout the text.
-- Optimize headings (H1–H3) for readability and SEO relevance.
-- Suggest 2–3 internal links to related pages (use placeholder links like [link: related-topic]).
-- Include a short FAQ section (3-5 questions) that answers user intent-based questions.
-- Provide meta title (max 60 chars) and meta description (max 155 chars) at the end.
-
-3. **Content Structure**
-- H1: include the main keyword naturally.
-- Introduction: 3–4 sentences that summarize the topic and value.
-- H2–H3 sections: cover benefits, process, reasons to choose, pricing factors, and relevant subtopics.
-- CTA: a short, persuasive paragraph encouraging the user to take action.
-- Word count: minimum {word_count} words.
-
-4. **Output Format**
-Return the content in clean Markdown format, using proper H2/H3 hierarchy, bullet points, and short paragraphs.
-
-**Additional Professional Tips:**
-- Use semantic terms that commonly appear in Google's top 10 results for this keyword.
-- Write as if authored by an experienced professional with 15+ years of experience in this field.
-- Include emotional and persuasive triggers that lead users to take action.{competitor_str}{local_str}
-
-Please ensure the content is:
-- Unique and natural (no keyword stuffing),
-- Semantically rich,
-- SEO-optimized,
-- Human-readable and conversion-oriented.
-
-Now generate the content for:
-**Topic:** {topic}
-"""
-    return prompt
 
+# Structured page content returned with output_format="json" (section/FAQ bodies in Markdown)
+_STRING = {"type": "string"}
+CONTENT_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "h1": _STRING,
+        "intro": _STRING,
+        "sections": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "h2": _STRING,
+                    "body": _STRING,
+                    "h3s": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {"h3": _STRING, "body": _STRING},
+                            "required": ["h3", "body"],
+                            "additionalProperties": False,
+                        },
+                    },
+                },
+                "required": ["h2", "body", "h3s"],
+                "additionalProperties": False,
+            },
+        },
+        "faq": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"q": _STRING, "a": _STRING},
+                "required": ["q", "a"],
+                "additionalProperties": False,
+            },
+        },
+        "meta_title": _STRING,
+        "meta_description": _STRING,
+        "cta": _STRING,
+    },
+    "required": ["h1", "intro", "sections", "faq", "meta_title", "meta_description", "cta"],
+    "additionalProperties": False,
+}
+
+SYSTEM_PROMPT = _CONTENT_GUIDELINES + (
+    "\n\nReturn clean Markdown with a proper H2/H3 hierarchy, bullet points and short paragraphs."
+)
+JSON_SYSTEM_PROMPT = _CONTENT_GUIDELINES + (
+    "\n\nRespond with ONLY valid JSON matching this schema (section and FAQ bodies in Markdown):\n"
+    + json.dumps(CONTENT_JSON_SCHEMA, separators=(",", ":"))
+)
+SYSTEM_PROMPTS = {
+    "markdown": SYSTEM_PROMPT,
+    "json": JSON_SYSTEM_PROMPT,
+}
+MAX_OUTPUT_TOKENS = 4000
+TEMPERATURE = 0.7
+
+# Routes requests sharing a system prompt prefix to the same OpenAI prompt cache
+OPENAI_PROMPT_CACHE_KEYS = {
+    output_format: hashlib.blake2b(system.encode(), digest_size=8).hexdigest()
+    for output_format, system in SYSTEM_PROMPTS.items()
+}
+
+
+def _json_loads(text: str) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _format_result(result: Dict[str, Any], output_format: str) -> Dict[str, Any]:
+    """For output_format="json", parse the returned content into result["data"]"""
+    if output_format != "json" or not result.get("success"):
+        return result
+    try:
+        result["data"] = _json_loads(result["content"])
+    except ValueError as e:  # orjson.JSONDecodeError is a ValueError too
+        return _error_result(result["provider"], f"Provider returned invalid JSON: {e}")
+    return result
+
+
+# Generated content keyed by (provider, model, prompt); successful results only
+RESPONSE_CACHE_TTL = 3600
+RESPONSE_CACHE_MAXSIZE = 100
+_RESPONSE_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def _response_cache_key(provider: str, model: Optional[str], prompt: str, output_format: str = "markdown") -> str:
+    return hashlib.blake2b(f"{provider}\0{model or ''}\0{output_format}\0{prompt}".encode()).hexdigest()
+
+
+def _response_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    with _RESPONSE_CACHE_LOCK:
+        entry = _RESPONSE_CACHE.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del _RESPONSE_CACHE[key]
+            return None
+        _RESPONSE_CACHE.move_to_end(key)
+        return dict(result)
+
+
+def _response_cache_put(key: str, result: Dict[str, Any]) -> None:
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE[key] = (time.monotonic() + RESPONSE_CACHE_TTL, dict(result))
+        _RESPONSE_CACHE.move_to_end(key)
+        while len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAXSIZE:
+            _RESPONSE_CACHE.popitem(last=False)
+
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    """Snapshot of the provider env vars (API keys, default models, Azure routing)"""
+    openai_api_key: Optional[str] = field(repr=False)
+    openai_model: str
+    azure_endpoint: Optional[str]
+    azure_key: Optional[str] = field(repr=False)
+    azure_deployment: Optional[str]
+    anthropic_api_key: Optional[str] = field(repr=False)
+    anthropic_model: str
+    google_api_key: Optional[str] = field(repr=False)
+    gemini_model: str
+    mistral_api_key: Optional[str] = field(repr=False)
+    mistral_model: str
+
+
+@functools.lru_cache(maxsize=1)
+def _config() -> ProviderConfig:
+    """
+    Read provider settings from the environment once.
+    Call _config.cache_clear() after changing env vars (tests, reload).
+    """
+    return ProviderConfig(
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        openai_model=os.getenv("OPENAI_MODEL", get_default_model("openai") or "gpt-4o"),
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        azure_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
+        anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
+        anthropic_model=os.getenv("ANTHROPIC_MODEL", get_default_model("anthropic") or "claude-3-7-sonnet-20250219"),
+        google_api_key=os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY"),
+        gemini_model=os.getenv("GEMINI_MODEL", get_default_model("gemini") or "gemini-2.0-flash-exp"),
+        mistral_api_key=os.getenv("MISTRAL_API_KEY"),
+        mistral_model=os.getenv("MISTRAL_MODEL", get_default_model("mistral") or "mistral-large-latest"),
+    )
+
+
+# SDKs are imported on first use (and only once) so unused providers cost nothing
+@functools.lru_cache(maxsize=None)
+def _load_openai():
+    try:
+        import openai
+        return openai
+    except ImportError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_anthropic():
+    try:
+        import anthropic
+        return anthropic
+    except ImportError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_gemini():
+    try:
+        import google.generativeai as genai
+        return genai
+    except ImportError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_mistral():
+    """Return (client class, ChatMessage class, sdk mode); mode is "new", "old" or None if not installed"""
+    try:
+        from mistralai.client import MistralClient  # type: ignore
+        from mistralai.models.chat_completion import ChatMessage  # type: ignore
+        return MistralClient, ChatMessage, "new"
+    except Exception:
+        try:
+            from mistralai import Mistral as MistralClient  # type: ignore
+            return MistralClient, None, "old"  # ChatMessage not used in old SDK
+        except Exception:
+            return None, None, None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_tiktoken():
+    try:
+        import tiktoken
+        return tiktoken
+    except ImportError:
+        return None
+
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+# Connection pool shared by every client of a provider SDK (all keys/base URLs)
+HTTP_POOL_LIMITS = {"max_connections": 200, "max_keepalive_connections": 100, "keepalive_expiry": 60}
+HTTP_POOL_TIMEOUTS = {"connect": 5, "read": 60, "write": 60, "pool": 5}
+_ASYNC_HTTP_CLIENTS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _http_client_kwargs(sdk) -> Optional[Dict[str, Any]]:
+    """Pool settings in the SDK's own httpx types (None on SDKs without DEFAULT_CONNECTION_LIMITS)"""
+    default_limits = getattr(sdk, "DEFAULT_CONNECTION_LIMITS", None)
+    if default_limits is None or not hasattr(sdk, "Timeout"):
+        return None
+    return {
+        "limits": type(default_limits)(**HTTP_POOL_LIMITS),
+        "timeout": sdk.Timeout(HTTP_POOL_TIMEOUTS["read"], **HTTP_POOL_TIMEOUTS),
+        "http2": HTTP2_AVAILABLE,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _pooled_http_client(sdk):
+    """
+    Keep-alive HTTP client for an OpenAI/Anthropic SDK module, built from the
+    SDK's own DefaultHttpxClient (None on SDKs without it: use their default)
+    """
+    kwargs = _http_client_kwargs(sdk)
+    if kwargs is None or not hasattr(sdk, "DefaultHttpxClient"):
+        return None
+    return sdk.DefaultHttpxClient(**kwargs)
 
-def generate_content_openai(prompt: str, model: str = None) -> Dict[str, Any]:
+
+def _pooled_async_http_client(sdk):
+    """
+    Async _pooled_http_client. Async pools are bound to an event loop, so one
+    is kept per running loop (the server's loop reuses it for every request).
+    """
+    kwargs = _http_client_kwargs(sdk)
+    if kwargs is None or not hasattr(sdk, "DefaultAsyncHttpxClient"):
+        return None
+    clients = _ASYNC_HTTP_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    if sdk.__name__ not in clients:
+        clients[sdk.__name__] = sdk.DefaultAsyncHttpxClient(**kwargs)
+    return clients[sdk.__name__]
+
+
+@functools.lru_cache(maxsize=None)
+def _mistral_http_client():
+    """Pooled httpx client for the old Mistral SDK (the new one builds its own)"""
+    import httpx
+    return httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(**HTTP_POOL_LIMITS),
+        timeout=httpx.Timeout(**HTTP_POOL_TIMEOUTS),
+    )
+
+
+# Sync clients are cached; async SDK clients are cheap wrappers created per
+# call around the per-loop async pool.
+@functools.lru_cache(maxsize=8)
+def _get_openai_client(api_key: str, base_url: Optional[str] = None):
+    openai = _load_openai()
+    return openai.OpenAI(
+        api_key=api_key, base_url=base_url, max_retries=0, http_client=_pooled_http_client(openai)
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _get_anthropic_client(api_key: str):
+    anthropic = _load_anthropic()
+    return anthropic.Anthropic(api_key=api_key, max_retries=0, http_client=_pooled_http_client(anthropic))
+
+
+# Blocking Mistral calls from async code (old SDK); sized for expected concurrency
+MISTRAL_POOL_WORKERS = 32
+_MISTRAL_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=MISTRAL_POOL_WORKERS, thread_name_prefix="mistral")
+
+
+@functools.lru_cache(maxsize=8)
+def _get_mistral_client(api_key: str):
+    client_cls, _, sdk_mode = _load_mistral()
+    if sdk_mode == "new":
+        return client_cls(api_key=api_key, max_retries=0)
+    return client_cls(api_key=api_key, client=_mistral_http_client())
+
+
+def _openai_client(api_key: str, model: str, asynchronous: bool = False):
+    """Return (client, resolved_model), routing through Azure OpenAI when configured"""
+    # Azure OpenAI support via env vars
+    cfg = _config()
+    azure_endpoint = cfg.azure_endpoint
+    azure_api_key = cfg.azure_key
+    azure_deployment = cfg.azure_deployment or model
+
+    base_url = None
+    resolved_model = model
+    if azure_endpoint and azure_api_key:
+        # Use Azure OpenAI Completions API compatibility
+        api_key = azure_api_key
+        base_url = f"{azure_endpoint.rstrip('/')}/openai/deployments/{azure_deployment}"
+        # For azure, set model to 'gpt-4o' like; deployment name resolves routing
+        resolved_model = azure_deployment
+
+    if asynchronous:
+        openai = _load_openai()
+        client = openai.AsyncOpenAI(
+            api_key=api_key, base_url=base_url, max_retries=0, http_client=_pooled_async_http_client(openai)
+        )
+        return client, resolved_model
+    return _get_openai_client(api_key, base_url), resolved_model
+
+
+def _build_reasoning_request(prompt: str, model: str, output_format: str = "markdown") -> Dict[str, Any]:
+    # o-series reasoning models: no system message or temperature; JSON is requested in the prompt
+    return {
+        "model": model,
+        "messages": [
+            {"role": "user", "content": f"{SYSTEM_PROMPTS[output_format]}\n\n{prompt}"},
+        ],
+        "max_completion_tokens": MAX_OUTPUT_TOKENS,
+    }
+
+
+def _build_standard_request(prompt: str, model: str, output_format: str = "markdown") -> Dict[str, Any]:
+    request = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPTS[output_format]},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": TEMPERATURE,
+        "max_tokens": MAX_OUTPUT_TOKENS,
+    }
+    if output_format == "json":
+        request["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": "seo_content", "strict": True, "schema": CONTENT_JSON_SCHEMA},
+        }
+    if not _config().azure_endpoint:
+        request["extra_body"] = {"prompt_cache_key": OPENAI_PROMPT_CACHE_KEYS[output_format]}
+    return request
+
+
+# Request builder per model family (model name up to the first "-"); unknown
+# families, including Azure deployment names, get the standard chat request
+_OPENAI_BUILDERS = {
+    "o1": _build_reasoning_request,
+    "o3": _build_reasoning_request,
+    "o4": _build_reasoning_request,
+    "gpt": _build_standard_request,
+    "chatgpt": _build_standard_request,
+}
+
+
+def _openai_request(prompt: str, model: str, output_format: str = "markdown") -> Dict[str, Any]:
+    """Chat completion arguments for a model"""
+    builder = _OPENAI_BUILDERS.get(model.split("-", 1)[0], _build_standard_request)
+    return builder(prompt, model, output_format)
+
+
+# Static system prompt flagged for Anthropic prompt caching (5 min TTL); the cached
+# prefix also covers the JSON tool definition, which precedes the system prompt.
+# Below the model's minimum cacheable length the flag is ignored.
+_CLAUDE_SYSTEM_BLOCKS = {
+    output_format: [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+    for output_format, system in SYSTEM_PROMPTS.items()
+}
+
+
+def _claude_request(prompt: str, model: str, output_format: str = "markdown") -> Dict[str, Any]:
+    """Messages API arguments; JSON output is forced through a single tool call"""
+    request = {
+        "model": model,
+        "max_tokens": MAX_OUTPUT_TOKENS,
+        "temperature": TEMPERATURE,
+        "system": _CLAUDE_SYSTEM_BLOCKS[output_format],
+        "messages": [{"role": "user", "content": prompt}],
+    }
+    if output_format == "json":
+        request["tools"] = [{
+            "name": "seo_content",
+            "description": "Return the generated page content",
+            "input_schema": CONTENT_JSON_SCHEMA,
+        }]
+        request["tool_choice"] = {"type": "tool", "name": "seo_content"}
+    return request
+
+
+def _gemini_schema(schema: Any) -> Any:
+    """CONTENT_JSON_SCHEMA without additionalProperties, which Gemini's schema type rejects"""
+    if isinstance(schema, dict):
+        return {k: _gemini_schema(v) for k, v in schema.items() if k != "additionalProperties"}
+    return schema
+
+
+@functools.lru_cache(maxsize=8)
+def _gemini_model(api_key: str, model: str, system_instruction: str = SYSTEM_PROMPT):
+    # genai.configure is process-global, so models are cached per key as well
+    genai = _load_gemini()
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name=model, system_instruction=system_instruction)
+
+
+GEMINI_GENERATION_CONFIG = {
+    "temperature": TEMPERATURE,
+    "max_output_tokens": MAX_OUTPUT_TOKENS,
+}
+GEMINI_GENERATION_CONFIGS = {
+    "markdown": GEMINI_GENERATION_CONFIG,
+    "json": {
+        **GEMINI_GENERATION_CONFIG,
+        "response_mime_type": "application/json",
+        "response_schema": _gemini_schema(CONTENT_JSON_SCHEMA),
+    },
+}
+
+
+def _mistral_messages(prompt: str, output_format: str = "markdown") -> list:
+    _, ChatMessage, sdk_mode = _load_mistral()
+    system_prompt = SYSTEM_PROMPTS[output_format]
+    if sdk_mode == "new":
+        return [
+            ChatMessage(role="system", content=system_prompt),
+            ChatMessage(role="user", content=prompt),
+        ]
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _mistral_request(prompt: str, model: str, output_format: str = "markdown") -> Dict[str, Any]:
+    """Chat arguments (same for both SDK generations)"""
+    request = {
+        "model": model,
+        "messages": _mistral_messages(prompt, output_format),
+        "temperature": TEMPERATURE,
+        "max_tokens": MAX_OUTPUT_TOKENS,
+    }
+    if output_format == "json":
+        request["response_format"] = {"type": "json_object"}
+    return request
+
+
+def _error_result(provider: str, error: str) -> Dict[str, Any]:
+    return {
+        "success": False,
+        "error": error,
+        "provider": provider,
+    }
+
+
+# Provider calls retry transient errors (SDK retries are disabled so attempts
+# don't multiply), up to max_retries extra attempts within retry_budget_s
+MAX_RETRIES = 3
+RETRY_BUDGET_S = 30.0
+_TRANSIENT_ERROR_TYPES = ("rate_limit", "timeout", "connection", "server_error")
+
+
+def _error_type(exc: BaseException) -> str:
+    """Classify a provider SDK exception by HTTP status and exception class name"""
+    status = getattr(exc, "status_code", None)
+    name = type(exc).__name__
+    if status == 429 or "RateLimit" in name or name in ("TooManyRequests", "ResourceExhausted"):
+        return "rate_limit"
+    if "Timeout" in name or name == "DeadlineExceeded":
+        return "timeout"
+    if "Connection" in name:
+        return "connection"
+    if status in (401, 403) or name in ("AuthenticationError", "PermissionDeniedError", "PermissionDenied"):
+        return "auth"
+    if (isinstance(status, int) and status >= 500) or name in (
+        "InternalServerError", "ServiceUnavailable", "OverloadedError"
+    ):
+        return "server_error"
+    if isinstance(status, int) and 400 <= status < 500:
+        return "bad_request"
+    return "unknown"
+
+
+def _is_transient(exc: BaseException) -> bool:
+    return _error_type(exc) in _TRANSIENT_ERROR_TYPES
+
+
+def _exception_result(provider: str, exc: BaseException) -> Dict[str, Any]:
+    """_error_result with the error class and the server's retry-after hint, if any"""
+    result = _error_result(provider, str(exc))
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    result["error_type"] = _error_type(exc)
+    result["retry_after"] = headers.get("retry-after") if headers is not None else None
+    return result
+
+
+def _retry_policy(max_retries: int, retry_budget_s: float) -> Dict[str, Any]:
+    return {
+        "stop": stop_after_attempt(max_retries + 1) | stop_after_delay(retry_budget_s),
+        "wait": wait_exponential_jitter(initial=0.5, max=8),
+        "retry": retry_if_exception(_is_transient),
+        "reraise": True,
+    }
+
+
+def _with_retry(call, max_retries: int = MAX_RETRIES, retry_budget_s: float = RETRY_BUDGET_S):
+    for attempt in Retrying(**_retry_policy(max_retries, retry_budget_s)):
+        with attempt:
+            return call()
+
+
+async def _awith_retry(call, max_retries: int = MAX_RETRIES, retry_budget_s: float = RETRY_BUDGET_S):
+    async for attempt in AsyncRetrying(**_retry_policy(max_retries, retry_budget_s)):
+        with attempt:
+            return await call()
+
+
+def _openai_result(response, model: str, output_format: str = "markdown") -> Dict[str, Any]:
+    return _format_result({
+        "success": True,
+        "content": response.choices[0].message.content,
+        "provider": "openai",
+        "model": model,
+        "tokens_used": response.usage.total_tokens if response.usage else None,
+    }, output_format)
+
+
+def _claude_result(message, model: str, output_format: str = "markdown") -> Dict[str, Any]:
+    content = ""
+    for block in message.content or ():
+        if block.type == "tool_use":
+            # JSON output arrives as the forced tool call's input
+            content = json.dumps(block.input, ensure_ascii=False)
+            break
+        if block.type == "text":
+            content = block.text
+            break
+    return _format_result({
+        "success": True,
+        "content": content,
+        "provider": "anthropic",
+        "model": model,
+        "tokens_used": message.usage.input_tokens + message.usage.output_tokens if message.usage else None,
+    }, output_format)
+
+
+def _gemini_result(response, model: str, output_format: str = "markdown") -> Dict[str, Any]:
+    # Calculate tokens (approximate)
+    tokens_used = None
+    if hasattr(response, 'usage_metadata'):
+        tokens_used = response.usage_metadata.total_token_count
+    
+    return _format_result({
+        "success": True,
+        "content": response.text if response.text else "",
+        "provider": "gemini",
+        "model": model,
+        "tokens_used": tokens_used,
+    }, output_format)
+
+
+def _mistral_result(response, model: str, output_format: str = "markdown") -> Dict[str, Any]:
+    return _format_result({
+        "success": True,
+        "content": response.choices[0].message.content if response and getattr(response, "choices", None) else "",
+        "provider": "mistral",
+        "model": model,
+        "tokens_used": None,
+    }, output_format)
+
+
+def _resolve_openai(model: Optional[str]):
+    if _load_openai() is None:
+        return None, model, "openai library not installed. Install: pip install openai"
+    cfg = _config()
+    api_key = cfg.openai_api_key
+    model = model or cfg.openai_model
+    if not api_key:
+        return None, model, "OPENAI_API_KEY not configured"
+    return api_key, model, None
+
+
+def _resolve_claude(model: Optional[str]):
+    if _load_anthropic() is None:
+        return None, model, "anthropic library not installed. Install: pip install anthropic"
+    cfg = _config()
+    api_key = cfg.anthropic_api_key
+    model = model or cfg.anthropic_model
+    if not api_key:
+        return None, model, "ANTHROPIC_API_KEY not configured"
+    return api_key, model, None
+
+
+def _resolve_gemini(model: Optional[str]):
+    if _load_gemini() is None:
+        return None, model, "Google Generative AI library not installed. Install: pip install google-generativeai"
+    cfg = _config()
+    api_key = cfg.google_api_key
+    model = model or cfg.gemini_model
+    if not api_key:
+        return None, model, "GOOGLE_API_KEY or GEMINI_API_KEY not configured"
+    return api_key, model, None
+
+
+def _resolve_mistral(model: Optional[str]):
+    if _load_mistral()[2] is None:
+        return None, model, "mistralai library not installed. Install: pip install mistralai"
+    cfg = _config()
+    api_key = cfg.mistral_api_key
+    model = model or cfg.mistral_model
+    if not api_key:
+        return None, model, "MISTRAL_API_KEY not configured"
+    return api_key, model, None
+
+
+# Context window per provider (tokens), conservative for the models each one serves
+CONTEXT_WINDOWS = {
+    "openai": 128_000,
+    "anthropic": 200_000,
+    "gemini": 1_000_000,
+    "mistral": 128_000,
+}
+TOKEN_SAFETY_MARGIN = 256
+
+
+@functools.lru_cache(maxsize=16)
+def _encoding(model: str):
+    """tiktoken encoding for a model (o200k_base for unknown/non-OpenAI models); None if unavailable"""
+    tiktoken = _load_tiktoken()
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception:
+        return None  # BPE files could not be loaded (e.g. offline)
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def _count_tokens(text: str, model: str) -> int:
+    """
+    Local token count. Exact for OpenAI models, a close estimate for other
+    providers; without tiktoken, a conservative ~3 characters per token.
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // 3 + 1
+    return len(encoding.encode_ordinary(text))
+
+
+def _provider_model(provider: str, model: Optional[str]) -> str:
+    cfg = _config()
+    defaults = {
+        "openai": cfg.openai_model,
+        "anthropic": cfg.anthropic_model,
+        "gemini": cfg.gemini_model,
+        "mistral": cfg.mistral_model,
+    }
+    return model or defaults.get(provider, cfg.openai_model)
+
+
+def _fit_content_prompt(provider: str, model: Optional[str], output_format: str = "markdown",
+                        **prompt_kwargs: Any):
+    """
+    Build the content prompt and make sure it fits the provider's context
+    window next to the system prompt and MAX_OUTPUT_TOKENS, so oversized input
+    fails (or is trimmed) before it is uploaded. While too long, drop
+    competitor URLs from the end, then halve local_context, then drop
+    secondary keywords from the end.
+    
+    Returns (prompt, None) or (None, error dict).
+    """
+    model = _provider_model(provider, model)
+    budget = (
+        CONTEXT_WINDOWS.get(provider, CONTEXT_WINDOWS["openai"])
+        - MAX_OUTPUT_TOKENS
+        - _count_tokens(SYSTEM_PROMPTS[output_format], model)
+        - TOKEN_SAFETY_MARGIN
+    )
+    kwargs = dict(prompt_kwargs)
+    while True:
+        prompt = build_content_prompt(**kwargs)
+        tokens = _count_tokens(prompt, model)
+        if tokens <= budget:
+            return prompt, None
+        if kwargs.get("competitor_urls"):
+            kwargs["competitor_urls"] = kwargs["competitor_urls"][:-1] or None
+        elif kwargs.get("local_context"):
+            kwargs["local_context"] = kwargs["local_context"][:len(kwargs["local_context"]) // 2] or None
+        elif kwargs.get("secondary_keywords"):
+            kwargs["secondary_keywords"] = kwargs["secondary_keywords"][:-1]
+        else:
+            return None, {
+                "success": False,
+                "error": f"Prompt is {tokens} tokens, over the {budget} token input budget for {model}",
+            }
+
+
+def generate_content_openai(prompt: str, model: str = None, output_format: str = "markdown",
+                            max_retries: int = MAX_RETRIES, retry_budget_s: float = RETRY_BUDGET_S) -> Dict[str, Any]:
     """
     Generate content using OpenAI models.
     
@@ -122,74 +860,92 @@ def generate_content_openai(prompt: str, model: str = None) -> Dict[str, Any]:
     - o1-preview (advanced reasoning)
     - o1-mini (reasoning, cost-effective)
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    model = model or os.getenv("OPENAI_MODEL", get_default_model("openai") or "gpt-4o")
-    if not api_key:
-        return {
-            "success": False,
-            "error": "OPENAI_API_KEY not configured",
-            "provider": "openai",
-        }
+    api_key, model, error = _resolve_openai(model)
+    if error:
+        return _error_result("openai", error)
 
     try:
-        # Azure OpenAI support via env vars
-        azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-        azure_api_key = os.getenv("AZURE_OPENAI_API_KEY")
-        azure_deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT", model)
-
-        if azure_endpoint and azure_api_key:
-            # Use Azure OpenAI Completions API compatibility
-            client = OpenAI(
-                api_key=azure_api_key,
-                base_url=f"{azure_endpoint.rstrip('/')}/openai/deployments/{azure_deployment}",
-            )
-            # For azure, set model to 'gpt-4o' like; deployment name resolves routing
-            resolved_model = azure_deployment
-        else:
-            client = OpenAI(api_key=api_key)
-            resolved_model = model
-        
-        # o1 models don't support system messages or temperature
-        if resolved_model.startswith("o1"):
-            response = client.chat.completions.create(
-                model=resolved_model,
-                messages=[
-                    {"role": "user", "content": f"You are an expert SEO content writer specializing in topical authority, E-E-A-T, and holistic content strategies.\n\n{prompt}"},
-                ],
-                max_completion_tokens=4000,
-            )
-        else:
-            response = client.chat.completions.create(
-                model=resolved_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert SEO content writer specializing in topical authority, E-E-A-T, and holistic content strategies.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.7,
-                max_tokens=4000,
-            )
+        client, resolved_model = _openai_client(api_key, model)
+        request = _openai_request(prompt, resolved_model, output_format)
+        response = _with_retry(lambda: client.chat.completions.create(**request), max_retries, retry_budget_s)
+        return _openai_result(response, resolved_model, output_format)
 
-        content = response.choices[0].message.content
-        return {
-            "success": True,
-            "content": content,
-            "provider": "openai",
-            "model": resolved_model,
-            "tokens_used": response.usage.total_tokens if response.usage else None,
-        }
+    except Exception as e:
+        return _exception_result("openai", e)
+
+
+async def generate_content_openai_async(prompt: str, model: str = None, output_format: str = "markdown",
+                                        max_retries: int = MAX_RETRIES,
+                                        retry_budget_s: float = RETRY_BUDGET_S) -> Dict[str, Any]:
+    """Async generate_content_openai"""
+    api_key, model, error = _resolve_openai(model)
+    if error:
+        return _error_result("openai", error)
+
+    try:
+        client, resolved_model = _openai_client(api_key, model, asynchronous=True)
+        request = _openai_request(prompt, resolved_model, output_format)
+        response = await _awith_retry(lambda: client.chat.completions.create(**request), max_retries, retry_budget_s)
+        return _openai_result(response, resolved_model, output_format)
 
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "provider": "openai",
-        }
+        return _exception_result("openai", e)
+
+
+def generate_content_openai_stream(prompt: str, model: str = None,
+                                   stats: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """
+    Stream content from OpenAI as text deltas.
+    
+    Raises RuntimeError if the provider is not configured. If a stats dict is
+    given, "model" and "tokens_used" are filled in once the stream completes.
+    """
+    api_key, model, error = _resolve_openai(model)
+    if error:
+        raise RuntimeError(error)
+
+    client, resolved_model = _openai_client(api_key, model)
+    stream = client.chat.completions.create(
+        **_openai_request(prompt, resolved_model),
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+        if chunk.usage and stats is not None:
+            stats["tokens_used"] = chunk.usage.total_tokens
+    if stats is not None:
+        stats["model"] = resolved_model
+
+
+async def generate_content_openai_astream(prompt: str, model: str = None,
+                                          stats: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+    """Async generate_content_openai_stream (reads the SDK's async stream, no worker thread)"""
+    api_key, model, error = _resolve_openai(model)
+    if error:
+        raise RuntimeError(error)
+
+    client, resolved_model = _openai_client(api_key, model, asynchronous=True)
+    stream = await client.chat.completions.create(
+        **_openai_request(prompt, resolved_model),
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    try:
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if chunk.usage and stats is not None:
+                stats["tokens_used"] = chunk.usage.total_tokens
+    finally:
+        await stream.close()
+    if stats is not None:
+        stats["model"] = resolved_model
 
 
-def generate_content_claude(prompt: str, model: str = None) -> Dict[str, Any]:
+def generate_content_claude(prompt: str, model: str = None, output_format: str = "markdown",
+                            max_retries: int = MAX_RETRIES, retry_budget_s: float = RETRY_BUDGET_S) -> Dict[str, Any]:
     """
     Generate content using Anthropic Claude.
     
@@ -199,43 +955,80 @@ def generate_content_claude(prompt: str, model: str = None) -> Dict[str, Any]:
     - claude-3-5-haiku-20241022 (fast, cost-effective)
     - claude-3-opus-20240229 (legacy, powerful)
     """
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    model = model or os.getenv("ANTHROPIC_MODEL", get_default_model("anthropic") or "claude-3-7-sonnet-20250219")
-    if not api_key:
-        return {
-            "success": False,
-            "error": "ANTHROPIC_API_KEY not configured",
-            "provider": "anthropic",
-        }
+    api_key, model, error = _resolve_claude(model)
+    if error:
+        return _error_result("anthropic", error)
 
     try:
-        client = anthropic.Anthropic(api_key=api_key)
-        message = client.messages.create(
-            model=model,
-            max_tokens=4000,
-            temperature=0.7,
-            system="You are an expert SEO content writer specializing in topical authority, E-E-A-T, and holistic content strategies.",
-            messages=[{"role": "user", "content": prompt}],
-        )
+        client = _get_anthropic_client(api_key)
+        request = _claude_request(prompt, model, output_format)
+        message = _with_retry(lambda: client.messages.create(**request), max_retries, retry_budget_s)
+        return _claude_result(message, model, output_format)
 
-        content = message.content[0].text if message.content else ""
-        return {
-            "success": True,
-            "content": content,
-            "provider": "anthropic",
-            "model": model,
-            "tokens_used": message.usage.input_tokens + message.usage.output_tokens if message.usage else None,
-        }
+    except Exception as e:
+        return _exception_result("anthropic", e)
+
+
+async def generate_content_claude_async(prompt: str, model: str = None, output_format: str = "markdown",
+                                        max_retries: int = MAX_RETRIES,
+                                        retry_budget_s: float = RETRY_BUDGET_S) -> Dict[str, Any]:
+    """Async generate_content_claude"""
+    api_key, model, error = _resolve_claude(model)
+    if error:
+        return _error_result("anthropic", error)
+
+    try:
+        anthropic = _load_anthropic()
+        client = anthropic.AsyncAnthropic(
+            api_key=api_key, max_retries=0, http_client=_pooled_async_http_client(anthropic)
+        )
+        request = _claude_request(prompt, model, output_format)
+        message = await _awith_retry(lambda: client.messages.create(**request), max_retries, retry_budget_s)
+        return _claude_result(message, model, output_format)
 
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "provider": "anthropic",
-        }
+        return _exception_result("anthropic", e)
+
+
+def generate_content_claude_stream(prompt: str, model: str = None,
+                                   stats: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """Stream content from Anthropic Claude as text deltas (see generate_content_openai_stream)"""
+    api_key, model, error = _resolve_claude(model)
+    if error:
+        raise RuntimeError(error)
+
+    client = _get_anthropic_client(api_key)
+    with client.messages.stream(**_claude_request(prompt, model)) as stream:
+        for text in stream.text_stream:
+            yield text
+        if stats is not None:
+            usage = stream.get_final_message().usage
+            stats["model"] = model
+            stats["tokens_used"] = usage.input_tokens + usage.output_tokens if usage else None
+
+
+async def generate_content_claude_astream(prompt: str, model: str = None,
+                                          stats: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+    """Async generate_content_claude_stream (reads the SDK's async stream, no worker thread)"""
+    api_key, model, error = _resolve_claude(model)
+    if error:
+        raise RuntimeError(error)
+
+    anthropic = _load_anthropic()
+    client = anthropic.AsyncAnthropic(
+        api_key=api_key, max_retries=0, http_client=_pooled_async_http_client(anthropic)
+    )
+    async with client.messages.stream(**_claude_request(prompt, model)) as stream:
+        async for text in stream.text_stream:
+            yield text
+        if stats is not None:
+            usage = (await stream.get_final_message()).usage
+            stats["model"] = model
+            stats["tokens_used"] = usage.input_tokens + usage.output_tokens if usage else None
 
 
-def generate_content_gemini(prompt: str, model: str = None) -> Dict[str, Any]:
+def generate_content_gemini(prompt: str, model: str = None, output_format: str = "markdown",
+                            max_retries: int = MAX_RETRIES, retry_budget_s: float = RETRY_BUDGET_S) -> Dict[str, Any]:
     """
     Generate content using Google Gemini.
     
@@ -244,61 +1037,96 @@ def generate_content_gemini(prompt: str, model: str = None) -> Dict[str, Any]:
     - gemini-1.5-pro (powerful, large context)
     - gemini-1.5-flash (fast, cost-effective)
     """
-    if not GEMINI_AVAILABLE:
-        return {
-            "success": False,
-            "error": "Google Generative AI library not installed. Install: pip install google-generativeai",
-            "provider": "gemini",
-        }
-    
-    api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-    model = model or os.getenv("GEMINI_MODEL", get_default_model("gemini") or "gemini-2.0-flash-exp")
-    if not api_key:
-        return {
-            "success": False,
-            "error": "GOOGLE_API_KEY or GEMINI_API_KEY not configured",
-            "provider": "gemini",
-        }
+    api_key, model, error = _resolve_gemini(model)
+    if error:
+        return _error_result("gemini", error)
 
     try:
-        genai.configure(api_key=api_key)
-        model_instance = genai.GenerativeModel(
-            model_name=model,
-            system_instruction="You are an expert SEO content writer specializing in topical authority, E-E-A-T, and holistic content strategies.",
-        )
-        
-        response = model_instance.generate_content(
-            prompt,
-            generation_config={
-                "temperature": 0.7,
-                "max_output_tokens": 4000,
-            }
+        model_instance = _gemini_model(api_key, model, SYSTEM_PROMPTS[output_format])
+        response = _with_retry(
+            lambda: model_instance.generate_content(
+                prompt,
+                generation_config=GEMINI_GENERATION_CONFIGS[output_format],
+            ),
+            max_retries,
+            retry_budget_s,
         )
+        return _gemini_result(response, model, output_format)
 
-        content = response.text if response.text else ""
-        
-        # Calculate tokens (approximate)
-        tokens_used = None
-        if hasattr(response, 'usage_metadata'):
-            tokens_used = response.usage_metadata.total_token_count
-        
-        return {
-            "success": True,
-            "content": content,
-            "provider": "gemini",
-            "model": model,
-            "tokens_used": tokens_used,
-        }
+    except Exception as e:
+        return _exception_result("gemini", e)
+
+
+async def generate_content_gemini_async(prompt: str, model: str = None, output_format: str = "markdown",
+                                        max_retries: int = MAX_RETRIES,
+                                        retry_budget_s: float = RETRY_BUDGET_S) -> Dict[str, Any]:
+    """Async generate_content_gemini"""
+    api_key, model, error = _resolve_gemini(model)
+    if error:
+        return _error_result("gemini", error)
+
+    try:
+        model_instance = _gemini_model(api_key, model, SYSTEM_PROMPTS[output_format])
+        response = await _awith_retry(
+            lambda: model_instance.generate_content_async(
+                prompt,
+                generation_config=GEMINI_GENERATION_CONFIGS[output_format],
+            ),
+            max_retries,
+            retry_budget_s,
+        )
+        return _gemini_result(response, model, output_format)
 
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "provider": "gemini",
-        }
+        return _exception_result("gemini", e)
+
+
+def generate_content_gemini_stream(prompt: str, model: str = None,
+                                   stats: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """Stream content from Google Gemini as text chunks (see generate_content_openai_stream)"""
+    api_key, model, error = _resolve_gemini(model)
+    if error:
+        raise RuntimeError(error)
+
+    model_instance = _gemini_model(api_key, model)
+    response = model_instance.generate_content(
+        prompt,
+        generation_config=GEMINI_GENERATION_CONFIG,
+        stream=True,
+    )
+    for chunk in response:
+        if chunk.text:
+            yield chunk.text
+    if stats is not None:
+        stats["model"] = model
+        usage = getattr(response, "usage_metadata", None)
+        stats["tokens_used"] = usage.total_token_count if usage else None
+
 
+async def generate_content_gemini_astream(prompt: str, model: str = None,
+                                          stats: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+    """Async generate_content_gemini_stream (reads the SDK's async stream, no worker thread)"""
+    api_key, model, error = _resolve_gemini(model)
+    if error:
+        raise RuntimeError(error)
 
-def generate_content_mistral(prompt: str, model: str = None) -> Dict[str, Any]:
+    model_instance = _gemini_model(api_key, model)
+    response = await model_instance.generate_content_async(
+        prompt,
+        generation_config=GEMINI_GENERATION_CONFIG,
+        stream=True,
+    )
+    async for chunk in response:
+        if chunk.text:
+            yield chunk.text
+    if stats is not None:
+        stats["model"] = model
+        usage = getattr(response, "usage_metadata", None)
+        stats["tokens_used"] = usage.total_token_count if usage else None
+
+
+def generate_content_mistral(prompt: str, model: str = None, output_format: str = "markdown",
+                             max_retries: int = MAX_RETRIES, retry_budget_s: float = RETRY_BUDGET_S) -> Dict[str, Any]:
     """
     Generate content using Mistral AI.
     
@@ -307,61 +1135,340 @@ def generate_content_mistral(prompt: str, model: str = None) -> Dict[str, Any]:
     - mistral-small-latest (fast, cost-effective)
     - open-mixtral-8x22b (open)
     """
-    if not MISTRAL_AVAILABLE:
-        return {
-            "success": False,
-            "error": "mistralai library not installed. Install: pip install mistralai",
-            "provider": "mistral",
-        }
-
-    api_key = os.getenv("MISTRAL_API_KEY")
-    model = model or os.getenv("MISTRAL_MODEL", get_default_model("mistral") or "mistral-large-latest")
-    if not api_key:
-        return {
-            "success": False,
-            "error": "MISTRAL_API_KEY not configured",
-            "provider": "mistral",
-        }
+    api_key, model, error = _resolve_mistral(model)
+    if error:
+        return _error_result("mistral", error)
 
     try:
-        if MISTRAL_SDK_MODE == "new":
-            client = MistralClient(api_key=api_key)
-            response = client.chat(
-                model=model,
-                messages=[
-                    ChatMessage(role="system", content="You are an expert SEO content writer specializing in topical authority, E-E-A-T, and holistic content strategies."),
-                    ChatMessage(role="user", content=prompt),
-                ],
-                temperature=0.7,
-                max_tokens=4000,
-            )
-            content = response.choices[0].message.content if getattr(response, "choices", None) else ""
+        client = _get_mistral_client(api_key)
+        kwargs = _mistral_request(prompt, model, output_format)
+        if _load_mistral()[2] == "new":
+            response = _with_retry(lambda: client.chat(**kwargs), max_retries, retry_budget_s)
         else:
             # old SDK fallback
-            client = MistralClient(api_key=api_key)
-            response = client.chat.complete(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are an expert SEO content writer specializing in topical authority, E-E-A-T, and holistic content strategies."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.7,
-                max_tokens=4000,
-            )
-            content = response.choices[0].message.content if response and getattr(response, "choices", None) else ""
-        return {
-            "success": True,
-            "content": content,
-            "provider": "mistral",
-            "model": model,
-            "tokens_used": None,
-        }
+            response = _with_retry(lambda: client.chat.complete(**kwargs), max_retries, retry_budget_s)
+        return _mistral_result(response, model, output_format)
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "provider": "mistral",
-        }
+        return _exception_result("mistral", e)
+
+
+async def generate_content_mistral_async(prompt: str, model: str = None, output_format: str = "markdown",
+                                         max_retries: int = MAX_RETRIES,
+                                         retry_budget_s: float = RETRY_BUDGET_S) -> Dict[str, Any]:
+    """
+    Async generate_content_mistral. The new SDK has a native async client; on
+    the old SDK the call and its (pydantic) response decoding run on
+    _MISTRAL_POOL so they don't block the event loop.
+    """
+    if _load_mistral()[2] == "old":
+        return await asyncio.get_running_loop().run_in_executor(
+            _MISTRAL_POOL,
+            functools.partial(generate_content_mistral, prompt, model, output_format, max_retries, retry_budget_s),
+        )
+
+    api_key, model, error = _resolve_mistral(model)
+    if error:
+        return _error_result("mistral", error)
+
+    try:
+        from mistralai.async_client import MistralAsyncClient  # type: ignore
+        client = MistralAsyncClient(api_key=api_key, max_retries=0)
+        kwargs = _mistral_request(prompt, model, output_format)
+        response = await _awith_retry(lambda: client.chat(**kwargs), max_retries, retry_budget_s)
+        return _mistral_result(response, model, output_format)
+    except Exception as e:
+        return _exception_result("mistral", e)
+
+
+def generate_content_mistral_stream(prompt: str, model: str = None,
+                                    stats: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """Stream content from Mistral AI as text deltas (see generate_content_openai_stream)"""
+    api_key, model, error = _resolve_mistral(model)
+    if error:
+        raise RuntimeError(error)
+
+    client = _get_mistral_client(api_key)
+    kwargs = {
+        "model": model,
+        "messages": _mistral_messages(prompt),
+        "temperature": TEMPERATURE,
+        "max_tokens": MAX_OUTPUT_TOKENS,
+    }
+    if _load_mistral()[2] == "new":
+        stream = client.chat_stream(**kwargs)
+    else:
+        # old SDK wraps each chunk in an event with .data
+        stream = (event.data for event in client.chat.stream(**kwargs))
+    for chunk in stream:
+        if getattr(chunk, "choices", None) and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+    if stats is not None:
+        stats["model"] = model
+        stats["tokens_used"] = None
+
+
+GENERATORS = {
+    "openai": generate_content_openai,
+    "anthropic": generate_content_claude,
+    "gemini": generate_content_gemini,
+    "mistral": generate_content_mistral,
+}
+
+ASYNC_GENERATORS = {
+    "openai": generate_content_openai_async,
+    "anthropic": generate_content_claude_async,
+    "gemini": generate_content_gemini_async,
+    "mistral": generate_content_mistral_async,
+}
+
+STREAM_GENERATORS = {
+    "openai": generate_content_openai_stream,
+    "anthropic": generate_content_claude_stream,
+    "gemini": generate_content_gemini_stream,
+    "mistral": generate_content_mistral_stream,
+}
+
+# Providers whose SDK streams natively in async code; the rest are read from
+# STREAM_GENERATORS on _STREAM_POOL threads
+ASYNC_STREAM_GENERATORS = {
+    "openai": generate_content_openai_astream,
+    "anthropic": generate_content_claude_astream,
+    "gemini": generate_content_gemini_astream,
+}
+
+WARM_UP_TIMEOUT_S = 5.0
+
+
+async def _warm_openai(api_key: str, model: str) -> None:
+    _openai_client(api_key, model)  # sync pool used by streaming
+    client, _ = _openai_client(api_key, model, asynchronous=True)
+    await client.models.list()
+
+
+async def _warm_anthropic(api_key: str, model: str) -> None:
+    anthropic = _load_anthropic()
+    _get_anthropic_client(api_key)
+    client = anthropic.AsyncAnthropic(
+        api_key=api_key, max_retries=0, http_client=_pooled_async_http_client(anthropic)
+    )
+    await client.models.list(limit=1)
+
+
+async def _warm_gemini(api_key: str, model: str) -> None:
+    _gemini_model(api_key, model)  # genai.configure + model instance
+    await asyncio.to_thread(_load_gemini().get_model, f"models/{model}")
+
+
+async def _warm_mistral(api_key: str, model: str) -> None:
+    client = _get_mistral_client(api_key)
+    list_models = client.list_models if _load_mistral()[2] == "new" else client.models.list
+    await asyncio.get_running_loop().run_in_executor(_MISTRAL_POOL, list_models)
+
+
+_WARM_UP = {
+    "openai": (_resolve_openai, _warm_openai),
+    "anthropic": (_resolve_claude, _warm_anthropic),
+    "gemini": (_resolve_gemini, _warm_gemini),
+    "mistral": (_resolve_mistral, _warm_mistral),
+}
+
+
+async def warm_up(providers: Iterable[str] = ("openai", "anthropic", "gemini", "mistral")) -> Dict[str, bool]:
+    """
+    Prime config, SDK imports, tiktoken and the pooled connections of every
+    configured provider (call once at service startup). Each provider gets a
+    model-listing request, which opens the TLS connection without spending
+    tokens. Errors are ignored; returns {provider: warmed}.
+    """
+    _config()  # also warms get_default_model
+    await asyncio.to_thread(_encoding, _provider_model("openai", None))  # BPE download on first use
+
+    async def _warm(provider: str) -> bool:
+        resolve, warm = _WARM_UP[provider]
+        api_key, model, error = resolve(None)
+        if error:
+            return False
+        try:
+            await asyncio.wait_for(warm(api_key, model), WARM_UP_TIMEOUT_S)
+            return True
+        except Exception:
+            return False
+
+    providers = [p for p in providers if p in _WARM_UP]
+    results = await asyncio.gather(*(_warm(p) for p in providers))
+    return dict(zip(providers, results))
+
+# A sentence ends at . ! or ? followed by whitespace; Markdown paragraphs at a blank line
+_SENTENCE_END_RE = re.compile(r"[.!?]\s+|\n{2,}")
+_STREAM_QUEUE_SIZE = 8
+_STREAM_PUT_POLL_S = 0.1
+
+# Worker threads reading blocking provider streams, one per open stream. Kept
+# apart from the loop's default executor so long generations can't starve
+# asyncio.to_thread / run_in_executor(None, ...) callers; sized like _MISTRAL_POOL
+STREAM_POOL_WORKERS = 32
+_STREAM_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=STREAM_POOL_WORKERS, thread_name_prefix="stream")
+_STREAM_END = object()
+
+
+def _split_segments(buffer: str):
+    """Return (complete sentences/paragraphs, unfinished rest) of a text buffer"""
+    segments = []
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(buffer):
+        if match.end() == len(buffer):
+            break  # more whitespace may follow in the next chunk
+        segments.append(buffer[start:match.end()])
+        start = match.end()
+    return segments, buffer[start:]
+
+
+def iter_sentences(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Re-chunk a text stream (e.g. a STREAM_GENERATORS iterator) into complete
+    sentences and paragraphs as they arrive. Joining the output gives back the
+    original text.
+    """
+    buffer = ""
+    for chunk in chunks:
+        segments, buffer = _split_segments(buffer + chunk)
+        yield from segments
+    if buffer:
+        yield buffer
+
+
+async def _aiter_stream(provider_stream: Union[Iterable[str], AsyncIterator[str]]) -> AsyncIterator[str]:
+    """
+    Async view of a provider text stream. Async iterators pass through; a
+    (blocking) sync iterator such as a STREAM_GENERATORS stream is read on a
+    _STREAM_POOL thread and handed over through a bounded queue, so a slow consumer
+    pauses the provider read.
+    """
+    if hasattr(provider_stream, "__aiter__"):
+        async for chunk in provider_stream:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_STREAM_QUEUE_SIZE)
+    stop = threading.Event()
+
+    def _put_threadsafe(item) -> None:
+        """Blocking put from the worker; gives up once the consumer has stopped"""
+        if stop.is_set():
+            return
+        try:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        except RuntimeError:
+            return  # loop already closed
+        while True:
+            try:
+                future.result(timeout=_STREAM_PUT_POLL_S)
+                return
+            except concurrent.futures.TimeoutError:
+                if stop.is_set() or loop.is_closed():
+                    future.cancel()
+                    return
+            except concurrent.futures.CancelledError:
+                return
+
+    def _pump() -> None:
+        try:
+            for chunk in provider_stream:
+                if stop.is_set():
+                    break
+                _put_threadsafe(chunk)
+        except Exception as e:
+            _put_threadsafe(e)
+        finally:
+            # Release the provider's HTTP stream now rather than at GC
+            close = getattr(provider_stream, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+            _put_threadsafe(_STREAM_END)
+
+    producer = loop.run_in_executor(_STREAM_POOL, _pump)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        if not producer.done():
+            # The worker stops at its next chunk; free queue slots once so a
+            # put() in flight can finish (never await the worker here: it may
+            # be blocked in a stalled upstream read)
+            stop.set()
+            while not queue.empty():
+                queue.get_nowait()
+
+
+async def stream_sentences(provider_stream: Union[Iterable[str], AsyncIterator[str]]) -> AsyncIterator[str]:
+    """
+    Async iter_sentences: yields each sentence/paragraph while the provider is
+    still generating, so TTS, rendering or indexing can overlap with generation.
+    Accepts an async iterator or a sync STREAM_GENERATORS stream.
+    """
+    buffer = ""
+    async with contextlib.aclosing(_aiter_stream(provider_stream)) as chunks:
+        async for chunk in chunks:
+            segments, buffer = _split_segments(buffer + chunk)
+            for segment in segments:
+                yield segment
+    if buffer:
+        yield buffer
+
+
+async def coalesce_stream(provider_stream: Union[Iterable[str], AsyncIterator[str]],
+                          max_bytes: int = 8192, max_interval_ms: int = 25) -> AsyncIterator[str]:
+    """
+    Merge small provider deltas into fewer, larger chunks for SSE/WebSocket
+    consumers. Buffered text is yielded once it reaches max_bytes (UTF-8) or
+    has waited max_interval_ms, whichever comes first.
+    Accepts an async iterator or a sync STREAM_GENERATORS stream.
+    """
+    loop = asyncio.get_running_loop()
+    interval = max_interval_ms / 1000
+    buffer = bytearray()
+    deadline = 0.0
+    pending = None
+    async with contextlib.aclosing(_aiter_stream(provider_stream)) as chunks:
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(chunks.__anext__())
+                timeout = max(0.0, deadline - loop.time()) if buffer else None
+                done, _ = await asyncio.wait((pending,), timeout=timeout)
+                if not done:
+                    # Interval elapsed: flush, keep waiting on the same read
+                    yield buffer.decode()
+                    buffer.clear()
+                    continue
+                read, pending = pending, None
+                try:
+                    chunk = read.result()
+                except StopAsyncIteration:
+                    break
+                if not buffer:
+                    deadline = loop.time() + interval
+                buffer.extend(chunk.encode())
+                if len(buffer) >= max_bytes:
+                    yield buffer.decode()
+                    buffer.clear()
+        finally:
+            if pending is not None:
+                pending.cancel()
+                with contextlib.suppress(BaseException):
+                    await pending
+    if buffer:
+        yield buffer.decode()
+
 
 def generate_seo_content(
     topic: str,
@@ -377,7 +1484,11 @@ def generate_seo_content(
     local_context: Optional[str] = None,
     provider: str = "openai",
     model: Optional[str] = None,
-) -> Dict[str, Any]:
+    stream: bool = False,
+    output_format: str = "markdown",
+    max_retries: int = MAX_RETRIES,
+    retry_budget_s: float = RETRY_BUDGET_S,
+) -> Union[Dict[str, Any], Iterator[str]]:
     """
     Main function to generate SEO-optimized content.
     
@@ -395,6 +1506,11 @@ def generate_seo_content(
         local_context: Local landmarks/context for regional SEO
         provider: "openai" / "anthropic" / "gemini" (default: openai)
         model: Specific model name (optional, uses provider default if not specified)
+        stream: Return an iterator of Markdown text chunks instead of a result dict
+        output_format: "markdown" (default) or "json" - structured output matching
+            CONTENT_JSON_SCHEMA, parsed into result["data"] (not available with stream)
+        max_retries: Extra attempts after a rate limit / timeout / 5xx error
+        retry_budget_s: Stop retrying once this many seconds have passed
     
     Supported Providers & Models (2025):
         OpenAI:
@@ -414,16 +1530,28 @@ def generate_seo_content(
             - gemini-1.5-flash
     
     Returns:
-        Dictionary with generated content or error
+        Dictionary with generated content or error (provider errors include
+        "error_type" and "retry_after"). With stream=True, an
+        iterator of text chunks (provider errors raise while iterating;
+        missing topic/keyword still returns the error dict).
     """
-    if not topic or not main_keyword:
+    error = _invalid_content_args(topic, main_keyword, output_format)
+    if error:
+        return error
+    if stream and output_format != "markdown":
         return {
             "success": False,
-            "error": "Topic and main_keyword are required",
+            "error": "Streaming only supports output_format='markdown'",
         }
 
-    # Build the prompt
-    prompt = build_content_prompt(
+    # Generate content with selected provider
+    provider_lower = provider.lower()
+
+    # Build the prompt (trimmed to the model's context window)
+    prompt, error = _fit_content_prompt(
+        provider_lower,
+        model,
+        output_format,
         topic=topic,
         page_type=page_type,
         main_keyword=main_keyword,
@@ -436,28 +1564,443 @@ def generate_seo_content(
         competitor_urls=competitor_urls,
         local_context=local_context,
     )
-
-    # Generate content with selected provider
-    provider_lower = provider.lower()
+    if error:
+        return error
     
-    if provider_lower == "anthropic":
-        result = generate_content_claude(prompt, model=model) if model else generate_content_claude(prompt)
-    elif provider_lower == "gemini":
-        result = generate_content_gemini(prompt, model=model) if model else generate_content_gemini(prompt)
-    elif provider_lower == "mistral":
-        result = generate_content_mistral(prompt, model=model) if model else generate_content_mistral(prompt)
-    else:  # default to openai
-        result = generate_content_openai(prompt, model=model) if model else generate_content_openai(prompt)
+    if stream:
+        stream_fn = STREAM_GENERATORS.get(provider_lower, generate_content_openai_stream)
+        return stream_fn(prompt, model=model)
+    
+    cache_key = _response_cache_key(provider_lower, model, prompt, output_format)
+    cached = _response_cache_get(cache_key)
+    if cached is not None:
+        cached["cached"] = True
+        return cached
+    
+    generate = GENERATORS.get(provider_lower, generate_content_openai)  # default to openai
+    result = generate(prompt, model, output_format, max_retries, retry_budget_s)
 
     # Add metadata
     if result.get("success"):
-        result["metadata"] = {
-            "topic": topic,
-            "page_type": page_type,
-            "main_keyword": main_keyword,
-            "secondary_keywords": secondary_keywords,
-            "language": language,
-            "target_word_count": word_count,
-        }
+        result["metadata"] = _content_metadata(
+            topic=topic,
+            page_type=page_type,
+            main_keyword=main_keyword,
+            secondary_keywords=secondary_keywords,
+            language=language,
+            word_count=word_count,
+        )
+        _response_cache_put(cache_key, result)
 
     return result
+
+
+async def generate_seo_content_async(
+    topic: str,
+    page_type: str = "BLOG",
+    main_keyword: str = "",
+    secondary_keywords: Optional[List[str]] = None,
+    target_location: Optional[str] = None,
+    target_audience: Optional[str] = None,
+    language: str = "Turkish",
+    tone: str = "professional but friendly",
+    word_count: int = 1200,
+    competitor_urls: Optional[List[str]] = None,
+    local_context: Optional[str] = None,
+    provider: str = "openai",
+    model: Optional[str] = None,
+    output_format: str = "markdown",
+    max_retries: int = MAX_RETRIES,
+    retry_budget_s: float = RETRY_BUDGET_S,
+    stream: bool = False,
+) -> Union[Dict[str, Any], AsyncIterator[str], Iterator[str]]:
+    """
+    Async generate_seo_content (same arguments).
+    Awaits the provider's async SDK client, so an event loop can serve many
+    generations concurrently instead of pinning a worker thread per request.
+    With stream, returns the provider's async text stream, or its sync
+    STREAM_GENERATORS iterator when the SDK has no async streaming (read it
+    through coalesce_stream / stream_sentences).
+    """
+    error = _invalid_content_args(topic, main_keyword, output_format)
+    if error:
+        return error
+
+    provider_lower = provider.lower()
+    prompt, error = _fit_content_prompt(
+        provider_lower,
+        model,
+        output_format,
+        topic=topic,
+        page_type=page_type,
+        main_keyword=main_keyword,
+        secondary_keywords=secondary_keywords or [],
+        target_location=target_location,
+        target_audience=target_audience,
+        language=language,
+        tone=tone,
+        word_count=word_count,
+        competitor_urls=competitor_urls,
+        local_context=local_context,
+    )
+    if error:
+        return error
+
+    if stream:
+        if provider_lower in STREAM_GENERATORS and provider_lower not in ASYNC_STREAM_GENERATORS:
+            return STREAM_GENERATORS[provider_lower](prompt, model=model)
+        stream_fn = ASYNC_STREAM_GENERATORS.get(provider_lower, generate_content_openai_astream)
+        return stream_fn(prompt, model=model)
+
+    cache_key = _response_cache_key(provider_lower, model, prompt, output_format)
+    cached = _response_cache_get(cache_key)
+    if cached is not None:
+        cached["cached"] = True
+        return cached
+
+    generate = ASYNC_GENERATORS.get(provider_lower, generate_content_openai_async)
+    result = await generate(prompt, model, output_format, max_retries, retry_budget_s)
+
+    if result.get("success"):
+        result["metadata"] = _content_metadata(
+            topic=topic,
+            page_type=page_type,
+            main_keyword=main_keyword,
+            secondary_keywords=secondary_keywords,
+            language=language,
+            word_count=word_count,
+        )
+        _response_cache_put(cache_key, result)
+
+    return result
+
+
+def _invalid_content_args(topic: str, main_keyword: str, output_format: str) -> Optional[Dict[str, Any]]:
+    """Error dict for missing/unsupported generate_seo_content arguments, else None"""
+    if not topic or not main_keyword:
+        return {
+            "success": False,
+            "error": "Topic and main_keyword are required",
+        }
+    if output_format not in SYSTEM_PROMPTS:
+        return {
+            "success": False,
+            "error": f"Unsupported output_format: {output_format}. Use: {', '.join(SYSTEM_PROMPTS)}",
+        }
+    return None
+
+
+def _content_metadata(
+    topic: str,
+    page_type: str = "BLOG",
+    main_keyword: str = "",
+    secondary_keywords: Optional[List[str]] = None,
+    language: str = "Turkish",
+    word_count: int = 1200,
+    **_: Any,
+) -> Dict[str, Any]:
+    return {
+        "topic": topic,
+        "page_type": page_type,
+        "main_keyword": main_keyword,
+        "secondary_keywords": secondary_keywords,
+        "language": language,
+        "target_word_count": word_count,
+    }
+
+
+async def generate_seo_content_multi_async(
+    providers: List[str],
+    first_success: bool = False,
+    models: Optional[Dict[str, str]] = None,
+    output_format: str = "markdown",
+    **content_kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Generate the same SEO content with several providers concurrently.
+    
+    Args:
+        providers: Provider names ("openai" / "anthropic" / "gemini" / "mistral")
+        first_success: Return the first successful result and cancel the rest
+        models: Optional provider -> model name overrides
+        output_format: "markdown" or "json" (see generate_seo_content)
+        **content_kwargs: build_content_prompt arguments (topic, main_keyword, ...)
+    
+    Returns:
+        {"success": bool, "results": {provider: result}} or, with
+        first_success, the winning provider's result (error summary if all fail)
+    """
+    error = _invalid_content_args(content_kwargs.get("topic"), content_kwargs.get("main_keyword"), output_format)
+    if error:
+        return error
+
+    models = models or {}
+    providers = [p.lower() for p in providers if p.lower() in ASYNC_GENERATORS]
+    if not providers:
+        return {
+            "success": False,
+            "error": f"No supported provider given. Use: {', '.join(ASYNC_GENERATORS)}",
+        }
+
+    content_kwargs.setdefault("page_type", "BLOG")
+    content_kwargs["secondary_keywords"] = content_kwargs.get("secondary_keywords") or []
+    # One prompt for all providers, so fit it to the smallest context window
+    smallest = min(providers, key=lambda p: CONTEXT_WINDOWS[p])
+    prompt, error = _fit_content_prompt(smallest, models.get(smallest), output_format, **content_kwargs)
+    if error:
+        return error
+
+    tasks = {
+        provider: asyncio.ensure_future(ASYNC_GENERATORS[provider](prompt, models.get(provider), output_format))
+        for provider in providers
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+
+    if first_success:
+        pending = set(tasks.values())
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    results[result.get("provider")] = result
+                    if result.get("success"):
+                        return result
+        finally:
+            for task in pending:
+                task.cancel()
+        return {
+            "success": False,
+            "error": "All providers failed",
+            "results": results,
+        }
+
+    gathered = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    for provider, result in zip(tasks, gathered):
+        if isinstance(result, BaseException):
+            result = _error_result(provider, str(result))
+        results[provider] = result
+    return {
+        "success": any(r.get("success") for r in results.values()),
+        "results": results,
+    }
+
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Long-lived event loop thread for the sync wrappers. Running every sync call
+    on one loop keeps its pooled async clients (and their HTTP/2 connections)
+    alive between calls, instead of a new loop and pool per asyncio.run.
+    """
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="content-generator-loop", daemon=True).start()
+            _LOOP = loop
+    return _LOOP
+
+
+def _run_sync(coro):
+    """Run a coroutine on the background loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+def generate_seo_content_multi(
+    providers: List[str],
+    first_success: bool = False,
+    models: Optional[Dict[str, str]] = None,
+    output_format: str = "markdown",
+    **content_kwargs: Any,
+) -> Dict[str, Any]:
+    """Sync wrapper around generate_seo_content_multi_async"""
+    return _run_sync(
+        generate_seo_content_multi_async(
+            providers, first_success=first_success, models=models, output_format=output_format, **content_kwargs
+        )
+    )
+
+
+class _AsyncRateLimiter:
+    """Token bucket: at most `rate` acquisitions per `period` seconds"""
+
+    def __init__(self, rate: float, period: float = 60.0):
+        self._rate = float(rate)
+        self._per_second = self._rate / period
+        self._tokens = self._rate
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._rate, self._tokens + (now - self._updated) * self._per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._per_second)
+
+
+BATCH_POLL_INITIAL_DELAY = 5.0
+BATCH_POLL_MAX_DELAY = 300.0
+_BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def _batch_job(item: Dict[str, Any]):
+    """Split a batch item into (provider, model, prompt, output_format, content_kwargs) or an error dict"""
+    content_kwargs = dict(item)
+    content_kwargs.pop("stream", None)
+    provider = (content_kwargs.pop("provider", None) or "openai").lower()
+    model = content_kwargs.pop("model", None)
+    output_format = content_kwargs.pop("output_format", None) or "markdown"
+    error = _invalid_content_args(content_kwargs.get("topic"), content_kwargs.get("main_keyword"), output_format)
+    if error:
+        return error
+    if provider not in ASYNC_GENERATORS:
+        provider = "openai"  # same fallback as generate_seo_content
+    content_kwargs.setdefault("page_type", "BLOG")
+    prompt, error = _fit_content_prompt(
+        provider, model, output_format,
+        **{**content_kwargs, "secondary_keywords": content_kwargs.get("secondary_keywords") or []}
+    )
+    if error:
+        return error
+    return provider, model, prompt, output_format, content_kwargs
+
+
+async def _openai_batch_api(jobs: Dict[int, tuple]) -> Dict[int, Dict[str, Any]]:
+    """
+    Run {index: (model, prompt, output_format)} through the OpenAI Batch API: upload a JSONL
+    of chat completion requests, poll until the batch finishes, parse the output.
+    """
+    from openai.types.chat import ChatCompletion
+
+    api_key, default_model, error = _resolve_openai(None)
+    if error:
+        return {i: _error_result("openai", error) for i in jobs}
+
+    client, _ = _openai_client(api_key, default_model, asynchronous=True)
+    lines = []
+    output_formats = {}
+    for i, (model, prompt, output_format) in jobs.items():
+        output_formats[i] = output_format
+        body = _openai_request(prompt, model or default_model, output_format)
+        body.update(body.pop("extra_body", {}))
+        lines.append(json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": body,
+        }))
+
+    try:
+        batch_file = await client.files.create(
+            file=("content_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        delay = BATCH_POLL_INITIAL_DELAY
+        while batch.status not in _BATCH_FINAL_STATUSES:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX_DELAY)
+            batch = await client.batches.retrieve(batch.id)
+        if batch.status != "completed" or not batch.output_file_id:
+            return {i: _error_result("openai", f"Batch {batch.id} ended with status {batch.status}") for i in jobs}
+        output = await client.files.content(batch.output_file_id)
+    except Exception as e:
+        return {i: _error_result("openai", str(e)) for i in jobs}
+
+    results: Dict[int, Dict[str, Any]] = {}
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        i = int(record["custom_id"])
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            results[i] = _error_result("openai", str(record.get("error") or response.get("body")))
+            continue
+        completion = ChatCompletion.model_validate(response["body"])
+        results[i] = _openai_result(completion, completion.model, output_formats[i])
+    for i in jobs:
+        results.setdefault(i, _error_result("openai", "No result returned for this request in the batch output"))
+    return results
+
+
+async def generate_seo_content_batch(
+    items: List[Dict[str, Any]],
+    max_concurrency: int = 10,
+    rate_limit_rpm: int = 100,
+    use_openai_batch_api: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Generate SEO content for many jobs concurrently.
+    
+    Args:
+        items: generate_seo_content keyword dicts (topic, main_keyword, provider, model, ...)
+        max_concurrency: Maximum number of provider calls in flight
+        rate_limit_rpm: Maximum provider calls started per minute
+        use_openai_batch_api: Send OpenAI jobs through the Batch API (cheaper,
+            but results can take up to 24h) instead of live requests
+    
+    Returns:
+        One result dict per item, in input order
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+    limiter = _AsyncRateLimiter(rate_limit_rpm, 60)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    jobs = {}
+
+    for i, item in enumerate(items):
+        job = _batch_job(item)
+        if isinstance(job, dict):
+            results[i] = job
+            continue
+        provider, model, prompt, output_format, _ = job
+        cached = _response_cache_get(_response_cache_key(provider, model, prompt, output_format))
+        if cached is not None:
+            cached["cached"] = True
+            results[i] = cached
+            continue
+        jobs[i] = job
+
+    def _finish(i: int, result: Dict[str, Any]) -> None:
+        provider, model, prompt, output_format, content_kwargs = jobs[i]
+        if result.get("success"):
+            result["metadata"] = _content_metadata(**content_kwargs)
+            _response_cache_put(_response_cache_key(provider, model, prompt, output_format), result)
+        results[i] = result
+
+    async def _run(i: int) -> None:
+        provider, model, prompt, output_format, _ = jobs[i]
+        async with sem:
+            await limiter.acquire()
+            try:
+                result = await ASYNC_GENERATORS[provider](prompt, model, output_format)
+            except Exception as e:
+                result = _error_result(provider, str(e))
+        _finish(i, result)
+
+    batch_api_jobs = {}
+    if use_openai_batch_api and not _config().azure_endpoint:
+        batch_api_jobs = {i: job[1:4] for i, job in jobs.items() if job[0] == "openai"}
+
+    async def _run_batch_api() -> None:
+        for i, result in (await _openai_batch_api(batch_api_jobs)).items():
+            _finish(i, result)
+
+    tasks = [_run(i) for i in jobs if i not in batch_api_jobs]
+    if batch_api_jobs:
+        tasks.append(_run_batch_api())
+    await asyncio.gather(*tasks)
+    return results
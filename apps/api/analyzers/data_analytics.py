@@ -1,13 +1,35 @@
 """
 Advanced SEO Data Analytics Module
-Uses pandas, numpy, and scikit-learn for advanced analysis
+Uses numpy and scikit-learn for advanced analysis
 """
 import numpy as np
-import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any
 from collections import Counter
+from itertools import islice
+from operator import itemgetter
 import re
 
+from .text_stats import text_stats
+
+# Word tokens for keyword matching
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _count_keywords(text_lower: str, keywords: Iterable[str]) -> Dict[str, int]:
+    """
+    Whole-word occurrences of each (lowercased) keyword, from one Counter of
+    the text's word n-grams per keyword length: multi-word keyphrases match
+    consecutive words ("seo audit" counts in "SEO-Audit"), and "seo" does not
+    match inside "seoul"
+    """
+    tokens = _TOKEN_RE.findall(text_lower)
+    phrases = {kw: tuple(_TOKEN_RE.findall(kw)) for kw in keywords}
+    ngram_counts = {
+        n: Counter(zip(*(islice(tokens, i, None) for i in range(n))))
+        for n in {len(phrase) for phrase in phrases.values() if phrase}
+    }
+    return {kw: ngram_counts[len(phrase)][phrase] if phrase else 0 for kw, phrase in phrases.items()}
+
 
 def analyze_content_quality(text: str, keywords: List[str] = None) -> Dict[str, Any]:
     """
@@ -23,41 +45,40 @@ def analyze_content_quality(text: str, keywords: List[str] = None) -> Dict[str,
     if not text:
         return {"error": "No text provided"}
     
-    # Basic metrics
-    words = text.split()
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
+    # Basic metrics (one pass over the text)
+    stats = text_stats(text)
+    word_count = stats.words
     
     # Calculate readability scores
-    avg_word_length = np.mean([len(word) for word in words]) if words else 0
-    avg_sentence_length = np.mean([len(s.split()) for s in sentences]) if sentences else 0
+    avg_word_length = stats.total_word_length / word_count if word_count else 0
+    avg_sentence_length = word_count / stats.sentences if stats.sentences else 0
     
     # Flesch Reading Ease approximation
-    syllables = sum([max(1, len(re.findall(r'[aeiouy]+', word.lower()))) for word in words])
-    avg_syllables_per_word = syllables / len(words) if words else 0
+    avg_syllables_per_word = stats.syllables / word_count if word_count else 0
     
     reading_ease = 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables_per_word)
     reading_ease = max(0, min(100, reading_ease))  # Clamp between 0-100
     
     # Content diversity (unique word ratio)
-    unique_words = len(set([w.lower() for w in words]))
-    diversity_score = (unique_words / len(words) * 100) if words else 0
+    unique_words = stats.unique_words
+    diversity_score = (unique_words / word_count * 100) if word_count else 0
     
     # Keyword density analysis
     keyword_analysis = {}
     if keywords:
         text_lower = text.lower()
+        counts = _count_keywords(text_lower, {kw.lower() for kw in keywords})
         for kw in keywords:
-            count = text_lower.count(kw.lower())
-            density = (count / len(words) * 100) if words else 0
+            count = counts[kw.lower()]
+            density = (count / word_count * 100) if word_count else 0
             keyword_analysis[kw] = {
                 "count": count,
                 "density": round(density, 2)
             }
     
     return {
-        "total_words": len(words),
-        "total_sentences": len(sentences),
+        "total_words": word_count,
+        "total_sentences": stats.sentences,
         "unique_words": unique_words,
         "avg_word_length": round(avg_word_length, 2),
         "avg_sentence_length": round(avg_sentence_length, 2),
@@ -86,9 +107,20 @@ def get_readability_level(score: float) -> str:
         return "Very Difficult (College graduate)"
 
 
+def _metric_column(rows: List[Dict[str, Any]], key: str):
+    """Float array of one metric across rows (NaN where missing), None if no row has it"""
+    if not any(key in row for row in rows):
+        return None
+    return np.fromiter(
+        (np.nan if row.get(key) is None else row[key] for row in rows),
+        dtype=np.float64,
+        count=len(rows),
+    )
+
+
 def compare_competitors(urls_data: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Compare multiple URLs using pandas
+    Compare multiple URLs
     
     Args:
         urls_data: List of analysis results from different URLs
@@ -99,24 +131,53 @@ def compare_competitors(urls_data: List[Dict[str, Any]]) -> Dict[str, Any]:
     if not urls_data:
         return {"error": "No data provided"}
     
-    # Create DataFrame
-    df = pd.DataFrame(urls_data)
+    columns = {
+        key: _metric_column(urls_data, key)
+        for key in ("domain_authority", "page_authority", "spam_score")
+    }
+    
+    def _mean(key: str) -> float:
+        values = columns[key]
+        if values is None:
+            return 0.0
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if values.size else float("nan")
+    
+    def _best(key: str):
+        values = columns[key]
+        if values is None or np.isnan(values).all():
+            return None
+        return urls_data[int(np.nanargmax(values))]
     
     # Calculate statistics
     stats = {
-        "total_sites": len(df),
-        "avg_domain_authority": df.get("domain_authority", pd.Series([0])).mean(),
-        "avg_page_authority": df.get("page_authority", pd.Series([0])).mean(),
-        "avg_spam_score": df.get("spam_score", pd.Series([0])).mean(),
+        "total_sites": len(urls_data),
+        "avg_domain_authority": _mean("domain_authority"),
+        "avg_page_authority": _mean("page_authority"),
+        "avg_spam_score": _mean("spam_score"),
         "best_performing": {
-            "domain_authority": df.loc[df.get("domain_authority", pd.Series([0])).idxmax()].to_dict() if "domain_authority" in df else None,
-            "page_authority": df.loc[df.get("page_authority", pd.Series([0])).idxmax()].to_dict() if "page_authority" in df else None,
+            "domain_authority": _best("domain_authority"),
+            "page_authority": _best("page_authority"),
         }
     }
     
     return stats
 
 
+# Weights for different factors
+POTENTIAL_WEIGHTS = {
+    "domain_authority": 0.25,
+    "page_authority": 0.20,
+    "content_quality": 0.20,
+    "backlinks": 0.15,
+    "technical": 0.10,
+    "spam_penalty": -0.10
+}
+
+_POTENTIAL_METRIC_KEYS = ("domain_authority", "page_authority", "spam_score", "root_domains_linking")
+_POTENTIAL_METRICS = itemgetter(*_POTENTIAL_METRIC_KEYS)
+
+
 def predict_seo_potential(metrics: Dict[str, Any]) -> Dict[str, Any]:
     """
     Predict SEO potential using weighted scoring
@@ -127,21 +188,14 @@ def predict_seo_potential(metrics: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Prediction with score and recommendations
     """
-    # Weights for different factors
-    weights = {
-        "domain_authority": 0.25,
-        "page_authority": 0.20,
-        "content_quality": 0.20,
-        "backlinks": 0.15,
-        "technical": 0.10,
-        "spam_penalty": -0.10
-    }
+    weights = POTENTIAL_WEIGHTS
     
-    # Extract and normalize metrics (0-100 scale)
-    da = metrics.get("domain_authority", 0)
-    pa = metrics.get("page_authority", 0)
-    spam = metrics.get("spam_score", 0)
-    backlinks = min(100, (metrics.get("root_domains_linking", 0) / 100) * 100)
+    # Extract and normalize metrics (0-100 scale); one C-level lookup when all are present
+    try:
+        da, pa, spam, root_domains = _POTENTIAL_METRICS(metrics)
+    except KeyError:
+        da, pa, spam, root_domains = (metrics.get(key, 0) for key in _POTENTIAL_METRIC_KEYS)
+    backlinks = min(100, (root_domains / 100) * 100)
     
     # Calculate weighted score
     score = (
@@ -215,25 +269,39 @@ def analyze_keyword_trends(keywords_data: List[Dict[str, Any]]) -> Dict[str, Any
     if not keywords_data:
         return {"error": "No data provided"}
     
-    df = pd.DataFrame(keywords_data)
+    # Group rows by keyword (first-seen order)
+    rows = len(keywords_data)
+    groups: Dict[str, int] = {}
+    group_ids = np.fromiter(
+        (groups.setdefault(row["keyword"], len(groups)) for row in keywords_data), dtype=np.intp, count=rows
+    )
+    counts = np.fromiter((row["count"] for row in keywords_data), dtype=np.float64, count=rows)
+    sizes = np.bincount(group_ids)
+    
+    # x: each row's position within its keyword (a vectorized groupby cumcount)
+    order = np.argsort(group_ids, kind="stable")
+    x = np.empty(rows, dtype=np.float64)
+    x[order] = np.arange(rows) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    
+    # Per-keyword mean, std and least-squares slope in one vectorized pass
+    # (slope = sum((x - x_mean) * (y - y_mean)) / sum((x - x_mean)^2), x = 0..n-1)
+    n = sizes.astype(np.float64)
+    mean = np.bincount(group_ids, weights=counts, minlength=len(n)) / n
+    dev = counts - mean[group_ids]
+    std = np.sqrt(np.bincount(group_ids, weights=dev * dev, minlength=len(n)) / n)
+    x_dev = x - ((n - 1) / 2)[group_ids]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = np.bincount(group_ids, weights=x_dev * dev, minlength=len(n)) / (n * (n * n - 1) / 12)
     
     # Calculate trends
     trends = {}
-    for keyword in df["keyword"].unique():
-        kw_data = df[df["keyword"] == keyword]
-        counts = kw_data["count"].values
-        
-        if len(counts) > 1:
-            # Simple linear trend
-            x = np.arange(len(counts))
-            z = np.polyfit(x, counts, 1)
-            trend = "increasing" if z[0] > 0 else "decreasing"
-            
+    for keyword, g in groups.items():
+        if sizes[g] > 1:
             trends[keyword] = {
-                "trend": trend,
-                "slope": float(z[0]),
-                "avg_count": float(np.mean(counts)),
-                "volatility": float(np.std(counts))
+                "trend": "increasing" if slopes[g] > 0 else "decreasing",
+                "slope": float(slopes[g]),
+                "avg_count": float(mean[g]),
+                "volatility": float(std[g])
             }
     
     return {
@@ -253,8 +321,9 @@ def generate_content_suggestions(current_keywords: List[str], target_keywords: L
     Returns:
         Optimization suggestions
     """
-    current_set = set([k.lower() for k in current_keywords])
-    target_set = set([k.lower() for k in target_keywords])
+    # casefold so e.g. "Straße" and "STRASSE" match
+    current_set = frozenset(map(str.casefold, current_keywords))
+    target_set = frozenset(map(str.casefold, target_keywords))
     
     missing = target_set - current_set
     present = target_set & current_set
@@ -264,11 +333,59 @@ def generate_content_suggestions(current_keywords: List[str], target_keywords: L
         "missing_keywords": list(missing),
         "present_keywords": list(present),
         "suggestions": [
-            f"Add '{kw}' to your content naturally" for kw in list(missing)[:5]
+            f"Add '{kw}' to your content naturally" for kw in islice(missing, 5)
         ]
     }
 
 
+# Insight rules, evaluated in order: (field, predicate, ((bucket, message), ...)).
+# "{v}" in a message is replaced by the field's value.
+_INSIGHT_RULE_SPECS = (
+    # MOZ metrics
+    ("domain_authority", lambda v: v >= 60, (
+        ("strengths", "Strong Domain Authority ({v}) indicates established credibility"),
+    )),
+    ("domain_authority", lambda v: v < 30, (
+        ("weaknesses", "Low Domain Authority ({v}) limits ranking potential"),
+        ("action_items", "Priority: Build high-quality backlinks to improve Domain Authority"),
+    )),
+    ("spam_score", lambda v: v > 30, (
+        ("threats", "High Spam Score ({v}) could trigger penalties"),
+        ("action_items", "Critical: Conduct backlink audit and disavow toxic links"),
+    )),
+    # Content quality
+    ("readability_score", lambda v: v >= 60, (
+        ("strengths", "Good readability score ({v}) enhances user experience"),
+    )),
+    ("readability_score", lambda v: v < 40, (
+        ("weaknesses", "Content is too complex for average readers"),
+        ("action_items", "Simplify content structure and use shorter sentences"),
+    )),
+    ("total_words", lambda v: v < 300, (
+        ("weaknesses", "Content is too thin for good rankings"),
+        ("action_items", "Expand content to at least 1000-1500 words"),
+    )),
+    ("total_words", lambda v: v >= 1500, (
+        ("strengths", "Comprehensive content length supports SEO"),
+    )),
+    # On-page SEO
+    ("title", lambda v: not v, (
+        ("weaknesses", "Missing title tag - critical for SEO"),
+        ("action_items", "Add optimized title tag (50-60 characters)"),
+    )),
+    ("meta_description", lambda v: not v, (
+        ("opportunities", "Add meta description to improve CTR"),
+        ("action_items", "Write compelling meta description (150-160 characters)"),
+    )),
+)
+
+# Same rules with each rule's number of "Critical" action items precomputed
+_INSIGHT_RULES = tuple(
+    (field, predicate, outputs, sum(1 for bucket, message in outputs if bucket == "action_items" and "Critical" in message))
+    for field, predicate, outputs in _INSIGHT_RULE_SPECS
+)
+
+
 def generate_ai_insights(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Generate AI-powered insights from complete analysis
@@ -287,54 +404,27 @@ def generate_ai_insights(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
         "action_items": []
     }
     
-    # Analyze MOZ metrics
     moz = analysis_data.get("moz", {}).get("backlink_metrics", {})
-    da = moz.get("domain_authority", 0)
-    pa = moz.get("page_authority", 0)
-    spam = moz.get("spam_score", 0)
-    
-    if da >= 60:
-        insights["strengths"].append(f"Strong Domain Authority ({da}) indicates established credibility")
-    elif da < 30:
-        insights["weaknesses"].append(f"Low Domain Authority ({da}) limits ranking potential")
-        insights["action_items"].append("Priority: Build high-quality backlinks to improve Domain Authority")
-    
-    if spam > 30:
-        insights["threats"].append(f"High Spam Score ({spam}) could trigger penalties")
-        insights["action_items"].append("Critical: Conduct backlink audit and disavow toxic links")
-    
-    # Analyze content quality
     content = analysis_data.get("content_quality", {})
-    readability = content.get("readability_score", 0)
-    
-    if readability >= 60:
-        insights["strengths"].append(f"Good readability score ({readability}) enhances user experience")
-    elif readability < 40:
-        insights["weaknesses"].append("Content is too complex for average readers")
-        insights["action_items"].append("Simplify content structure and use shorter sentences")
-    
-    word_count = content.get("total_words", 0)
-    if word_count < 300:
-        insights["weaknesses"].append("Content is too thin for good rankings")
-        insights["action_items"].append("Expand content to at least 1000-1500 words")
-    elif word_count >= 1500:
-        insights["strengths"].append("Comprehensive content length supports SEO")
-    
-    # Analyze on-page SEO
     onpage = analysis_data.get("onpage", {})
-    title = onpage.get("title", "")
-    meta_desc = onpage.get("meta_description", "")
-    
-    if not title:
-        insights["weaknesses"].append("Missing title tag - critical for SEO")
-        insights["action_items"].append("Add optimized title tag (50-60 characters)")
+    values = {
+        "domain_authority": moz.get("domain_authority", 0),
+        "spam_score": moz.get("spam_score", 0),
+        "readability_score": content.get("readability_score", 0),
+        "total_words": content.get("total_words", 0),
+        "title": onpage.get("title", ""),
+        "meta_description": onpage.get("meta_description", ""),
+    }
     
-    if not meta_desc:
-        insights["opportunities"].append("Add meta description to improve CTR")
-        insights["action_items"].append("Write compelling meta description (150-160 characters)")
+    critical_issues = 0
+    for field, predicate, outputs, critical in _INSIGHT_RULES:
+        value = values[field]
+        if predicate(value):
+            for bucket, message in outputs:
+                insights[bucket].append(message.format(v=value))
+            critical_issues += critical
     
     # Calculate priority score
-    critical_issues = len([item for item in insights["action_items"] if "Critical" in item])
     priority_score = 100 - (len(insights["weaknesses"]) * 10) - (critical_issues * 20)
     priority_score = max(0, min(100, priority_score))
     
@@ -361,6 +451,16 @@ def generate_summary(insights: Dict[str, List[str]]) -> str:
         return "Significant SEO challenges requiring comprehensive strategy"
 
 
+# Weight of each component in the comprehensive SEO score
+SCORE_WEIGHTS = {
+    "domain_authority": 0.25,
+    "page_authority": 0.20,
+    "content_quality": 0.25,
+    "technical_seo": 0.15,
+    "user_experience": 0.15
+}
+
+
 def calculate_comprehensive_score(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Calculate comprehensive SEO score using all available data
@@ -371,21 +471,7 @@ def calculate_comprehensive_score(analysis_data: Dict[str, Any]) -> Dict[str, An
     Returns:
         Overall SEO score with breakdown
     """
-    scores = {
-        "domain_authority": 0,
-        "page_authority": 0,
-        "content_quality": 0,
-        "technical_seo": 0,
-        "user_experience": 0
-    }
-    
-    weights = {
-        "domain_authority": 0.25,
-        "page_authority": 0.20,
-        "content_quality": 0.25,
-        "technical_seo": 0.15,
-        "user_experience": 0.15
-    }
+    scores = dict.fromkeys(SCORE_WEIGHTS, 0)
     
     # Domain Authority Score
     moz = analysis_data.get("moz", {}).get("backlink_metrics", {})
@@ -398,7 +484,7 @@ def calculate_comprehensive_score(analysis_data: Dict[str, Any]) -> Dict[str, An
     readability = content.get("readability_score", 50) or 50
     
     # Normalize content score
-    word_score = min(100, (word_count / 1500) * 100) if word_count < 1500 else 100
+    word_score = min(100, word_count * (100 / 1500))
     content_score = (word_score * 0.4) + (readability * 0.6)
     scores["content_quality"] = content_score
     
@@ -423,12 +509,8 @@ def calculate_comprehensive_score(analysis_data: Dict[str, Any]) -> Dict[str, An
     ux_score = (readability * 0.4) + (perf_score * 0.6)
     scores["user_experience"] = ux_score
     
-    # Calculate weighted total - ensure all values are not None
-    total_score = 0
-    for key in scores.keys():
-        score_val = scores[key] or 0
-        weight_val = weights[key]
-        total_score += score_val * weight_val
+    # Calculate weighted total (every score above is already None-safe)
+    total_score = sum(scores[key] * weight for key, weight in SCORE_WEIGHTS.items())
     
     return {
         "overall_score": round(total_score, 2),
@@ -15,6 +15,9 @@ Environment Variables:
 
 Notes:
 - Uses "live" endpoints to avoid task polling.
+- One shared keep-alive session; analyze_keywords_batch_dfs sends many keywords as tasks of one request.
+- Successful responses are cached for DATAFORSEO_CACHE_TTL seconds (default 24h, 0 disables),
+  on disk in DATAFORSEO_CACHE_DIR when diskcache is installed.
 - Accepts location_name and language_name directly for convenience.
 """
 
@@ -22,16 +25,57 @@ from __future__ import annotations
 
 import os
 import base64
+import hashlib
+import json
 import time
+import threading
 from typing import Any, Dict, List, Optional
 
 import requests
+from cachetools import TTLCache
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Try to import diskcache (falls back to an in-process TTLCache)
+try:
+    from diskcache import Cache  # type: ignore
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
 
 BASE_URL = os.getenv("DATAFORSEO_BASE_URL", "https://api.dataforseo.com")
 
+KEYWORD_DIFFICULTY_ENDPOINT = "/v3/keywords_data/google_ads/keyword_difficulty/live"
+SERP_ORGANIC_ENDPOINT = "/v3/serp/google/organic/live/advanced"
+
+# Tasks per POST (DataForSEO accepts up to 100 tasks in one request)
+MAX_TASKS_PER_REQUEST = 100
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+# Response cache: every live call spends credits, and SERP/difficulty data change slowly.
+# On disk (shared by workers, survives restarts) when diskcache is installed.
+CACHE_TTL_S = int(os.getenv("DATAFORSEO_CACHE_TTL", "86400"))  # 0 disables
+CACHE_DIR = os.getenv("DATAFORSEO_CACHE_DIR", "/tmp/dfs_cache")
+_CACHE = None
+_CACHE_INIT_LOCK = threading.Lock()
+_MEMORY_CACHE_LOCK = threading.Lock()
+
+
+def _json_loads(content: bytes) -> Any:
+    """Parse a response body (raw bytes, so no charset detection)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
 
 def _get_auth() -> tuple[str, str]:
     login = os.getenv("DATAFORSEO_LOGIN")
@@ -41,7 +85,7 @@ def _get_auth() -> tuple[str, str]:
     return login, password
 
 
-def _session() -> requests.Session:
+def _build_session() -> requests.Session:
     s = requests.Session()
     retry = Retry(
         total=3,
@@ -55,14 +99,82 @@ def _session() -> requests.Session:
     return s
 
 
+def _session() -> requests.Session:
+    """Shared session, so keep-alive reuses the TLS connection across calls"""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = _build_session()
+    return _SESSION
+
+
+def _response_cache():
+    global _CACHE
+    with _CACHE_INIT_LOCK:
+        if _CACHE is None:
+            _CACHE = TTLCache(maxsize=4096, ttl=CACHE_TTL_S)
+            if DISKCACHE_AVAILABLE:
+                try:
+                    _CACHE = Cache(CACHE_DIR)
+                except Exception:
+                    pass  # e.g. read-only filesystem
+    return _CACHE
+
+
+def _cache_key(endpoint: str, payload: Dict[str, Any]) -> str:
+    body = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(f"{endpoint}|{body}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cache_get(endpoint: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if CACHE_TTL_S <= 0:
+        return None
+    cache = _response_cache()
+    key = _cache_key(endpoint, payload)
+    try:
+        if isinstance(cache, TTLCache):
+            with _MEMORY_CACHE_LOCK:
+                return cache.get(key)
+        return cache.get(key)
+    except Exception:
+        return None
+
+
+def _cache_put(endpoint: str, payload: Dict[str, Any], raw: Dict[str, Any]) -> None:
+    """Store a single-task response, unless DataForSEO reported an error (status_code != 20000)"""
+    tasks = raw.get("tasks") or []
+    if CACHE_TTL_S <= 0 or raw.get("status_code") != 20000 or not tasks or tasks[0].get("status_code") != 20000:
+        return
+    cache = _response_cache()
+    key = _cache_key(endpoint, payload)
+    try:
+        if isinstance(cache, TTLCache):
+            with _MEMORY_CACHE_LOCK:
+                cache[key] = raw
+        else:
+            cache.set(key, raw, expire=CACHE_TTL_S)
+    except Exception:
+        pass
+
+
 def _post(endpoint: str, payload: Dict[str, Any], timeout: int = 30) -> Dict[str, Any]:
+    cached = _cache_get(endpoint, payload)
+    if cached is not None:
+        return cached
+    raw = _post_tasks(endpoint, [payload], timeout)
+    _cache_put(endpoint, payload, raw)
+    return raw
+
+
+def _post_tasks(endpoint: str, payloads: List[Dict[str, Any]], timeout: int = 30) -> Dict[str, Any]:
+    """POST several tasks in one request; the response "tasks" array follows their order"""
     url = f"{BASE_URL}{endpoint}"
     login, password = _get_auth()
     sess = _session()
-    resp = sess.post(url, json=[payload], auth=(login, password), timeout=timeout)
+    resp = sess.post(url, json=payloads, auth=(login, password), timeout=timeout)
     if resp.status_code >= 400:
         raise RuntimeError(f"DataForSEO API error: {resp.status_code} {resp.text}")
-    data = resp.json()
+    data = _json_loads(resp.content)
     if not isinstance(data, dict):
         raise RuntimeError("Unexpected DataForSEO response format")
     return data
@@ -97,17 +209,66 @@ def analyze_keyword_difficulty_dfs(
     Keyword Difficulty (live)
     Endpoint: /v3/keywords_data/google_ads/keyword_difficulty/live
     """
-    payload = {
-        "keywords": [keyword],
-        "location_name": location_name,
-        "language_name": language_name,
-    }
-    raw = _post("/v3/keywords_data/google_ads/keyword_difficulty/live", payload)
+    payload = _difficulty_payload(keyword, location_name, language_name)
+    raw = _post(KEYWORD_DIFFICULTY_ENDPOINT, payload)
     # Normalize
     tasks = raw.get("tasks") or []
     if not tasks:
         return {"keyword": keyword, "error": "No tasks returned", "raw": raw}
-    result_items = tasks[0].get("result") or []
+    return _difficulty_result(keyword, tasks[0], raw, location_name, language_name)
+
+
+def analyze_keywords_batch_dfs(
+    keywords: List[str],
+    location_name: str = "United States",
+    language_name: str = "English"
+) -> List[Dict[str, Any]]:
+    """
+    Keyword Difficulty (live) for several keywords, one task per keyword and
+    up to MAX_TASKS_PER_REQUEST tasks per HTTPS request (cached keywords are not sent)
+    Returns one result per keyword, in order (same shape as analyze_keyword_difficulty_dfs)
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(keywords)
+    pending = []
+    for i, keyword in enumerate(keywords):
+        payload = _difficulty_payload(keyword, location_name, language_name)
+        cached = _cache_get(KEYWORD_DIFFICULTY_ENDPOINT, payload)
+        if cached is not None:
+            results[i] = _difficulty_result(keyword, cached["tasks"][0], cached, location_name, language_name)
+        else:
+            pending.append((i, keyword, payload))
+
+    for start in range(0, len(pending), MAX_TASKS_PER_REQUEST):
+        chunk = pending[start:start + MAX_TASKS_PER_REQUEST]
+        raw = _post_tasks(KEYWORD_DIFFICULTY_ENDPOINT, [payload for _, _, payload in chunk])
+        tasks = raw.get("tasks") or []
+        for j, (i, keyword, payload) in enumerate(chunk):
+            if j >= len(tasks):
+                results[i] = {"keyword": keyword, "error": "No tasks returned"}
+                continue
+            # Same single-task envelope whether cached or fresh, so "raw" doesn't depend on the cache
+            envelope = {"status_code": raw.get("status_code"), "tasks": [tasks[j]]}
+            _cache_put(KEYWORD_DIFFICULTY_ENDPOINT, payload, envelope)
+            results[i] = _difficulty_result(keyword, tasks[j], envelope, location_name, language_name)
+    return results
+
+
+def _difficulty_payload(keyword: str, location_name: str, language_name: str) -> Dict[str, Any]:
+    return {
+        "keywords": [keyword],
+        "location_name": location_name,
+        "language_name": language_name,
+    }
+
+
+def _difficulty_result(
+    keyword: str,
+    task: Dict[str, Any],
+    raw: Dict[str, Any],
+    location_name: str,
+    language_name: str,
+) -> Dict[str, Any]:
+    result_items = task.get("result") or []
     if not result_items:
         return {"keyword": keyword, "error": "No result items", "raw": raw}
     item = result_items[0]
@@ -137,33 +298,48 @@ def analyze_serp_results_dfs(
     SERP Organic (advanced, live)
     Endpoint: /v3/serp/google/organic/live/advanced
     """
-    payload = {
+    payload = _serp_payload(keyword, location_name, language_name, device)
+    raw = _post(SERP_ORGANIC_ENDPOINT, payload)
+    tasks = raw.get("tasks") or []
+    if not tasks:
+        return {"keyword": keyword, "results": [], "error": "No tasks returned", "raw": raw}
+    return _serp_result(keyword, tasks[0], raw, location_name, language_name, device)
+
+
+def _serp_payload(keyword: str, location_name: str, language_name: str, device: str) -> Dict[str, Any]:
+    return {
         "keyword": keyword,
         "location_name": location_name,
         "language_name": language_name,
         "device": device,
     }
-    raw = _post("/v3/serp/google/organic/live/advanced", payload)
-    tasks = raw.get("tasks") or []
-    if not tasks:
-        return {"keyword": keyword, "results": [], "error": "No tasks returned", "raw": raw}
-    result_items = tasks[0].get("result") or []
+
+
+def _serp_result(
+    keyword: str,
+    task: Dict[str, Any],
+    raw: Dict[str, Any],
+    location_name: str,
+    language_name: str,
+    device: str,
+) -> Dict[str, Any]:
+    result_items = task.get("result") or []
     if not result_items:
         return {"keyword": keyword, "results": [], "error": "No result items", "raw": raw}
     # Extract organic results
     items = result_items[0].get("items") or []
-    organic = []
-    for it in items:
-        if it.get("type") != "organic":
-            continue
-        organic.append({
+    organic = [
+        {
             "position": it.get("rank_group"),
             "title": it.get("title"),
             "url": it.get("url"),
             "domain": it.get("domain"),
             "snippet": it.get("snippet") or it.get("description"),
             "sitelinks": it.get("sitelinks") or [],
-        })
+        }
+        for it in items
+        if it.get("type") == "organic"
+    ]
 
     return {
         "keyword": keyword,
@@ -0,0 +1,140 @@
+"""
+DataForSEO Async Client
+=======================
+
+Concurrent variant of dataforseo.py for multi-keyword audits: keyword
+difficulty and SERP requests for every keyword are sent at once over one
+pooled httpx.AsyncClient (HTTP/2 multiplexed when h2 is installed), so
+wall-clock time is roughly one round-trip instead of one per request.
+
+Results have the same shape as analyze_keyword_difficulty_dfs /
+analyze_serp_results_dfs. Authentication, BASE_URL and the response cache
+are shared with the sync module.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from typing import Any, Dict, List
+
+import httpx
+
+from .dataforseo import (
+    BASE_URL,
+    KEYWORD_DIFFICULTY_ENDPOINT,
+    SERP_ORGANIC_ENDPOINT,
+    _cache_get,
+    _cache_put,
+    _difficulty_payload,
+    _difficulty_result,
+    _get_auth,
+    _json_loads,
+    _serp_payload,
+    _serp_result,
+)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+MAX_CONNECTIONS = 20
+TIMEOUT_S = 30.0
+
+# Same policy as the sync session's urllib3 Retry
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+async def _post(client: httpx.AsyncClient, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    # The response cache may be diskcache (SQLite): keep its I/O off the event loop
+    cached = await asyncio.to_thread(_cache_get, endpoint, payload)
+    if cached is not None:
+        return cached
+    for attempt in range(MAX_RETRIES + 1):
+        resp = await client.post(endpoint, json=[payload])
+        if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+    if resp.status_code >= 400:
+        raise RuntimeError(f"DataForSEO API error: {resp.status_code} {resp.text}")
+    data = _json_loads(resp.content)
+    if not isinstance(data, dict):
+        raise RuntimeError("Unexpected DataForSEO response format")
+    await asyncio.to_thread(_cache_put, endpoint, payload, data)
+    return data
+
+
+async def _keyword_difficulty(
+    client: httpx.AsyncClient, keyword: str, location_name: str, language_name: str
+) -> Dict[str, Any]:
+    try:
+        raw = await _post(client, KEYWORD_DIFFICULTY_ENDPOINT, _difficulty_payload(keyword, location_name, language_name))
+    except Exception as e:
+        return {"keyword": keyword, "error": str(e)}
+    tasks = raw.get("tasks") or []
+    if not tasks:
+        return {"keyword": keyword, "error": "No tasks returned", "raw": raw}
+    return _difficulty_result(keyword, tasks[0], raw, location_name, language_name)
+
+
+async def _serp_results(
+    client: httpx.AsyncClient, keyword: str, location_name: str, language_name: str, device: str
+) -> Dict[str, Any]:
+    try:
+        raw = await _post(client, SERP_ORGANIC_ENDPOINT, _serp_payload(keyword, location_name, language_name, device))
+    except Exception as e:
+        return {"keyword": keyword, "results": [], "error": str(e)}
+    tasks = raw.get("tasks") or []
+    if not tasks:
+        return {"keyword": keyword, "results": [], "error": "No tasks returned", "raw": raw}
+    return _serp_result(keyword, tasks[0], raw, location_name, language_name, device)
+
+
+async def analyze_many(
+    keywords: List[str],
+    location_name: str = "United States",
+    language_name: str = "English",
+    device: str = "desktop",
+    include_serp: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Keyword difficulty (and SERP results) for many keywords concurrently
+
+    Returns:
+        One {"keyword", "difficulty", "serp"} dict per keyword, in order;
+        a failed request yields an "error" entry instead of raising.
+        "serp" is None when include_serp is False.
+    """
+    login, password = _get_auth()
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        auth=(login, password),
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS),
+        timeout=TIMEOUT_S,
+    ) as client:
+        difficulty = asyncio.gather(
+            *(_keyword_difficulty(client, kw, location_name, language_name) for kw in keywords)
+        )
+        if include_serp:
+            serp = asyncio.gather(
+                *(_serp_results(client, kw, location_name, language_name, device) for kw in keywords)
+            )
+            difficulty, serp = await asyncio.gather(difficulty, serp)
+        else:
+            difficulty, serp = await difficulty, [None] * len(keywords)
+
+    return [
+        {"keyword": kw, "difficulty": d, "serp": s}
+        for kw, d, s in zip(keywords, difficulty, serp)
+    ]
+
+
+def analyze_many_sync(
+    keywords: List[str],
+    location_name: str = "United States",
+    language_name: str = "English",
+    device: str = "desktop",
+    include_serp: bool = True,
+) -> List[Dict[str, Any]]:
+    """Sync wrapper around analyze_many (for callers without an event loop)"""
+    return asyncio.run(analyze_many(keywords, location_name, language_name, device, include_serp))
@@ -0,0 +1,58 @@
+"""
+Shared pooled HTTP session for the analyzers' third-party calls
+(MOZ, PageSpeed, SerpAPI, on-page fetches)
+
+Keep-alive reuses TCP/TLS connections across calls instead of a new
+handshake per request; 429/5xx responses are retried with backoff.
+Response bodies are parsed with orjson when it is installed.
+"""
+import json
+import threading
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+POOL_CONNECTIONS = 16  # distinct hosts kept
+POOL_MAXSIZE = 32  # connections per host
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    s = requests.Session()
+    retry = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+        raise_on_status=False,  # hand the last response back so callers can report its status
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+
+def json_loads(content: bytes) -> Any:
+    """Parse a response body (raw bytes, so no charset detection)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def shared_session() -> requests.Session:
+    """Process-wide session (created on first use)"""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = _build_session()
+    return _SESSION
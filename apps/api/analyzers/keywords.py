@@ -1,33 +1,109 @@
 import re
 import os
+import urllib.parse
 from collections import Counter
-from typing import Optional
-
-# Comprehensive multilingual stop words (English, German, French, Italian, Spanish)
-STOPWORDS = set("""
-    the a an and or for to of in on with is are was were be by as it this that from at your you we they i our their
-    der die das den dem des ein eine einer eines einem einen zur zum bei aus nach vor von mit über durch um nicht
-    und oder aber auch wenn dann als wie so noch nur schon mehr sehr viel bereits sein seine seine ihr ihre hat haben
-    wird werden kann können muss müssen soll sollen will wollen wurde wurden ist sind war waren sein seine
-    ich du er sie es wir ihr ihnen sich mich dich uns euch ihm ihn sie ihnen man einer einem einen
-    auf an in zu von bei mit nach über unter durch für um gegen ohne bis seit zwischen hinter neben während
-    dieser diese dieses jener jene jenes welcher welche welches solcher solche solches aller alle alles
-    mein meine meiner meines meinem meinen dein deine deiner deines deinem deinen
-    unser unsere unserer unseres unserem unseren euer eure eurer eures eurem euren
-    le la les un une des de du à au aux et ou mais donc car ni ne pas plus moins très tout tous toute toutes
-    ce cette ces mon ma mes ton ta tes son sa ses notre nos votre vos leur leurs
-    je tu il elle nous vous ils elles on me te se lui en y
-    être avoir faire dire aller voir venir pouvoir vouloir devoir savoir prendre mettre donner
-    il lo la i gli le un uno una dei degli delle di da a in con su per tra fra
-    che e o ma anche se non più molto questo quello come quando dove
-    io tu lui lei noi voi loro mi ti si ci vi
-    essere avere faire dire andare venire potere volere dovere sapere prendere mettere dare
-    el la los las un una unos unas de del a al en con por para sobre entre
-    que y o pero también si no más muy este esta estos estas ese esa esos esas
-    yo tú él ella nosotros vosotros ellos ellas me te se nos os
-    ser estar haber tener hacer ir venir poder querer deber saber poner dar
-    stock angebot mehr nova bereits transport
-""".split())
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .text_stats import top_indices, top_word_counts, word_counts
+
+# Comprehensive multilingual stop words (English, German, French, Italian, Spanish).
+# Each word is listed once, under the first language that uses it.
+STOPWORDS = frozenset({
+    # English
+    "the", "a", "an", "and", "or", "for", "to", "of", "in", "on", "with", "is", "are", "was",
+    "were", "be", "by", "as", "it", "this", "that", "from", "at", "your", "you", "we", "they", "i",
+    "our", "their",
+    # German
+    "der", "die", "das", "den", "dem", "des", "ein", "eine", "einer", "eines", "einem", "einen",
+    "zur", "zum", "bei", "aus", "nach", "vor", "von", "mit", "über", "durch", "um", "nicht", "und",
+    "oder", "aber", "auch", "wenn", "dann", "als", "wie", "so", "noch", "nur", "schon", "mehr",
+    "sehr", "viel", "bereits", "sein", "seine", "ihr", "ihre", "hat", "haben", "wird", "werden",
+    "kann", "können", "muss", "müssen", "soll", "sollen", "will", "wollen", "wurde", "wurden",
+    "ist", "sind", "war", "waren", "ich", "du", "er", "sie", "es", "wir", "ihnen", "sich", "mich",
+    "dich", "uns", "euch", "ihm", "ihn", "man", "auf", "zu", "unter", "für", "gegen", "ohne", "bis",
+    "seit", "zwischen", "hinter", "neben", "während", "dieser", "diese", "dieses", "jener", "jene",
+    "jenes", "welcher", "welche", "welches", "solcher", "solche", "solches", "aller", "alle",
+    "alles", "mein", "meine", "meiner", "meines", "meinem", "meinen", "dein", "deine", "deiner",
+    "deines", "deinem", "deinen", "unser", "unsere", "unserer", "unseres", "unserem", "unseren",
+    "euer", "eure", "eurer", "eures", "eurem", "euren",
+    "seiner", "seines", "seinem", "seinen", "ihrer", "ihres", "ihrem", "ihren",
+    "kein", "keine", "keiner", "keines", "keinem", "keinen", "jeder", "jede", "jedes", "jedem", "jeden",
+    # French
+    "le", "la", "les", "un", "une", "de", "à", "au", "aux", "et", "ou", "mais", "donc", "car", "ni",
+    "ne", "pas", "plus", "moins", "très", "tout", "tous", "toute", "toutes", "ce", "cette", "ces",
+    "mon", "ma", "mes", "ton", "ta", "tes", "son", "sa", "ses", "notre", "nos", "votre", "vos",
+    "leur", "leurs", "je", "tu", "il", "elle", "nous", "vous", "ils", "elles", "me", "te", "se",
+    "lui", "en", "y", "être", "avoir", "faire", "dire", "voir", "venir", "pouvoir", "vouloir",
+    "devoir", "savoir", "prendre", "mettre", "donner",
+    # Italian
+    "lo", "gli", "uno", "una", "dei", "degli", "delle", "di", "da", "con", "su", "per", "tra",
+    "fra", "che", "e", "o", "anche", "non", "più", "molto", "questo", "quello", "come", "quando",
+    "dove", "io", "lei", "noi", "voi", "loro", "mi", "ti", "si", "ci", "vi", "essere", "avere",
+    "andare", "venire", "potere", "volere", "dovere", "sapere", "prendere", "mettere", "dare",
+    # Spanish
+    "el", "los", "las", "unos", "unas", "del", "al", "por", "para", "sobre", "entre", "que", "pero",
+    "también", "no", "más", "muy", "este", "esta", "estos", "estas", "ese", "esa", "esos", "esas",
+    "yo", "tú", "él", "ella", "nosotros", "vosotros", "ellos", "ellas", "os", "ser", "estar",
+    "haber", "tener", "hacer", "ir", "poder", "querer", "deber", "saber", "poner", "dar",
+    # Domain-specific filler
+    "stock", "angebot", "nova", "transport",
+})
+
+# Keyword candidates: words (alphanumeric + umlauts/accents) of 3+ characters.
+# Shorter words are never keywords, so the regex drops them before the stopword lookup.
+_KEYWORD_RE = re.compile(r"\b[\w\u00C0-\u017F]{3,}\b")
+_NON_LETTER_RE = re.compile(r"[^a-zäöüß]")
+
+# Common industry keywords for topic detection, in priority order (extend as needed)
+INDUSTRY_KEYWORDS = (
+    "umzug", "umzugsfirma", "transport", "spedition", "möbeltransport",
+    "reinigung", "cleaning", "hausverwaltung", "immobilien", "real estate",
+    "restaurant", "catering", "hotel", "bau", "renovation", "handwerk",
+    "marketing", "agentur", "consulting", "beratung", "software", "web",
+    "fitness", "gym", "yoga", "wellness", "spa", "beauty", "friseur",
+)
+
+
+def _scanner_matches_regex(text_lower: str) -> bool:
+    # Inside \u00C0-\u017F only × and ÷ are not \w, so without them _KEYWORD_RE
+    # matches exactly the \w runs the Numba scanner counts
+    return "\u00d7" not in text_lower and "\u00f7" not in text_lower
+
+
+def _keyword_counts(text_lower: str) -> Counter:
+    """Counts of non-stopword keyword candidates, in first-seen order"""
+    if _scanner_matches_regex(text_lower):
+        counts = word_counts(text_lower, 3, STOPWORDS)
+        if counts is not None:
+            return counts
+    return Counter(w for w in _KEYWORD_RE.findall(text_lower) if w not in STOPWORDS)
+
+
+def _keyword_top(text_lower: str, top_n: int) -> Tuple[int, list]:
+    """Total keyword count and the top_n (word, count) pairs"""
+    if _scanner_matches_regex(text_lower):
+        # Only the top words become strings; the rest stay counts in arrays
+        result = top_word_counts(text_lower, 3, STOPWORDS, top_n)
+        if result is not None:
+            return result
+    freq = _keyword_counts(text_lower)
+    return sum(freq.values()), _top_counts(freq, top_n)
+
+
+def _top_counts(freq: Counter, top_n: int) -> list:
+    """
+    Same result as freq.most_common(top_n) (ties keep first-seen order), but
+    selects with a linear-time partition instead of a heap over every word
+    """
+    if top_n <= 0 or not freq:
+        return []
+    keys = list(freq)
+    counts = np.fromiter(freq.values(), dtype=np.int64, count=len(keys))
+    return [(keys[i], int(counts[i])) for i in top_indices(counts, top_n).tolist()]
+
 
 def analyze_keywords(text: str, top_n: int = 25) -> dict:
     """
@@ -49,15 +125,9 @@ def analyze_keywords(text: str, top_n: int = 25) -> dict:
             "top": [{"word": str, "count": int, "percent": float}]
         }
     """
-    # Extract words (alphanumeric + umlauts/accents)
-    words = re.findall(r"\b[\w\u00C0-\u017F]+\b", text.lower())
-    
-    # Filter stop words and short words
-    words = [w for w in words if w not in STOPWORDS and len(w) > 2]
-    
-    total = len(words) or 1
-    freq = Counter(words)
-    top = freq.most_common(top_n)
+    # Extract words (alphanumeric + umlauts/accents, 3+ characters) without stop words
+    total, top = _keyword_top(text.lower(), top_n)
+    total = total or 1
     
     density = [
         {
@@ -74,6 +144,16 @@ def analyze_keywords(text: str, top_n: int = 25) -> dict:
     }
 
 
+def analyze_keywords_batch(texts: List[str], top_n: int = 25) -> List[dict]:
+    """
+    analyze_keywords for many pages at once (e.g. a site audit).
+    
+    Returns:
+        list: One analyze_keywords result per text, in order
+    """
+    return [analyze_keywords(text, top_n) for text in texts]
+
+
 def analyze_seo_keywords(text: str, url: str, title: Optional[str] = None, top_n: int = 10) -> dict:
     """
     SEO-focused keyword analysis using SERP data and search volume.
@@ -99,14 +179,17 @@ def analyze_seo_keywords(text: str, url: str, title: Optional[str] = None, top_n
             "method": str
         }
     """
+    # Extract all candidate keywords from page (once; the topic fallback reuses them)
+    word_freq = _keyword_counts(text.lower())
+    
     # Extract topic from URL and title
     topic = _extract_topic(url, title or "")
     
     if not topic:
-        # Fallback: analyze basic keywords and return top as topic
-        basic = analyze_keywords(text, top_n=5)
-        if basic["top"]:
-            topic = basic["top"][0]["word"]
+        # Fallback: most frequent page keyword as topic
+        top = _top_counts(word_freq, 1)
+        if top:
+            topic = top[0][0]
         else:
             return {
                 "detected_topic": None,
@@ -135,30 +218,27 @@ def analyze_seo_keywords(text: str, url: str, title: Optional[str] = None, top_n
         # SerpAPI not available or quota exceeded – continue without SERP data
         pass
     
-    # Extract all candidate keywords from page
-    words = re.findall(r"\b[\w\u00C0-\u017F]+\b", text.lower())
-    words = [w for w in words if w not in STOPWORDS and len(w) > 2]
-    word_freq = Counter(words)
-    
     # Build keyword candidates: combine topic + related + high-frequency words
+    topic_lower = topic.lower()
     candidates = set()
-    candidates.add(topic.lower())
-    for kw in related_keywords:
-        # Extract individual words from related searches
-        for w in re.findall(r"\b[\w\u00C0-\u017F]+\b", kw.lower()):
-            if w not in STOPWORDS and len(w) > 2:
-                candidates.add(w)
+    candidates.add(topic_lower)
+    # All related searches as one lowercased string: one regex pass extracts their
+    # words, and "kw in related_text" is the per-search substring test in one scan
+    # (candidates never contain a newline, so no match spans two searches)
+    related_text = "\n".join(related_keywords).lower()
+    related_words = _KEYWORD_RE.findall(related_text)
+    candidates.update(w for w in related_words if w not in STOPWORDS)
     
     # Add top words from page that are NOT stopwords
-    for w, _ in word_freq.most_common(30):
+    for w, _ in _top_counts(word_freq, 30):
         candidates.add(w)
     
     # Score candidates: relevance = count_on_page × serp_match_boost
     scored = []
     for kw in candidates:
         count = word_freq.get(kw, 0)
-        serp_boost = 2.0 if any(kw in rk.lower() for rk in related_keywords) else 1.0
-        topic_boost = 3.0 if kw == topic.lower() else 1.0
+        serp_boost = 2.0 if kw in related_text else 1.0
+        topic_boost = 3.0 if kw == topic_lower else 1.0
         score = count * serp_boost * topic_boost
         
         if score > 0:
@@ -180,6 +260,7 @@ def analyze_seo_keywords(text: str, url: str, title: Optional[str] = None, top_n
     }
 
 
+@lru_cache(maxsize=4096)
 def _extract_topic(url: str, title: str) -> Optional[str]:
     """
     Extract main topic/industry from URL and title.
@@ -188,28 +269,18 @@ def _extract_topic(url: str, title: str) -> Optional[str]:
         - "nova-stock.ch/umzug" → "umzug"
         - "Umzugsfirma Zürich - Nova Stock" → "umzugsfirma"
     """
-    # Common industry keywords (extend as needed)
-    industry_keywords = [
-        "umzug", "umzugsfirma", "transport", "spedition", "möbeltransport",
-        "reinigung", "cleaning", "hausverwaltung", "immobilien", "real estate",
-        "restaurant", "catering", "hotel", "bau", "renovation", "handwerk",
-        "marketing", "agentur", "consulting", "beratung", "software", "web",
-        "fitness", "gym", "yoga", "wellness", "spa", "beauty", "friseur"
-    ]
-    
     combined = (url + " " + title).lower()
     
-    # Check for industry keywords in URL/title
-    for kw in industry_keywords:
+    # Check for industry keywords in URL/title (first listed keyword wins)
+    for kw in INDUSTRY_KEYWORDS:
         if kw in combined:
             return kw
     
     # Fallback: extract domain-specific word from URL path
-    import urllib.parse
     parsed = urllib.parse.urlparse(url)
     path_parts = [p for p in parsed.path.split("/") if p and len(p) > 3]
     if path_parts:
-        candidate = re.sub(r"[^a-zäöüß]", "", path_parts[0].lower())
+        candidate = _NON_LETTER_RE.sub("", path_parts[0].lower())
         if candidate and candidate not in STOPWORDS:
             return candidate
     
@@ -102,8 +102,7 @@ LLM_REGISTRY: Dict[str, Dict[str, Any]] = {
 }
 
 
-def get_default_model(provider: str) -> str:
-    reg = LLM_REGISTRY.get(provider, {})
+def _scan_default_model(reg: Dict[str, Any]) -> str:
     models = reg.get("models", [])
     # Prefer models marked as latest and stable
     for m in models:
@@ -117,9 +116,21 @@ def get_default_model(provider: str) -> str:
     return reg.get("default", "")
 
 
+def _scan_recommended_models(reg: Dict[str, Any]) -> List[str]:
+    return [m["id"] for m in reg.get("models", []) if m.get("stable") and (m.get("recommended") or m["id"] == reg["default"])]
+
+
+# The registry is static, so both lookups are resolved once at import
+_DEFAULT_MODELS: Dict[str, str] = {p: _scan_default_model(reg) for p, reg in LLM_REGISTRY.items()}
+_RECOMMENDED_MODELS: Dict[str, List[str]] = {p: _scan_recommended_models(reg) for p, reg in LLM_REGISTRY.items()}
+
+
+def get_default_model(provider: str) -> str:
+    return _DEFAULT_MODELS.get(provider, "")
+
+
 def get_recommended_models(provider: str) -> List[str]:
-    models = LLM_REGISTRY.get(provider, {}).get("models", [])
-    return [m["id"] for m in models if m.get("stable") and (m.get("recommended") or m["id"] == LLM_REGISTRY[provider]["default"])]
+    return list(_RECOMMENDED_MODELS.get(provider, ()))
 
 
 def get_registry_snapshot() -> Dict[str, Any]:
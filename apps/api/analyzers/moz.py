@@ -8,12 +8,36 @@ import hmac
 import hashlib
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
+from urllib.parse import urlsplit, urlunsplit
+
+from .api_cache import cached_result
+from .http_session import json_loads, shared_session
 
 MOZ_ACCESS_ID = os.getenv("MOZ_ACCESS_ID", "")
 MOZ_SECRET_KEY = os.getenv("MOZ_SECRET_KEY", "")
 MOZ_API_ENDPOINT = "https://lsapi.seomoz.com/v2/url_metrics"
 MOZ_LINKS_ENDPOINT = "https://lsapi.seomoz.com/v2/links"
+# Successful responses are cached this long (MOZ metrics change slowly); 0 disables
+MOZ_CACHE_TTL_S = int(os.getenv("MOZ_CACHE_TTL", "21600"))
+
+
+def _canonical(url: str) -> str:
+    """
+    One spelling per URL, so equivalent inputs share a cache entry and a MOZ call:
+    scheme and host lowercased, default port, fragment and trailing slash dropped.
+    Path and query keep their case. Bare domains ("example.com") are only trimmed.
+    """
+    url = url.strip()
+    parts = urlsplit(url)
+    if not parts.netloc:
+        return url
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, parts.port) in (("http", 80), ("https", 443)):
+        netloc = netloc.rsplit(":", 1)[0]
+    return urlunsplit((scheme, netloc, parts.path.rstrip("/") or "/", parts.query, ""))
 
 
 def generate_moz_auth() -> Optional[Dict[str, str]]:
@@ -34,7 +58,7 @@ def generate_moz_auth() -> Optional[Dict[str, str]]:
     }
 
 
-def analyze_moz_metrics(url: str) -> Dict[str, Any]:
+def analyze_moz_metrics(url: str, *, include_raw: bool = False) -> Dict[str, Any]:
     """
     Analyze URL using MOZ API
     
@@ -49,6 +73,7 @@ def analyze_moz_metrics(url: str) -> Dict[str, Any]:
     
     Args:
         url: The URL to analyze
+        include_raw: Also return the complete MOZ result as "raw_data"
         
     Returns:
         Dict with MOZ metrics or error message
@@ -61,13 +86,21 @@ def analyze_moz_metrics(url: str) -> Dict[str, Any]:
             "note": "Set these in .env to enable MOZ metrics"
         }
     
+    url = _canonical(url)
+    metrics = cached_result("moz_metrics", MOZ_CACHE_TTL_S, url, lambda: _request_moz_metrics(url, headers))
+    if include_raw or "raw_data" not in metrics:
+        return metrics
+    return {k: v for k, v in metrics.items() if k != "raw_data"}
+
+
+def _request_moz_metrics(url: str, headers: Dict[str, str]) -> Dict[str, Any]:
     try:
         # Request payload for URL Metrics API v2
         payload = {
             "targets": [url]
         }
         
-        response = requests.post(
+        response = shared_session().post(
             MOZ_API_ENDPOINT,
             headers=headers,
             json=payload,
@@ -75,7 +108,7 @@ def analyze_moz_metrics(url: str) -> Dict[str, Any]:
         )
         
         if response.status_code == 200:
-            data = response.json()
+            data = json_loads(response.content)
             
             # Extract results
             if "results" in data and len(data["results"]) > 0:
@@ -145,6 +178,13 @@ def fetch_backlinks(url: str, limit: int = 15) -> Dict[str, Any]:
             "note": "Set these in .env to enable MOZ backlink listings"
         }
 
+    url = _canonical(url)
+    return cached_result(
+        "moz_backlinks", MOZ_CACHE_TTL_S, (url, limit), lambda: _request_backlinks(url, limit, headers)
+    )
+
+
+def _request_backlinks(url: str, limit: int, headers: Dict[str, str]) -> Dict[str, Any]:
     payload = {
         "target": url,
         "scope": "page_to_page",
@@ -154,7 +194,7 @@ def fetch_backlinks(url: str, limit: int = 15) -> Dict[str, Any]:
     }
 
     try:
-        response = requests.post(
+        response = shared_session().post(
             MOZ_LINKS_ENDPOINT,
             headers=headers,
             json=payload,
@@ -162,7 +202,7 @@ def fetch_backlinks(url: str, limit: int = 15) -> Dict[str, Any]:
         )
 
         if response.status_code == 200:
-            data = response.json()
+            data = json_loads(response.content)
             results = data.get("results", [])
 
             backlinks = []
@@ -229,7 +269,12 @@ def get_backlink_summary(url: str) -> Dict[str, Any]:
     Returns:
         Dict with backlink metrics
     """
-    metrics = analyze_moz_metrics(url)
+    # The two MOZ requests are independent, so both run at once
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        metrics_future = executor.submit(analyze_moz_metrics, url)
+        backlinks_future = executor.submit(fetch_backlinks, url)
+        metrics = metrics_future.result()
+        backlinks_data = backlinks_future.result()
     
     if "error" in metrics:
         return metrics
@@ -242,7 +287,6 @@ def get_backlink_summary(url: str) -> Dict[str, Any]:
     # Simple scoring algorithm
     seo_score = ((da + pa) / 2) * (1 - (spam / 100))
     
-    backlinks_data = fetch_backlinks(url)
     backlinks = backlinks_data.get("backlinks") if isinstance(backlinks_data, dict) else []
     backlink_error = backlinks_data if isinstance(backlinks_data, dict) and "error" in backlinks_data else None
 
@@ -1,33 +1,139 @@
-import requests
+import importlib.util
+
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
-def analyze_onpage(url: str) -> dict:
-    resp = requests.get(url, timeout=20)
-    resp.raise_for_status()
-    html = resp.text
-    soup = BeautifulSoup(html, "html.parser")
+from .http_session import shared_session
+
+# Try to import selectolax (C-backed Lexbor parser; falls back to BeautifulSoup)
+try:
+    from selectolax.lexbor import LexborHTMLParser  # type: ignore
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# BeautifulSoup tree builder for the fallback path: lxml's C parser when installed
+LXML_AVAILABLE = importlib.util.find_spec("lxml") is not None
+BS4_PARSER = "lxml" if LXML_AVAILABLE else "html.parser"
+
+# Pages are read up to this many bytes (text_content is cut to 200k chars anyway)
+MAX_HTML_BYTES = 2_000_000
+CHUNK_SIZE = 65536
+MAX_IMAGES = 100
+MAX_LINKS = 200
+_NON_TEXT_TAGS = ("script", "style", "noscript")
+
+
+def _fetch_html(url: str) -> str:
+    """GET a page, streaming at most MAX_HTML_BYTES of the body"""
+    with shared_session().get(url, timeout=20, stream=True) as resp:
+        resp.raise_for_status()
+        chunks = []
+        total = 0
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= MAX_HTML_BYTES:
+                break
+        encoding = resp.encoding or "utf-8"
+    body = b"".join(chunks)[:MAX_HTML_BYTES]
+    try:
+        return body.decode(encoding, errors="replace")
+    except LookupError:
+        # unknown charset in the Content-Type header
+        return body.decode("utf-8", errors="replace")
+
 
-    title = soup.title.string.strip() if soup.title and soup.title.string else ""
+def _parse_selectolax(html: str, url: str) -> dict:
+    tree = LexborHTMLParser(html)
+
+    title_node = tree.css_first("title")
+    title = title_node.text(strip=True) if title_node else ""
     meta_desc = ""
-    md = soup.find("meta", attrs={"name": "description"})
-    if md and md.get("content"):
-        meta_desc = md.get("content").strip()
+    md = tree.css_first('meta[name="description"]')
+    if md and md.attributes.get("content"):
+        meta_desc = md.attributes["content"].strip()
 
-    h_tags = {f"h{i}": [h.get_text(strip=True) for h in soup.find_all(f"h{i}")] for i in range(1, 7)}
-    imgs = [{"src": urljoin(url, img.get("src", "")), "alt": img.get("alt", "")} for img in soup.find_all("img")]
-    links = [{"href": urljoin(url, a.get("href", "")), "text": a.get_text(strip=True)} for a in soup.find_all("a") if a.get("href")]
+    h_tags = {f"h{i}": [h.text(strip=True) for h in tree.css(f"h{i}")] for i in range(1, 7)}
+    imgs = [
+        {"src": urljoin(url, img.attributes.get("src") or ""), "alt": img.attributes.get("alt") or ""}
+        for img in tree.css("img")
+    ]
+    links = [
+        {"href": urljoin(url, a.attributes["href"]), "text": a.text(strip=True)}
+        for a in tree.css("a[href]") if a.attributes["href"]
+    ]
 
     # text content for keyword analysis
-    for s in soup(["script", "style", "noscript"]):
-        s.extract()
-    text_content = soup.get_text(separator=" ").strip()
+    for s in tree.css("script, style, noscript"):
+        s.decompose()
+    text_content = tree.root.text(separator=" ").strip() if tree.root else ""
+    return {
+        "title": title,
+        "meta_description": meta_desc,
+        "headings": h_tags,
+        "images": imgs,
+        "links": links,
+        "text_content": text_content,
+    }
+
+
+def _parse_bs4(html: str, url: str) -> dict:
+    soup = BeautifulSoup(html, BS4_PARSER)
+
+    # One walk over every tag, dispatching on its name
+    title_tag = None
+    md = None
+    h_tags = {f"h{i}": [] for i in range(1, 7)}
+    imgs = []
+    links = []
+    non_text = []
+    for tag in soup.find_all(True):
+        name = tag.name
+        if name in h_tags:
+            h_tags[name].append(tag.get_text(strip=True))
+        elif name == "img":
+            if len(imgs) < MAX_IMAGES:
+                imgs.append({"src": urljoin(url, tag.get("src", "")), "alt": tag.get("alt", "")})
+        elif name == "a":
+            if len(links) < MAX_LINKS and tag.get("href"):
+                links.append({"href": urljoin(url, tag.get("href", "")), "text": tag.get_text(strip=True)})
+        elif name in _NON_TEXT_TAGS:
+            non_text.append(tag)
+        elif name == "title" and title_tag is None:
+            title_tag = tag
+        elif name == "meta" and md is None and tag.get("name") == "description":
+            md = tag
+
+    title = title_tag.string.strip() if title_tag and title_tag.string else ""
+    meta_desc = ""
+    if md and md.get("content"):
+        meta_desc = md.get("content").strip()
 
+    # text content for keyword analysis: emptying the tags drops their text like
+    # extract() would, without extract()'s sibling-index lookup per tag
+    for s in non_text:
+        s.clear()
+    text_content = soup.get_text(separator=" ").strip()
     return {
         "title": title,
         "meta_description": meta_desc,
         "headings": h_tags,
-        "images": imgs[:100],
-        "links": links[:200],
-        "text_content": text_content[:200000],
+        "images": imgs,
+        "links": links,
+        "text_content": text_content,
+    }
+
+
+def analyze_onpage(url: str) -> dict:
+    html = _fetch_html(url)
+    page = _parse_selectolax(html, url) if SELECTOLAX_AVAILABLE else _parse_bs4(html, url)
+
+    return {
+        "title": page["title"],
+        "meta_description": page["meta_description"],
+        "headings": page["headings"],
+        "images": page["images"][:MAX_IMAGES],
+        "links": page["links"][:MAX_LINKS],
+        "text_content": page["text_content"][:200000],
     }
@@ -1,15 +1,71 @@
-import os, requests
+import asyncio
+import importlib.util
+import os
+from typing import List
 
-def analyze_performance(url: str) -> dict:
+import httpx
+
+from .api_cache import cache_get, cache_put, cached_result
+from .http_session import json_loads, shared_session
+
+PAGESPEED_ENDPOINT = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
+# Successful PageSpeed results are cached this long (a full Lighthouse run takes
+# 10-30s); 0 disables
+PAGESPEED_CACHE_TTL_S = int(os.getenv("PAGESPEED_CACHE_TTL", "43200"))
+# Concurrent runs in analyze_performance_many (keeps within the per-minute quota)
+PAGESPEED_CONCURRENCY = 8
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+def analyze_performance(url: str, *, include_raw: bool = False) -> dict:
+    """PageSpeed performance/SEO scores; include_raw adds the field-data "raw" payload"""
     api_key = os.getenv("PAGESPEED_API_KEY", "")
     if not api_key:
         return {"note": "PAGESPEED_API_KEY not set; skipping", "score": None}
-    endpoint = f"https://www.googleapis.com/pagespeedonline/v5/runPagespeed?url={url}&key={api_key}"
+    result = cached_result("pagespeed", PAGESPEED_CACHE_TTL_S, url, lambda: _run_pagespeed(url, api_key))
+    return _without_raw(result, include_raw)
+
+async def analyze_performance_async(url: str, client: httpx.AsyncClient, *, include_raw: bool = False) -> dict:
+    """analyze_performance on a caller-provided httpx.AsyncClient"""
+    api_key = os.getenv("PAGESPEED_API_KEY", "")
+    if not api_key:
+        return {"note": "PAGESPEED_API_KEY not set; skipping", "score": None}
+    # The cache may be diskcache (SQLite): keep its I/O off the event loop
+    result = await asyncio.to_thread(cache_get, "pagespeed", PAGESPEED_CACHE_TTL_S, url)
+    if result is None:
+        try:
+            resp = await client.get(PAGESPEED_ENDPOINT, params={"url": url, "key": api_key}, timeout=60)
+            result = _pagespeed_result(json_loads(resp.content))
+        except Exception as e:
+            result = {"error": str(e)}
+        await asyncio.to_thread(cache_put, "pagespeed", PAGESPEED_CACHE_TTL_S, url, result)
+    return _without_raw(result, include_raw)
+
+async def analyze_performance_many(urls: List[str], *, include_raw: bool = False) -> List[dict]:
+    """analyze_performance for many URLs, at most PAGESPEED_CONCURRENCY at a time (results in order)"""
+    semaphore = asyncio.Semaphore(PAGESPEED_CONCURRENCY)
+    async with httpx.AsyncClient(http2=HTTP2_AVAILABLE) as client:
+        async def one(url: str) -> dict:
+            async with semaphore:
+                return await analyze_performance_async(url, client, include_raw=include_raw)
+        return await asyncio.gather(*(one(url) for url in urls))
+
+def _run_pagespeed(url: str, api_key: str) -> dict:
     try:
-        data = requests.get(endpoint, timeout=60).json()
-        lighthouse = data.get("lighthouseResult", {}).get("categories", {})
-        perf = lighthouse.get("performance", {}).get("score", None)
-        seo = lighthouse.get("seo", {}).get("score", None)
-        return {"performance": perf, "seo": seo, "raw": data.get("loadingExperience", {})}
+        resp = shared_session().get(PAGESPEED_ENDPOINT, params={"url": url, "key": api_key}, timeout=60)
+        return _pagespeed_result(json_loads(resp.content))
     except Exception as e:
         return {"error": str(e)}
+
+def _pagespeed_result(data: dict) -> dict:
+    if "error" in data:
+        # API-side failure (quota, unreachable page): reported, not cached
+        return {"error": data["error"].get("message", str(data["error"])) if isinstance(data["error"], dict) else str(data["error"])}
+    lighthouse = data.get("lighthouseResult", {}).get("categories", {})
+    perf = lighthouse.get("performance", {}).get("score", None)
+    seo = lighthouse.get("seo", {}).get("score", None)
+    return {"performance": perf, "seo": seo, "raw": data.get("loadingExperience", {})}
+
+def _without_raw(result: dict, include_raw: bool) -> dict:
+    if include_raw or "raw" not in result:
+        return result
+    return {k: v for k, v in result.items() if k != "raw"}
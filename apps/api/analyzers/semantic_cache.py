@@ -0,0 +1,441 @@
+"""
+Semantic Response Cache
+
+Caches parsed AI responses keyed by an embedding of the prompt inputs, so that
+near-duplicate analyses (same site profile, slightly different numbers) are
+served locally instead of re-querying a remote LLM.
+
+- Embeddings: sentence-transformers (all-MiniLM-L6-v2, 384-dim, L2-normalized),
+  or an INT8-quantized ONNX export of the same model run with onnxruntime
+  (see export_onnx_model) when SEMANTIC_CACHE_ONNX_DIR is set
+- Index: FAISS inner-product index (cosine similarity on normalized vectors),
+  with a numpy fallback when faiss is not installed
+- Lookups are tiered: L1 in-memory exact-match LRU (BLAKE2 of the key text),
+  L2 SQLite exact-match table (when persisted), L3 embedding similarity
+- Optional on-disk persistence per namespace: one SQLite file holding the
+  exact-match responses and an append-only table of key embeddings; persisted
+  responses expire after SEMANTIC_CACHE_TTL and leave with their embedding row
+
+Environment Variables:
+  SEMANTIC_CACHE_ENABLED (optional; default: true)
+  SEMANTIC_CACHE_DIR (optional; directory for the per-namespace SQLite files)
+  SEMANTIC_CACHE_THRESHOLD (optional; cosine similarity for a hit, default: 0.92)
+  SEMANTIC_CACHE_TTL (optional; seconds a persisted response is served, default: 604800, 0 = no expiry)
+  SEMANTIC_CACHE_MODEL (optional; default: all-MiniLM-L6-v2)
+  SEMANTIC_CACHE_ONNX_DIR (optional; directory from export_onnx_model)
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+# Try to import FAISS (falls back to a numpy dot-product scan)
+try:
+    import faiss  # type: ignore
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Try to import ONNX Runtime + tokenizers (falls back to sentence-transformers)
+try:
+    import onnxruntime as ort  # type: ignore
+    from tokenizers import Tokenizer  # type: ignore
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_THRESHOLD = 0.92
+DEFAULT_TTL_S = 7 * 24 * 3600
+HNSW_MIN_ENTRIES = 10000
+MAX_ENTRIES = 50000
+INITIAL_CAPACITY = 1024
+L1_MAX_ENTRIES = 1024
+ONNX_MODEL_FILE = "model_quantized.onnx"
+ONNX_TOKENIZER_FILE = "tokenizer.json"
+ONNX_MAX_LENGTH = 256
+
+_MODEL = None
+_MODEL_LOCK = threading.Lock()
+_MODEL_FAILED = False
+
+
+class OnnxEmbedder:
+    """
+    Mean-pooled sentence embeddings from an INT8 ONNX export of a
+    sentence-transformers model (same vectors as the PyTorch model, up to
+    quantization error)
+    """
+
+    def __init__(self, model_dir: str):
+        options = ort.SessionOptions()
+        # One thread per call: embeddings run inside request threads/event loops
+        options.intra_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, ONNX_MODEL_FILE), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, ONNX_TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(ONNX_MAX_LENGTH)
+        self.tokenizer.enable_padding()
+
+    def encode(self, texts: List[str], normalize_embeddings: bool = True, **_) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        hidden = self.session.run(None, feeds)[0]
+        # Mean over real tokens only (padding masked out)
+        weights = mask[..., None].astype(np.float32)
+        vecs = (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+        if normalize_embeddings:
+            vecs /= np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+        return vecs.astype(np.float32)
+
+
+def export_onnx_model(output_dir: str, model_name: str = DEFAULT_MODEL) -> str:
+    """
+    Export a sentence-transformers model to ONNX and INT8-quantize it
+    
+    Requires optimum[exporters] and onnxruntime. Point SEMANTIC_CACHE_ONNX_DIR
+    at the returned directory to use it.
+    """
+    from optimum.exporters.onnx import main_export
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    if "/" not in model_name:
+        model_name = f"sentence-transformers/{model_name}"
+    main_export(model_name, output=output_dir, task="feature-extraction")
+    quantize_dynamic(
+        os.path.join(output_dir, "model.onnx"),
+        os.path.join(output_dir, ONNX_MODEL_FILE),
+        weight_type=QuantType.QInt8,
+    )
+    return output_dir
+
+
+def _load_model():
+    """Load the embedding model (ONNX if configured, else sentence-transformers) once per process"""
+    global _MODEL, _MODEL_FAILED
+    if _MODEL is not None or _MODEL_FAILED:
+        return _MODEL
+    with _MODEL_LOCK:
+        if _MODEL is None and not _MODEL_FAILED:
+            onnx_dir = os.getenv("SEMANTIC_CACHE_ONNX_DIR")
+            if onnx_dir and ONNX_AVAILABLE:
+                try:
+                    _MODEL = OnnxEmbedder(onnx_dir)
+                    return _MODEL
+                except Exception:
+                    pass
+            try:
+                from sentence_transformers import SentenceTransformer
+                _MODEL = SentenceTransformer(os.getenv("SEMANTIC_CACHE_MODEL", DEFAULT_MODEL))
+            except Exception:
+                _MODEL_FAILED = True
+    return _MODEL
+
+
+def embed_text(text: str) -> Optional[np.ndarray]:
+    """Return a (1, dim) float32 L2-normalized embedding, or None if unavailable"""
+    model = _load_model()
+    if model is None:
+        return None
+    vec = model.encode([text], normalize_embeddings=True, convert_to_numpy=True)
+    return np.ascontiguousarray(vec, dtype=np.float32)
+
+
+class SemanticCache:
+    """Nearest-neighbour cache of parsed responses for one namespace (e.g. provider)"""
+
+    def __init__(self, namespace: str, threshold: float = DEFAULT_THRESHOLD,
+                 cache_dir: Optional[str] = None, ttl_s: float = DEFAULT_TTL_S):
+        self.namespace = namespace
+        self.threshold = threshold
+        self.cache_dir = cache_dir
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        # Row buffer grown geometrically; only the first len(self._responses) rows are live
+        self._vectors: Optional[np.ndarray] = None
+        self._responses: List[Dict[str, Any]] = []
+        self._index = None
+        self._exact: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._load()
+
+    def lookup(self, key_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored response for key_text: an exact match from L1/L2,
+        else the closest key's response if similarity >= threshold
+        """
+        digest = _digest(key_text)
+        with self._lock:
+            exact = self._exact_get(digest)
+        if exact is not None:
+            return dict(exact)
+
+        if not self._responses:
+            return None
+        emb = embed_text(key_text)
+        if emb is None:
+            return None
+        with self._lock:
+            score, idx = self._search(emb)
+            if idx < 0 or score < self.threshold:
+                return None
+            response = self._responses[idx]
+            self._l1_put(digest, response)
+            return dict(response)
+
+    def store(self, key_text: str, response: Dict[str, Any]) -> None:
+        """Add a parsed response under key_text (write-through to every tier)"""
+        digest = _digest(key_text)
+        emb = embed_text(key_text)
+        with self._lock:
+            self._l1_put(digest, response)
+            self._l2_put(digest, response)
+            if emb is not None:
+                self._persist_vector(digest, emb)
+                self._append_vector(emb, response)
+            self._commit()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    # ----- exact-match tiers -----
+
+    def _exact_get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """L1 then L2 lookup (caller holds the lock); L2 hits are promoted to L1"""
+        response = self._exact.get(digest)
+        if response is not None:
+            self._exact.move_to_end(digest)
+            return response
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at >= ?",
+                (digest, self._expiry_cutoff()),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        response = json.loads(row[0])
+        self._l1_put(digest, response)
+        return response
+
+    def _l1_put(self, digest: str, response: Dict[str, Any]) -> None:
+        self._exact[digest] = response
+        self._exact.move_to_end(digest)
+        if len(self._exact) > L1_MAX_ENTRIES:
+            self._exact.popitem(last=False)
+
+    def _l2_put(self, digest: str, response: Dict[str, Any]) -> None:
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                (digest, json.dumps(response, default=str), time.time()),
+            )
+        except sqlite3.Error:
+            pass
+
+    # ----- vector store -----
+
+    def _append_vector(self, emb: np.ndarray, response: Dict[str, Any]) -> None:
+        """Append one row (caller holds the lock), doubling the buffer when full"""
+        n = len(self._responses)
+        if self._vectors is None:
+            self._vectors = np.empty((INITIAL_CAPACITY, emb.shape[1]), dtype=np.float32)
+        elif n == len(self._vectors):
+            grown = np.empty((2 * n, self._vectors.shape[1]), dtype=np.float32)
+            grown[:n] = self._vectors
+            self._vectors = grown
+        self._vectors[n] = emb[0]
+        self._responses.append(response)
+        if len(self._responses) > MAX_ENTRIES:
+            # Drop the oldest 10% and rebuild (once per MAX_ENTRIES // 10 stores)
+            drop = MAX_ENTRIES // 10
+            live = len(self._responses)
+            self._vectors[:live - drop] = self._vectors[drop:live]
+            self._responses = self._responses[drop:]
+            self._index = None
+            self._evict_persisted(len(self._responses))
+        else:
+            self._add_to_index(emb)
+
+    def _live_vectors(self) -> np.ndarray:
+        return self._vectors[:len(self._responses)]
+
+    # ----- index helpers -----
+
+    def _search(self, emb: np.ndarray):
+        if self._index is None:
+            self._rebuild_index()
+        if FAISS_AVAILABLE and self._index is not None:
+            scores, ids = self._index.search(emb, 1)
+            return float(scores[0][0]), int(ids[0][0])
+        sims = self._live_vectors() @ emb[0]
+        best = int(np.argmax(sims))
+        return float(sims[best]), best
+
+    def _add_to_index(self, emb: np.ndarray) -> None:
+        if not FAISS_AVAILABLE:
+            return
+        if self._index is None or (
+            len(self._responses) == HNSW_MIN_ENTRIES and isinstance(self._index, faiss.IndexFlatIP)
+        ):
+            self._rebuild_index()
+        else:
+            self._index.add(emb)
+
+    def _rebuild_index(self) -> None:
+        if not FAISS_AVAILABLE or self._vectors is None:
+            self._index = None
+            return
+        vectors = self._live_vectors()
+        dim = vectors.shape[1]
+        if len(vectors) >= HNSW_MIN_ENTRIES:
+            index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexFlatIP(dim)
+        index.add(vectors)
+        self._index = index
+
+    # ----- persistence -----
+
+    def _open_db(self) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            db = sqlite3.connect(
+                os.path.join(self.cache_dir, f"{self.namespace}.sqlite"), check_same_thread=False
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL DEFAULT 0)"
+            )
+            try:
+                # Tables from before expiry: their rows count as expired
+                db.execute("ALTER TABLE responses ADD COLUMN created_at REAL NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass  # column already there
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS vectors "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL, embedding BLOB NOT NULL)"
+            )
+            db.execute("DELETE FROM responses WHERE created_at < ?", (self._expiry_cutoff(),))
+            db.commit()
+            self._db = db
+        except (sqlite3.Error, OSError):
+            self._db = None
+
+    def _load(self) -> None:
+        if not self.cache_dir:
+            return
+        self._open_db()
+        if self._db is None:
+            return
+        try:
+            rows = self._db.execute(
+                "SELECT v.embedding, r.response FROM vectors v JOIN responses r ON r.key = v.key "
+                "WHERE r.created_at >= ? ORDER BY v.id DESC LIMIT ?", (self._expiry_cutoff(), MAX_ENTRIES)
+            ).fetchall()
+        except sqlite3.Error:
+            return
+        if not rows:
+            return
+        rows.reverse()
+        # Rows from an earlier model with another dimension are skipped
+        width = len(rows[-1][0])
+        rows = [(blob, response) for blob, response in rows if len(blob) == width]
+        try:
+            vectors = np.frombuffer(b"".join(blob for blob, _ in rows), dtype=np.float32)
+            vectors = vectors.reshape(len(rows), -1)
+            responses = [json.loads(response) for _, response in rows]
+        except ValueError:
+            # Corrupt rows: start empty, new stores are appended as usual
+            return
+        self._vectors = np.empty((max(INITIAL_CAPACITY, 2 * len(rows)), vectors.shape[1]), dtype=np.float32)
+        self._vectors[:len(rows)] = vectors
+        self._responses = responses
+
+    def _persist_vector(self, digest: str, emb: np.ndarray) -> None:
+        """Append one embedding row (caller holds the lock and commits)"""
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT INTO vectors (key, embedding) VALUES (?, ?)",
+                (digest, np.ascontiguousarray(emb[0], dtype=np.float32).tobytes()),
+            )
+        except sqlite3.Error:
+            pass
+
+    def _evict_persisted(self, keep: int) -> None:
+        """
+        Delete all but the newest keep embedding rows, then the responses that
+        expired or lost their embedding (L2 stays within the L3 window)
+        """
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "DELETE FROM vectors WHERE id NOT IN (SELECT id FROM vectors ORDER BY id DESC LIMIT ?)", (keep,)
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE created_at < ? OR key NOT IN (SELECT key FROM vectors)",
+                (self._expiry_cutoff(),),
+            )
+        except sqlite3.Error:
+            pass
+
+    def _expiry_cutoff(self) -> float:
+        """created_at below which a persisted response has expired"""
+        return time.time() - self.ttl_s if self.ttl_s > 0 else float("-inf")
+
+    def _commit(self) -> None:
+        if self._db is None:
+            return
+        try:
+            self._db.commit()
+        except sqlite3.Error:
+            pass
+
+
+def _digest(key_text: str) -> str:
+    return hashlib.blake2b(key_text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+_CACHES: Dict[str, SemanticCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_semantic_cache(namespace: str) -> Optional[SemanticCache]:
+    """Return the process-wide cache for a namespace, or None if disabled"""
+    if os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    cache = _CACHES.get(namespace)
+    if cache is None:
+        with _CACHES_LOCK:
+            cache = _CACHES.get(namespace)
+            if cache is None:
+                cache = SemanticCache(
+                    namespace,
+                    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", DEFAULT_THRESHOLD)),
+                    cache_dir=os.getenv("SEMANTIC_CACHE_DIR") or None,
+                    ttl_s=float(os.getenv("SEMANTIC_CACHE_TTL", DEFAULT_TTL_S)),
+                )
+                _CACHES[namespace] = cache
+    return cache
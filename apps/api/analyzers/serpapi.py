@@ -15,13 +15,97 @@ Requires: SERPAPI_API_KEY environment variable
 Get your API key from: https://serpapi.com/
 """
 
+import asyncio
 import os
-from typing import Dict, Any, List, Optional
-from serpapi import GoogleSearch
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional, Union
+from urllib.parse import urlparse
+
+import httpx
+
+from .api_cache import cache_get, cache_put, cached_result
+from .http_session import json_loads, shared_session
+
+SERPAPI_SEARCH_URL = "https://serpapi.com/search.json"
+
+# Identical searches within this window reuse the stored result instead of a
+# new (billed) SerpAPI call; SERPs drift over hours. 0 disables.
+SERPAPI_CACHE_TTL_S = int(os.getenv("SERPAPI_CACHE_TTL", "3600"))
+# Searches in flight at once in the multi-keyword functions (SerpAPI rate limits)
+SERPAPI_MAX_CONCURRENCY = int(os.getenv("SERPAPI_MAX_CONCURRENCY", "8"))
+
+# Difficulty scoring only reads the top 10 and the SERP features, so it asks
+# for 20 results instead of 100 (a several times smaller response)
+DIFFICULTY_NUM_RESULTS = 20
+
+
+@lru_cache(maxsize=65536)
+def _netloc(url: str) -> str:
+    """urlparse(url).netloc, memoized: the same result links recur across keywords and passes"""
+    return urlparse(url).netloc
+
+
+def _search_key(params: Dict[str, Any]) -> tuple:
+    return tuple(sorted((k, v) for k, v in params.items() if k != "api_key"))
+
+
+def _fetch_serp(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Google search via SerpAPI's JSON endpoint (pooled session, orjson parsing)"""
+    resp = shared_session().get(SERPAPI_SEARCH_URL, params={**params, "engine": "google"}, timeout=60)
+    return json_loads(resp.content)
+
+
+def _cached_search(params: Dict[str, Any]) -> Dict[str, Any]:
+    """_fetch_serp(params), cached per query (every parameter except api_key)"""
+    return cached_result("serpapi", SERPAPI_CACHE_TTL_S, _search_key(params), lambda: _fetch_serp(params))
+
+
+async def _async_search(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, params: Dict[str, Any]) -> Dict[str, Any]:
+    """_cached_search over a shared httpx.AsyncClient (same endpoint and cache)"""
+    key = _search_key(params)
+    # The cache may be diskcache (SQLite): keep its I/O off the event loop
+    results = await asyncio.to_thread(cache_get, "serpapi", SERPAPI_CACHE_TTL_S, key)
+    if results is not None:
+        return results
+    async with semaphore:
+        resp = await client.get(SERPAPI_SEARCH_URL, params={**params, "engine": "google"})
+    results = json_loads(resp.content)
+    await asyncio.to_thread(cache_put, "serpapi", SERPAPI_CACHE_TTL_S, key, results)
+    return results
+
+
+async def _search_many_async(params_by_keyword: Dict[str, Dict[str, Any]]) -> Dict[str, Union[Dict[str, Any], Exception]]:
+    """
+    One search per keyword, all in flight at once (at most SERPAPI_MAX_CONCURRENCY
+    uncached); a failed search maps to its exception instead of raising
+    """
+    semaphore = asyncio.Semaphore(SERPAPI_MAX_CONCURRENCY)
+    async with httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=SERPAPI_MAX_CONCURRENCY)) as client:
+        results = await asyncio.gather(
+            *(_async_search(client, semaphore, params) for params in params_by_keyword.values()),
+            return_exceptions=True,
+        )
+    return dict(zip(params_by_keyword, results))
+
+
+def _map_keywords(fn: Callable[[str], Any], keywords: List[str]) -> List[Any]:
+    """
+    [fn(kw) for kw in keywords] with up to SERPAPI_MAX_CONCURRENCY calls in flight.
+    Results keep the input order; a repeated keyword is only searched once.
+    """
+    unique = list(dict.fromkeys(keywords))
+    if len(unique) <= 1:
+        results = [fn(kw) for kw in unique]
+    else:
+        with ThreadPoolExecutor(max_workers=min(SERPAPI_MAX_CONCURRENCY, len(unique))) as executor:
+            results = list(executor.map(fn, unique))
+    by_keyword = dict(zip(unique, results))
+    return [by_keyword[kw] for kw in keywords]
 
 
 def analyze_serp_results(query: str, location: str = "United States", 
-                        language: str = "en") -> Dict[str, Any]:
+                        language: str = "en", num: int = 100) -> Dict[str, Any]:
     """
     Analyze Google Search results for a given query
     
@@ -29,6 +113,7 @@ def analyze_serp_results(query: str, location: str = "United States",
         query: Search query/keyword
         location: Geographic location for search
         language: Language code (en, de, tr, etc.)
+        num: Number of results to request
         
     Returns:
         Dictionary with comprehensive SERP data
@@ -49,12 +134,11 @@ def analyze_serp_results(query: str, location: str = "United States",
             "hl": language,
             "gl": language[:2] if len(language) > 2 else language,
             "api_key": api_key,
-            "num": 100  # Get top 100 results
+            "num": num
         }
         
         # Perform search
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = _cached_search(params)
         
         # Extract and structure data
         analysis = {
@@ -188,35 +272,27 @@ def extract_local_pack(results: Dict) -> Optional[Dict[str, Any]]:
     return None
 
 
+# SerpAPI result key -> SERP feature name
+SERP_FEATURES = (
+    ('featured_snippet', 'featured_snippet'),
+    ('knowledge_graph', 'knowledge_graph'),
+    ('related_questions', 'people_also_ask'),
+    ('local_results', 'local_pack'),
+    ('top_stories', 'news_results'),
+    ('shopping_results', 'shopping_results'),
+    ('inline_images', 'image_pack'),
+)
+
+
 def calculate_serp_metrics(results: Dict) -> Dict[str, Any]:
     """Calculate key SERP metrics"""
     organic = results.get('organic_results', [])
     
     # Count domains in top 10
-    top_10_domains = set()
-    for result in organic[:10]:
-        link = result.get('link', '')
-        if link:
-            from urllib.parse import urlparse
-            domain = urlparse(link).netloc
-            top_10_domains.add(domain)
+    top_10_domains = {_netloc(r['link']) for r in organic[:10] if r.get('link')}
     
     # Detect SERP features
-    features = []
-    if results.get('featured_snippet'):
-        features.append('featured_snippet')
-    if results.get('knowledge_graph'):
-        features.append('knowledge_graph')
-    if results.get('related_questions'):
-        features.append('people_also_ask')
-    if results.get('local_results'):
-        features.append('local_pack')
-    if results.get('top_stories'):
-        features.append('news_results')
-    if results.get('shopping_results'):
-        features.append('shopping_results')
-    if results.get('inline_images'):
-        features.append('image_pack')
+    features = [feature for key, feature in SERP_FEATURES if results.get(key)]
     
     return {
         'total_organic_results': len(organic),
@@ -273,11 +349,7 @@ def analyze_ranking_opportunities(results: Dict) -> Dict[str, Any]:
         })
     
     # Domain diversity
-    top_10_links = [r.get('link', '') for r in organic[:10]]
-    domains = set()
-    for link in top_10_links:
-        from urllib.parse import urlparse
-        domains.add(urlparse(link).netloc)
+    domains = {_netloc(r.get('link', '')) for r in organic[:10]}
     
     if len(domains) >= 8:
         opportunities.append({
@@ -301,13 +373,15 @@ def analyze_ranking_opportunities(results: Dict) -> Dict[str, Any]:
     }
 
 
-def analyze_keyword_difficulty(query: str, location: str = "United States") -> Dict[str, Any]:
+def analyze_keyword_difficulty(query: str, location: str = "United States",
+                               num: int = DIFFICULTY_NUM_RESULTS) -> Dict[str, Any]:
     """
     Comprehensive keyword difficulty analysis
     
     Args:
         query: Keyword to analyze
         location: Geographic location
+        num: Number of results to request
         
     Returns:
         Keyword difficulty score and analysis
@@ -318,28 +392,28 @@ def analyze_keyword_difficulty(query: str, location: str = "United States") -> D
         return {'error': 'SERPAPI_API_KEY not set'}
     
     try:
-        params = {
-            "q": query,
-            "location": location,
-            "api_key": api_key,
-            "num": 100
-        }
-        
-        search = GoogleSearch(params)
-        results = search.get_dict()
-        
+        results = _cached_search(_difficulty_params(query, location, api_key, num))
+    except Exception as e:
+        return {'error': str(e)}
+    return _keyword_difficulty(query, results)
+
+
+def _difficulty_params(query: str, location: str, api_key: str, num: int) -> Dict[str, Any]:
+    return {
+        "q": query,
+        "location": location,
+        "api_key": api_key,
+        "num": num
+    }
+
+
+def _keyword_difficulty(query: str, results: Dict[str, Any]) -> Dict[str, Any]:
+    """analyze_keyword_difficulty result from the query's search results"""
+    try:
         organic = results.get('organic_results', [])
         
         # Calculate difficulty factors
-        top_domains = []
-        for result in organic[:10]:
-            link = result.get('link', '')
-            if link:
-                from urllib.parse import urlparse
-                domain = urlparse(link).netloc
-                top_domains.append(domain)
-        
-        unique_domains = len(set(top_domains))
+        unique_domains = len({_netloc(r['link']) for r in organic[:10] if r.get('link')})
         
         # Count SERP features
         features_count = 0
@@ -416,23 +490,41 @@ def generate_difficulty_recommendations(score: float, domains: int, features: in
     return recommendations
 
 
-def batch_keyword_analysis(keywords: List[str], location: str = "United States") -> Dict[str, Any]:
+def batch_keyword_analysis(keywords: List[str], location: str = "United States",
+                           num: int = DIFFICULTY_NUM_RESULTS) -> Dict[str, Any]:
     """
     Analyze multiple keywords in batch
     
     Args:
         keywords: List of keywords to analyze
         location: Geographic location
+        num: Number of results to request per keyword
         
     Returns:
         Batch analysis results
     """
-    results = []
+    analyses = _map_keywords(lambda keyword: analyze_keyword_difficulty(keyword, location, num), keywords)
+    return _batch_summary(analyses)
+
+
+async def batch_keyword_analysis_async(keywords: List[str], location: str = "United States",
+                                       num: int = DIFFICULTY_NUM_RESULTS) -> Dict[str, Any]:
+    """batch_keyword_analysis with all searches sent concurrently over one async client"""
+    api_key = os.getenv('SERPAPI_API_KEY')
     
-    for keyword in keywords:
-        analysis = analyze_keyword_difficulty(keyword, location)
-        if 'error' not in analysis:
-            results.append(analysis)
+    if not api_key:
+        return _batch_summary([])
+    
+    searches = await _search_many_async({kw: _difficulty_params(kw, location, api_key, num) for kw in keywords})
+    analyses = [
+        {'error': str(searches[kw])} if isinstance(searches[kw], Exception) else _keyword_difficulty(kw, searches[kw])
+        for kw in keywords
+    ]
+    return _batch_summary(analyses)
+
+
+def _batch_summary(analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    results = [analysis for analysis in analyses if 'error' not in analysis]
     
     # Calculate summary statistics
     if results:
@@ -497,76 +589,114 @@ def track_keyword_ranking(domain: str, keywords: List[str],
             'message': 'Please set SERPAPI_API_KEY environment variable'
         }
     
-    # Clean domain (remove protocol and trailing slash)
-    from urllib.parse import urlparse
-    clean_domain = urlparse(domain if '://' in domain else f'https://{domain}').netloc
-    
-    rankings = []
+    clean_domain = _clean_domain(domain)
     
-    for keyword in keywords:
+    def rank_keyword(keyword: str) -> Dict[str, Any]:
         try:
-            params = {
-                "q": keyword,
-                "location": location,
-                "hl": language,
-                "gl": language[:2] if len(language) > 2 else language,
-                "api_key": api_key,
-                "num": 100
-            }
-            
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            organic = results.get('organic_results', [])
-            
-            # Find domain position
-            position = None
-            url = None
-            title = None
-            snippet = None
-            
-            for idx, result in enumerate(organic, 1):
-                result_url = result.get('link', '')
-                if clean_domain in result_url:
-                    position = idx
-                    url = result_url
-                    title = result.get('title', '')
-                    snippet = result.get('snippet', '')
-                    break
-            
-            # Get top 3 competitors
-            competitors = []
-            for idx, result in enumerate(organic[:3], 1):
-                result_domain = urlparse(result.get('link', '')).netloc
+            results = _cached_search(_keyword_params(keyword, location, language, api_key, 100))
+        except Exception as e:
+            results = e
+        return _keyword_ranking(keyword, results, clean_domain)
+    
+    rankings = _map_keywords(rank_keyword, keywords)
+    return _ranking_report(clean_domain, keywords, rankings)
+
+
+async def track_keyword_ranking_async(domain: str, keywords: List[str],
+                                      location: str = "United States",
+                                      language: str = "en") -> Dict[str, Any]:
+    """track_keyword_ranking with all searches sent concurrently over one async client"""
+    api_key = os.getenv('SERPAPI_API_KEY')
+    
+    if not api_key:
+        return {
+            'error': 'SERPAPI_API_KEY not set',
+            'message': 'Please set SERPAPI_API_KEY environment variable'
+        }
+    
+    clean_domain = _clean_domain(domain)
+    searches = await _search_many_async({kw: _keyword_params(kw, location, language, api_key, 100) for kw in keywords})
+    rankings = [_keyword_ranking(kw, searches[kw], clean_domain) for kw in keywords]
+    return _ranking_report(clean_domain, keywords, rankings)
+
+
+def _clean_domain(domain: str) -> str:
+    # Remove protocol and trailing slash
+    return urlparse(domain if '://' in domain else f'https://{domain}').netloc
+
+
+def _keyword_params(keyword: str, location: str, language: str, api_key: str, num: int) -> Dict[str, Any]:
+    return {
+        "q": keyword,
+        "location": location,
+        "hl": language,
+        "gl": language[:2] if len(language) > 2 else language,
+        "api_key": api_key,
+        "num": num
+    }
+
+
+def _keyword_ranking(keyword: str, results: Union[Dict[str, Any], Exception], clean_domain: str) -> Dict[str, Any]:
+    """Ranking entry for one keyword from its search results (or the search's exception)"""
+    if isinstance(results, Exception):
+        return {
+            'keyword': keyword,
+            'error': str(results),
+            'status': 'error'
+        }
+    try:
+        organic = results.get('organic_results', [])
+        
+        # One pass: domain position and the top 3 competitors
+        position = None
+        url = None
+        title = None
+        snippet = None
+        competitors = []
+        
+        for idx, result in enumerate(organic, 1):
+            result_url = result.get('link', '')
+            if idx <= 3:
+                result_domain = _netloc(result_url)
                 if result_domain != clean_domain:
                     competitors.append({
                         'position': idx,
                         'domain': result_domain,
                         'title': result.get('title', ''),
-                        'url': result.get('link', '')
+                        'url': result_url
                     })
-            
-            ranking_data = {
-                'keyword': keyword,
-                'position': position,
-                'url': url,
-                'title': title,
-                'snippet': snippet,
-                'status': 'ranking' if position else 'not_found',
-                'page': (position - 1) // 10 + 1 if position else None,
-                'top_competitors': competitors[:3],
-                'total_results': len(organic),
-                'serp_features': calculate_serp_metrics(results).get('serp_features_count', 0)
-            }
-            
-            rankings.append(ranking_data)
-            
-        except Exception as e:
-            rankings.append({
-                'keyword': keyword,
-                'error': str(e),
-                'status': 'error'
-            })
-    
+            elif position is not None:
+                break
+            if position is None and clean_domain in result_url:
+                position = idx
+                url = result_url
+                title = result.get('title', '')
+                snippet = result.get('snippet', '')
+        
+        ranking_data = {
+            'keyword': keyword,
+            'position': position,
+            'url': url,
+            'title': title,
+            'snippet': snippet,
+            'status': 'ranking' if position else 'not_found',
+            'page': (position - 1) // 10 + 1 if position else None,
+            'top_competitors': competitors[:3],
+            'total_results': len(organic),
+            'serp_features': sum(1 for key, _ in SERP_FEATURES if results.get(key))
+        }
+        
+        return ranking_data
+        
+    except Exception as e:
+        return {
+            'keyword': keyword,
+            'error': str(e),
+            'status': 'error'
+        }
+
+
+def _ranking_report(clean_domain: str, keywords: List[str], rankings: List[Dict[str, Any]]) -> Dict[str, Any]:
     # Calculate summary stats
     ranked_keywords = [r for r in rankings if r.get('position')]
     total_keywords = len(keywords)
@@ -633,29 +763,51 @@ def analyze_competitors(domain: str, keywords: List[str],
             'message': 'Please set SERPAPI_API_KEY environment variable'
         }
     
-    from urllib.parse import urlparse
-    clean_domain = urlparse(domain if '://' in domain else f'https://{domain}').netloc
+    clean_domain = _clean_domain(domain)
+    
+    def fetch_organic(keyword: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            results = _cached_search(_keyword_params(keyword, location, language, api_key, 20))  # Top 20 results
+            return results.get('organic_results', [])
+        except Exception:
+            return None
+    
+    return _competitor_report(clean_domain, keywords, _map_keywords(fetch_organic, keywords))
+
+
+async def analyze_competitors_async(domain: str, keywords: List[str],
+                                    location: str = "United States",
+                                    language: str = "en") -> Dict[str, Any]:
+    """analyze_competitors with all searches sent concurrently over one async client"""
+    api_key = os.getenv('SERPAPI_API_KEY')
     
-    # Track competitor appearances
+    if not api_key:
+        return {
+            'error': 'SERPAPI_API_KEY not set',
+            'message': 'Please set SERPAPI_API_KEY environment variable'
+        }
+    
+    clean_domain = _clean_domain(domain)
+    searches = await _search_many_async({kw: _keyword_params(kw, location, language, api_key, 20) for kw in keywords})
+    organic_lists = [
+        None if isinstance(searches[kw], Exception) else searches[kw].get('organic_results', [])
+        for kw in keywords
+    ]
+    return _competitor_report(clean_domain, keywords, organic_lists)
+
+
+def _competitor_report(clean_domain: str, keywords: List[str],
+                       organic_lists: List[Optional[List[Dict[str, Any]]]]) -> Dict[str, Any]:
+    """Competitor analysis from each keyword's organic results (None for a failed search)"""
+    # Track competitor appearances (counted in keyword order)
     competitor_data = {}
     
-    for keyword in keywords:
+    for keyword, organic in zip(keywords, organic_lists):
+        if organic is None:
+            continue
         try:
-            params = {
-                "q": keyword,
-                "location": location,
-                "hl": language,
-                "gl": language[:2] if len(language) > 2 else language,
-                "api_key": api_key,
-                "num": 20  # Top 20 results
-            }
-            
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            organic = results.get('organic_results', [])
-            
             for idx, result in enumerate(organic[:10], 1):
-                result_domain = urlparse(result.get('link', '')).netloc
+                result_domain = _netloc(result.get('link', ''))
                 
                 if result_domain != clean_domain:
                     if result_domain not in competitor_data:
@@ -0,0 +1,222 @@
+"""
+Word/sentence statistics for content quality and keyword analysis
+
+Single-pass Numba kernels over the text's code points when numba is
+installed, otherwise the equivalent pure-Python version.
+"""
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Try to import numba (falls back to the pure-Python path)
+try:
+    from numba import njit  # type: ignore
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# One match per non-blank run of text between . ! ? terminators
+_SENTENCE = re.compile(r'[^.!?\s][^.!?]*')
+_VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+
+# Lookup tables over code points below 0x3001: str.isspace() characters
+# (what str.split() splits on), vowels, and sentence terminators
+_LUT_SIZE = 0x3001
+_IS_SPACE = np.array([chr(c).isspace() for c in range(_LUT_SIZE)], dtype=np.bool_)
+_IS_VOWEL = np.zeros(_LUT_SIZE, dtype=np.bool_)
+_IS_VOWEL[[ord(c) for c in "aeiouy"]] = True
+_IS_TERMINATOR = np.zeros(_LUT_SIZE, dtype=np.bool_)
+_IS_TERMINATOR[[ord(c) for c in ".!?"]] = True
+# Word characters as matched by the re module's \w (alphanumeric or "_")
+_IS_WORD = np.array([chr(c).isalnum() or c == ord("_") for c in range(_LUT_SIZE)], dtype=np.bool_)
+
+_FNV_OFFSET = 14695981039346656037
+_FNV_PRIME = 1099511628211
+
+
+class TextStats(NamedTuple):
+    words: int
+    total_word_length: int
+    syllables: int  # vowel groups per word, at least 1
+    sentences: int  # non-blank segments between runs of . ! ?
+    unique_words: int  # distinct lowercased words
+
+
+def _text_stats_python(text: str) -> TextStats:
+    words = text.split()
+    sentences = sum(1 for _ in _SENTENCE.finditer(text))
+    # One lowercasing pass; per-word stats are then computed once per distinct word
+    word_counts = Counter(map(str.lower, words))
+    syllables = sum(max(1, len(_VOWEL_GROUPS.findall(word))) * n for word, n in word_counts.items())
+    return TextStats(len(words), sum(map(len, words)), syllables, sentences, len(word_counts))
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _text_stats_kernel(buf, is_space, is_vowel, is_terminator):
+        lut_size = is_space.shape[0]
+        words = 0
+        total_len = 0
+        syllables = 0
+        sentences = 0
+        unique = {np.uint64(0)}
+        unique.clear()
+
+        in_word = False
+        in_sentence = False
+        prev_vowel = False
+        word_syllables = 0
+        word_hash = np.uint64(0)
+        for i in range(buf.shape[0]):
+            c = buf[i]
+            space = c < lut_size and is_space[c]
+            if c < lut_size and is_terminator[c]:
+                if in_sentence:
+                    sentences += 1
+                in_sentence = False
+            elif not space:
+                in_sentence = True
+
+            if space:
+                if in_word:
+                    syllables += max(1, word_syllables)
+                    unique.add(word_hash)
+                    in_word = False
+                continue
+            if not in_word:
+                in_word = True
+                words += 1
+                word_syllables = 0
+                prev_vowel = False
+                word_hash = np.uint64(_FNV_OFFSET)  # FNV-1a
+            total_len += 1
+            vowel = c < lut_size and is_vowel[c]
+            if vowel and not prev_vowel:
+                word_syllables += 1
+            prev_vowel = vowel
+            word_hash = (word_hash ^ np.uint64(c)) * np.uint64(_FNV_PRIME)
+
+        if in_word:
+            syllables += max(1, word_syllables)
+            unique.add(word_hash)
+        if in_sentence:
+            sentences += 1
+        return words, total_len, syllables, sentences, len(unique)
+
+    @njit(cache=True)
+    def _word_counts_kernel(buf, is_word, stop_hashes, min_length):
+        lut_size = is_word.shape[0]
+        n = buf.shape[0]
+        capacity = n // (min_length + 1) + 1
+        starts = np.empty(capacity, dtype=np.int64)
+        lengths = np.empty(capacity, dtype=np.int64)
+        counts = np.empty(capacity, dtype=np.int64)
+        slots = {np.uint64(0): 0}
+        slots.clear()
+
+        distinct = 0
+        i = 0
+        while i < n:
+            if not (buf[i] < lut_size and is_word[buf[i]]):
+                i += 1
+                continue
+            start = i
+            word_hash = np.uint64(_FNV_OFFSET)  # FNV-1a
+            while i < n and buf[i] < lut_size and is_word[buf[i]]:
+                word_hash = (word_hash ^ np.uint64(buf[i])) * np.uint64(_FNV_PRIME)
+                i += 1
+            if i - start < min_length:
+                continue
+            k = np.searchsorted(stop_hashes, word_hash)
+            if k < stop_hashes.shape[0] and stop_hashes[k] == word_hash:
+                continue
+            if word_hash in slots:
+                counts[slots[word_hash]] += 1
+            else:
+                slots[word_hash] = distinct
+                starts[distinct] = start
+                lengths[distinct] = i - start
+                counts[distinct] = 1
+                distinct += 1
+        return starts[:distinct], lengths[:distinct], counts[:distinct]
+
+
+def text_stats(text: str) -> TextStats:
+    """Word, syllable, sentence and unique-word counts of a text"""
+    lowered = text.lower()
+    # The kernel works on the lowercased code points, so it needs lower() to keep
+    # every character in place (true except for a few characters like 'İ')
+    if not NUMBA_AVAILABLE or len(lowered) != len(text):
+        return _text_stats_python(text)
+    buf = np.frombuffer(lowered.encode("utf-32-le"), dtype=np.uint32)
+    return TextStats(*_text_stats_kernel(buf, _IS_SPACE, _IS_VOWEL, _IS_TERMINATOR))
+
+
+def _fnv1a(word: str) -> int:
+    h = _FNV_OFFSET
+    for c in word:
+        h = ((h ^ ord(c)) * _FNV_PRIME) & 0xFFFFFFFFFFFFFFFF
+    return h
+
+
+@lru_cache(maxsize=8)
+def _stopword_hashes(stopwords: frozenset) -> np.ndarray:
+    return np.array(sorted({_fnv1a(w) for w in stopwords}), dtype=np.uint64)
+
+
+def _word_count_arrays(text: str, min_length: int, stopwords: frozenset):
+    if not NUMBA_AVAILABLE or not text:
+        return None
+    buf = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    if buf.max() >= _LUT_SIZE:
+        return None
+    return _word_counts_kernel(buf, _IS_WORD, _stopword_hashes(stopwords), min_length)
+
+
+def word_counts(text: str, min_length: int, stopwords: frozenset) -> Optional[Counter]:
+    """
+    Counts of word-character runs (re \\w) of at least min_length characters
+    that are not in stopwords, in first-seen order - like
+    Counter(w for w in re.findall(r"\\b\\w{min_length,}\\b", text) if w not in stopwords).
+    Returns None (caller uses its regex path) without numba or for text with
+    code points outside the lookup tables.
+    """
+    arrays = _word_count_arrays(text, min_length, stopwords)
+    if arrays is None:
+        return None
+    starts, lengths, counts = arrays
+    return Counter({text[s:s + n]: int(c) for s, n, c in zip(starts.tolist(), lengths.tolist(), counts.tolist())})
+
+
+def top_indices(counts: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    Indices of the top_n largest counts, highest first with ties in index
+    order (Counter.most_common order for first-seen counts). Selects with a
+    linear-time partition instead of a heap over every entry.
+    """
+    if top_n <= 0:
+        return np.empty(0, dtype=np.int64)
+    if top_n < counts.shape[0]:
+        # Everything at least as frequent as the top_n-th entry, in index order
+        threshold = counts[np.argpartition(-counts, top_n - 1)[top_n - 1]]
+        idx = np.flatnonzero(counts >= threshold)
+    else:
+        idx = np.arange(counts.shape[0])
+    return idx[np.argsort(-counts[idx], kind="stable")][:top_n]
+
+
+def top_word_counts(text: str, min_length: int, stopwords: frozenset, top_n: int) -> Optional[Tuple[int, List[Tuple[str, int]]]]:
+    """
+    (total count, word_counts(...).most_common(top_n)) without building the
+    Counter: only the top_n words are sliced out of the text.
+    Returns None in the same cases as word_counts.
+    """
+    arrays = _word_count_arrays(text, min_length, stopwords)
+    if arrays is None:
+        return None
+    starts, lengths, counts = arrays
+    top = [(text[starts[i]:starts[i] + lengths[i]], int(counts[i])) for i in top_indices(counts, top_n).tolist()]
+    return int(counts.sum()), top
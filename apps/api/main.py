@@ -1,10 +1,11 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, HttpUrl
 from datetime import datetime
 from analyzers.onpage import analyze_onpage
-from analyzers.keywords import analyze_keywords, analyze_seo_keywords
-from analyzers.performance import analyze_performance
+from analyzers.keywords import analyze_keywords, analyze_keywords_batch, analyze_seo_keywords
+from analyzers.performance import analyze_performance, analyze_performance_many
 from analyzers.moz import get_backlink_summary, analyze_moz_metrics, test_moz_connection
 from analyzers.data_analytics import (
     analyze_content_quality,
@@ -16,9 +17,10 @@ from analyzers.data_analytics import (
 from analyzers.serpapi import (
     analyze_serp_results,
     analyze_keyword_difficulty,
-    batch_keyword_analysis,
-    track_keyword_ranking,
-    analyze_competitors
+    batch_keyword_analysis_async,
+    track_keyword_ranking_async,
+    analyze_competitors,
+    analyze_competitors_async
 )
 from analyzers.ai_insights import (
     get_all_ai_insights,
@@ -27,9 +29,11 @@ from analyzers.ai_insights import (
     get_claude_insights,
     generate_meta_tags,
     generate_content_improvements,
+    get_configured_providers,
+    get_generator,
     AIProvider
 )
-from analyzers.content_generator import generate_seo_content
+from analyzers.content_generator import generate_seo_content_async, coalesce_stream, warm_up
 from analyzers.llm_registry import get_default_model, get_recommended_models, get_registry_snapshot
 from services.storage import save_report
 from services.ingestion import run_ingestion
@@ -39,8 +43,10 @@ from services.pdf_report import generate_pdf_bytes
 from analyzers.dataforseo import (
     test_dataforseo_connection,
     analyze_keyword_difficulty_dfs,
+    analyze_keywords_batch_dfs,
     analyze_serp_results_dfs,
 )
+from analyzers.dataforseo_async import analyze_many as analyze_many_dfs
 
 app = FastAPI(title="SEO Analyzer API", version="0.1.0")
 
@@ -71,6 +77,12 @@ try:
 except Exception:
     pass
 
+
+@app.on_event("startup")
+async def _warm_up_providers():
+    # Open provider connections before the first content request
+    await warm_up()
+
 class AnalyzeRequest(BaseModel):
     url: HttpUrl
     include_serp: bool = False  # Optional SERP analysis
@@ -89,6 +101,13 @@ class BatchKeywordRequest(BaseModel):
     keywords: list[str]
     location: str = "United States"
 
+class KeywordBatchRequest(BaseModel):
+    texts: list[str]
+    top_n: int = 25
+
+class PerformanceBatchRequest(BaseModel):
+    urls: list[str]
+
 class RankTrackingRequest(BaseModel):
     domain: str
     keywords: list[str]
@@ -100,6 +119,18 @@ class DFSKeywordRequest(BaseModel):
     location_name: str = "United States"
     language_name: str = "English"
 
+class DFSBatchKeywordRequest(BaseModel):
+    keywords: list[str]
+    location_name: str = "United States"
+    language_name: str = "English"
+
+class DFSMultiKeywordRequest(BaseModel):
+    keywords: list[str]
+    location_name: str = "United States"
+    language_name: str = "English"
+    device: str = "desktop"  # mobile|desktop
+    include_serp: bool = True
+
 class DFSSerpRequest(BaseModel):
     keyword: str
     location_name: str = "United States"
@@ -140,6 +171,8 @@ class ContentGeneratorRequest(BaseModel):
     local_context: str | None = None
     provider: str = "openai"  # openai / anthropic / gemini
     model: str | None = None  # Optional: specific model name
+    stream: bool = False  # Stream Markdown text chunks as they are generated
+    output_format: str = "markdown"  # markdown / json (structured sections, FAQ, meta tags)
 
 class IngestionRequest(BaseModel):
     project_id: str
@@ -266,6 +299,24 @@ def webhook_scan(payload: dict):
     report_id = save_report(report)
     return {"ok": True, "reportId": report_id}
 
+@app.post("/keywords/batch")
+def keywords_batch(req: KeywordBatchRequest):
+    """Keyword frequency/density for many page texts (e.g. a site audit)"""
+    try:
+        results = analyze_keywords_batch(req.texts, req.top_n)
+        return {"results": results, "total": len(results)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/performance/batch")
+async def performance_batch(req: PerformanceBatchRequest):
+    """PageSpeed scores for many URLs, run concurrently"""
+    try:
+        results = await analyze_performance_many(req.urls)
+        return {"results": [{"url": url, **r} for url, r in zip(req.urls, results)], "total": len(results)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ===== SerpAPI Endpoints =====
 
 @app.post("/serp/analyze")
@@ -293,13 +344,13 @@ def serp_difficulty(req: KeywordDifficultyRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/serp/batch")
-def serp_batch(req: BatchKeywordRequest):
+async def serp_batch(req: BatchKeywordRequest):
     """
     Batch keyword difficulty analysis
     Returns: Analysis for multiple keywords with summary statistics
     """
     try:
-        result = batch_keyword_analysis(req.keywords, req.location)
+        result = await batch_keyword_analysis_async(req.keywords, req.location)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -351,6 +402,25 @@ def dfs_difficulty(req: DFSKeywordRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/dfs/difficulty/batch")
+def dfs_difficulty_batch(req: DFSBatchKeywordRequest):
+    try:
+        results = analyze_keywords_batch_dfs(req.keywords, req.location_name, req.language_name)
+        return {"results": results, "total": len(results)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/dfs/analyze-many")
+async def dfs_analyze_many(req: DFSMultiKeywordRequest):
+    """Keyword difficulty and SERP results for many keywords, fetched concurrently"""
+    try:
+        results = await analyze_many_dfs(
+            req.keywords, req.location_name, req.language_name, req.device, req.include_serp
+        )
+        return {"results": results, "total": len(results)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/dfs/serp")
 def dfs_serp(req: DFSSerpRequest):
     try:
@@ -360,7 +430,7 @@ def dfs_serp(req: DFSSerpRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/serp/rank-tracking")
-def serp_rank_tracking(req: RankTrackingRequest):
+async def serp_rank_tracking(req: RankTrackingRequest):
     """
     Track domain's ranking positions for multiple keywords
     
@@ -378,7 +448,7 @@ def serp_rank_tracking(req: RankTrackingRequest):
     - Recommendations for improvement
     """
     try:
-        result = track_keyword_ranking(
+        result = await track_keyword_ranking_async(
             req.domain, 
             req.keywords, 
             req.location,
@@ -389,7 +459,7 @@ def serp_rank_tracking(req: RankTrackingRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/serp/competitor-analysis")
-def serp_competitor_analysis(req: CompetitorAnalysisRequest):
+async def serp_competitor_analysis(req: CompetitorAnalysisRequest):
     """
     Analyze top competitors for given keywords
     
@@ -408,7 +478,7 @@ def serp_competitor_analysis(req: CompetitorAnalysisRequest):
     - Strategic recommendations
     """
     try:
-        result = analyze_competitors(
+        result = await analyze_competitors_async(
             req.domain,
             req.keywords,
             req.location,
@@ -450,41 +520,7 @@ def ai_insights(req: AIInsightsRequest):
     - Overall SEO score
     """
     try:
-        # Get basic SEO analysis
-        onpage = analyze_onpage(str(req.url))
-        keywords = analyze_keywords(onpage.get("text_content", ""))
-        performance = analyze_performance(str(req.url))
-        moz_metrics = get_backlink_summary(str(req.url))
-        
-        content_quality = analyze_content_quality(
-            onpage.get("text_content", ""),
-            keywords=[kw["word"] for kw in keywords.get("top", [])[:5]]
-        )
-        
-        # Prepare analysis data
-        analysis_data = {
-            "url": str(req.url),
-            "onpage": onpage,
-            "keywords": keywords,
-            "performance": performance,
-            "moz": moz_metrics,
-            "content_quality": content_quality
-        }
-        
-        # Add competitor data if requested
-        if req.include_competitors:
-            try:
-                # Get top keywords for competitor analysis
-                top_keywords = [kw["word"] for kw in keywords.get("top", [])[:5]]
-                competitors = analyze_competitors(
-                    str(req.url),
-                    top_keywords,
-                    "United States",
-                    "en"
-                )
-                analysis_data["competitors"] = competitors
-            except:
-                pass  # Continue without competitor data
+        analysis_data = _collect_ai_analysis_data(req)
         
         # Generate AI insights based on provider
         if req.ai_provider.lower() == "auto":
@@ -510,6 +546,87 @@ def ai_insights(req: AIInsightsRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/ai/insights/stream")
+def ai_insights_stream(req: AIInsightsRequest):
+    """
+    Stream AI-powered SEO insights as Server-Sent Events
+    
+    Same request body as /ai/insights. With "auto", the first configured
+    provider is used.
+    
+    Events:
+    - "delta": raw response text as the model generates it
+    - "result": parsed insights once the response is complete
+    - "error": configuration or provider error
+    """
+    provider_name = req.ai_provider.lower()
+    if provider_name == "auto":
+        configured = get_configured_providers()
+        if not configured:
+            raise HTTPException(status_code=400, detail="No AI provider configured")
+        provider = configured[0]
+    else:
+        try:
+            provider = AIProvider(provider_name)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid AI provider: {req.ai_provider}. Use: auto, openai, gemini, or claude"
+            )
+    
+    try:
+        analysis_data = _collect_ai_analysis_data(req)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    generator = get_generator(provider)
+    
+    def event_stream():
+        for event in generator.stream_seo_insights(analysis_data):
+            payload = {"text": event["text"]} if event["type"] == "delta" else event["data"]
+            yield f"event: {event['type']}\ndata: {json.dumps(payload, default=str)}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+def _collect_ai_analysis_data(req: AIInsightsRequest) -> dict:
+    """Run the basic SEO analysis used as input for AI insights"""
+    onpage = analyze_onpage(str(req.url))
+    keywords = analyze_keywords(onpage.get("text_content", ""))
+    performance = analyze_performance(str(req.url))
+    moz_metrics = get_backlink_summary(str(req.url))
+    
+    content_quality = analyze_content_quality(
+        onpage.get("text_content", ""),
+        keywords=[kw["word"] for kw in keywords.get("top", [])[:5]]
+    )
+    
+    # Prepare analysis data
+    analysis_data = {
+        "url": str(req.url),
+        "onpage": onpage,
+        "keywords": keywords,
+        "performance": performance,
+        "moz": moz_metrics,
+        "content_quality": content_quality
+    }
+    
+    # Add competitor data if requested
+    if req.include_competitors:
+        try:
+            # Get top keywords for competitor analysis
+            top_keywords = [kw["word"] for kw in keywords.get("top", [])[:5]]
+            competitors = analyze_competitors(
+                str(req.url),
+                top_keywords,
+                "United States",
+                "en"
+            )
+            analysis_data["competitors"] = competitors
+        except:
+            pass  # Continue without competitor data
+    
+    return analysis_data
+
 @app.post("/ai/meta-tags")
 def ai_meta_tags(req: MetaTagGenerationRequest):
     """
@@ -625,7 +742,7 @@ def ai_test():
 # ===== AI Content Generator Endpoint =====
 
 @app.post("/ai/generate-content")
-def generate_content(req: ContentGeneratorRequest):
+async def generate_content(req: ContentGeneratorRequest):
     """
     Generate topical, holistic, E-E-A-T optimized SEO content with latest AI models
     
@@ -673,7 +790,7 @@ def generate_content(req: ContentGeneratorRequest):
     - Metadata about generation (tokens, model, etc.)
     """
     try:
-        result = generate_seo_content(
+        content_args = dict(
             topic=req.topic,
             page_type=req.page_type,
             main_keyword=req.main_keyword,
@@ -687,7 +804,28 @@ def generate_content(req: ContentGeneratorRequest):
             local_context=req.local_context,
             provider=req.provider,
             model=req.model,
+            output_format=req.output_format,
         )
+        if not req.stream:
+            # Async provider call: the event loop keeps serving other requests meanwhile
+            return await generate_seo_content_async(**content_args)
+        
+        # Async SDK streams are read on the event loop; providers without one
+        # come back as a sync iterator that coalesce_stream reads on its own pool
+        result = await generate_seo_content_async(**content_args, stream=True)
+        if not isinstance(result, dict):
+            # Token deltas are merged into fewer, larger chunks. Pull the
+            # first one here so configuration/provider errors still surface
+            # as HTTP errors instead of a truncated stream
+            chunks = coalesce_stream(result)
+            first = await anext(chunks, "")
+
+            async def body():
+                yield first
+                async for chunk in chunks:
+                    yield chunk
+
+            return StreamingResponse(body(), media_type="text/markdown; charset=utf-8")
         
         return result
     except Exception as e:
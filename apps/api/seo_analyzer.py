@@ -267,7 +267,7 @@ class SEOAnalyzer:
         
         # Calculate topical consistency
         topic_distribution = Counter(topics)
-        total_docs = len([t for t in topics if t != -1])
+        total_docs = len(topics) - topic_distribution[-1]  # -1 = outliers
         
         if total_docs > 0:
             # Shannon entropy for topic diversity